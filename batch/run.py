@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+from config.logging_config import setup_logging
+from config.settings import EXPORT_FORMAT, JOB_WORKERS, PARSER_MODE
+from filters import (
+    filter_candidates_by_experience,
+    filter_candidates_by_salary_expectations,
+    filter_employees_without_salary,
+    get_extra_search_urls,
+    sort_filtered_candidates,
+)
+from jobs.job_queue import forget_checkpoint
+from monitoring.metrics import REGISTRY, timed
+from scraper.http_client import close_http_client
+from scraper.limits import ScrapeLimits
+from scraper.sources import SearchFilters
+from scraper.writers import export_candidates, get_export_formats
+from .spec import SearchSpec, load_specs
+
+
+@dataclass
+class SearchResult:
+    """The outcome and timings of one search of a batch, in seconds.
+
+    A search stopped by SCRAPE_DEADLINE is "partial" and truncated: its list
+    only has the candidates found until then.
+    """
+
+    name: str
+    status: str = "ok"
+    candidates: int = 0
+    navigation: float = 0.0
+    scrape: float = 0.0
+    export: float = 0.0
+    total: float = 0.0
+    truncated: bool = False
+    path: str | None = None
+    error: str | None = None
+
+
+def navigate(spec: SearchSpec) -> tuple[str, tuple[str, ...]]:
+    """Apply the filters of a spec, like the bot does step by step in a chat.
+    Args:
+        spec (SearchSpec): The search.
+    Returns:
+        (str, (str, ...)): The filtered candidates URL and the URLs of the
+            same query on the other configured sources.
+    """
+
+    # Releases its driver itself if a step fails.
+    parser = filter_employees_without_salary(spec.position, spec.location, spec.skills)
+    try:
+        if spec.experience:
+            filter_candidates_by_experience(parser, spec.experience)
+        if spec.min_salary:
+            filter_candidates_by_salary_expectations(parser, spec.min_salary)
+        if spec.max_salary:
+            filter_candidates_by_salary_expectations(parser, spec.max_salary, True)
+        url = parser.BASE_URL
+    finally:
+        parser.close_driver()
+    filters = SearchFilters(
+        experience=(spec.experience,) if spec.experience else (),
+        min_salary=spec.min_salary,
+        max_salary=spec.max_salary,
+    )
+    extra_urls = get_extra_search_urls(
+        url, spec.position, spec.location, spec.skills, filters
+    )
+    return url, tuple(extra_urls)
+
+
+async def run_search(
+    spec: SearchSpec,
+    output_dir: str,
+    export_format: str,
+    slots: asyncio.Semaphore,
+) -> SearchResult:
+    """Run one search of a batch and write its candidate list.
+
+    Failures are logged and reported in the result instead of raised, so one
+    broken search does not stop the others.
+    Args:
+        spec (SearchSpec): The search.
+        output_dir (str): The directory the candidate list is written to.
+        export_format (str): The format used if the spec does not choose one.
+        slots (asyncio.Semaphore): Bounds the number of searches run at the same time.
+    Returns:
+        SearchResult: The outcome of the search.
+    """
+
+    result = SearchResult(spec.name)
+    export_format = spec.export_format or export_format
+    async with slots:
+        started = time.perf_counter()
+        stage_started = started
+        try:
+            logging.info(f"Search {spec.name} started.")
+            url, extra_urls = await asyncio.to_thread(navigate, spec)
+            result.navigation = time.perf_counter() - stage_started
+
+            stage_started = time.perf_counter()
+            limits = ScrapeLimits.from_settings(spec.max_results)
+            with timed("search"):
+                candidates = await sort_filtered_candidates(
+                    url, limits=limits, extra_urls=extra_urls
+                )
+            result.scrape = time.perf_counter() - stage_started
+            result.candidates = len(candidates)
+            if candidates.truncated:
+                result.truncated = True
+                result.status = "partial"
+
+            stage_started = time.perf_counter()
+            with timed("export"):
+                document = await asyncio.to_thread(
+                    export_candidates, candidates, export_format
+                )
+            path = os.path.join(output_dir, f"{spec.name}.{export_format}")
+            await asyncio.to_thread(_write_file, path, document.getvalue())
+            result.export = time.perf_counter() - stage_started
+            result.path = path
+            await asyncio.to_thread(forget_checkpoint, url, limits, extra_urls)
+            logging.info(f"Search {spec.name} wrote {result.candidates} candidates to {path}")
+        except Exception as e:
+            logging.exception(f"Search {spec.name} failed: {e}")
+            result.status = "failed"
+            result.error = f"{type(e).__name__}: {e}"
+        result.total = time.perf_counter() - started
+    return result
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+async def run_batch(
+    specs: list[SearchSpec],
+    output_dir: str,
+    export_format: str = EXPORT_FORMAT,
+    parallel: int = JOB_WORKERS,
+) -> list[SearchResult]:
+    """Run the searches of a batch concurrently.
+
+    The searches share the pooled HTTP client, and in selenium mode the pool
+    of Chrome drivers, so parallel should not exceed DRIVER_POOL_SIZE there.
+    Args:
+        specs ([SearchSpec]): The searches.
+        output_dir (str): The directory the candidate lists are written to.
+        export_format (str, optional): The format of the specs that do not choose one.
+        parallel (int, optional): The number of searches run at the same time.
+    Returns:
+        [SearchResult]: The outcomes of the searches, in spec order.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    slots = asyncio.Semaphore(max(parallel, 1))
+    try:
+        return await asyncio.gather(
+            *(run_search(spec, output_dir, export_format, slots) for spec in specs)
+        )
+    finally:
+        await close_http_client()
+        if PARSER_MODE == "selenium":
+            from parsers.driver_pool import get_driver_pool
+
+            await asyncio.to_thread(get_driver_pool().close)
+
+
+def format_summary(results: list[SearchResult], elapsed: float) -> str:
+    """Format the outcomes of a batch as a table."""
+
+    width = max([len("search"), *(len(result.name) for result in results)])
+    lines = [
+        f"{'search':<{width}}  {'status':<7}  {'found':>6}  "
+        f"{'navigate':>8}  {'scrape':>8}  {'export':>8}  {'total':>8}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}}  {result.status:<7}  {result.candidates:>6}  "
+            f"{result.navigation:>7.1f}s  {result.scrape:>7.1f}s  "
+            f"{result.export:>7.1f}s  {result.total:>7.1f}s"
+        )
+    failed = [result for result in results if result.status == "failed"]
+    partial = sum(result.truncated for result in results)
+    lines.append("")
+    lines.append(
+        f"{len(results) - len(failed)} of {len(results)} searches succeeded "
+        f"in {elapsed:.1f}s"
+        + (f", {partial} stopped by the deadline." if partial else ".")
+    )
+    lines += [f"  {result.name}: {result.error}" for result in failed]
+    return "\n".join(lines)
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m batch",
+        description="Run a file of searches concurrently and export their candidate lists.",
+    )
+    parser.add_argument("specs", help="a .json, .jsonl or .csv file of searches")
+    parser.add_argument(
+        "--output-dir", default="batch_output", help="where the candidate lists are written"
+    )
+    parser.add_argument(
+        "--parallel", type=int, default=JOB_WORKERS, help="searches run at the same time"
+    )
+    parser.add_argument(
+        "--format",
+        default=EXPORT_FORMAT,
+        choices=get_export_formats(),
+        help="format of the specs that do not choose one",
+    )
+    parser.add_argument("--metrics", action="store_true", help="print the stage metrics")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> int:
+    options = parse_args(args)
+    setup_logging()
+    try:
+        specs = load_specs(options.specs)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read {options.specs}: {e}", file=sys.stderr)
+        return 2
+    formats = get_export_formats()
+    for spec in specs:
+        if spec.export_format and spec.export_format not in formats:
+            print(
+                f"Search {spec.name}: unknown export format {spec.export_format}, "
+                f"use one of {', '.join(formats)}",
+                file=sys.stderr,
+            )
+            return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(
+        run_batch(specs, options.output_dir, options.format, options.parallel)
+    )
+    elapsed = time.perf_counter() - started
+
+    print(format_summary(results, elapsed))
+    if options.metrics:
+        print(REGISTRY.render())
+    summary_path = os.path.join(options.output_dir, "summary.json")
+    with open(summary_path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "elapsed": elapsed,
+                "parallel": options.parallel,
+                "searches": [asdict(result) for result in results],
+            },
+            file,
+            indent=2,
+            ensure_ascii=False,
+        )
+    return 0 if all(result.status != "failed" for result in results) else 1
@@ -0,0 +1,99 @@
+import csv
+import json
+import os
+from dataclasses import dataclass, fields
+
+# Spec fields that hold a number of results rather than text.
+INT_FIELDS = {"max_results"}
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    """One search of a batch, with the answers the bot asks for in a chat.
+
+    Filters left empty are not applied. The experience and salary values are
+    the labels of the work.ua filter options, e.g. "від 10 000 грн".
+    """
+
+    name: str
+    position: str | None = None
+    location: str | None = None
+    skills: str | None = None
+    experience: str | None = None
+    min_salary: str | None = None
+    max_salary: str | None = None
+    max_results: int | None = None
+    export_format: str | None = None
+
+
+def parse_spec(raw: dict, index: int) -> SearchSpec:
+    """Build a search spec from a record of a spec file.
+    Args:
+        raw (dict): The fields of the spec, all of them optional.
+        index (int): The position of the spec in the file, named after it if it has no name.
+    Returns:
+        SearchSpec: The spec, with empty values as None.
+    """
+
+    known = {spec_field.name for spec_field in fields(SearchSpec)}
+    unknown = set(raw) - known
+    if unknown:
+        raise ValueError(f"Search {index}: unknown fields {', '.join(sorted(unknown))}")
+
+    values = {}
+    for key, value in raw.items():
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        if key in INT_FIELDS:
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Search {index}: {key} must be a number, got {value!r}")
+            if value <= 0:
+                continue
+        else:
+            value = str(value)
+        values[key] = value
+    values.setdefault("name", f"search-{index}")
+    if os.path.basename(values["name"]) != values["name"]:
+        # Names are used as file names in the output directory.
+        raise ValueError(f"Search {index}: the name {values['name']!r} is not a file name")
+    return SearchSpec(**values)
+
+
+def load_specs(path: str) -> list[SearchSpec]:
+    """Read the searches of a batch from a file.
+
+    A ".json" file holds a list of searches or an object with a "searches"
+    list, a ".jsonl" file one search per line and a ".csv" file one search per
+    row, with the SearchSpec fields as columns.
+    Args:
+        path (str): The path of the spec file.
+    Returns:
+        [SearchSpec]: The searches in file order.
+    """
+
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as file:
+        if extension == ".json":
+            records = json.load(file)
+            if isinstance(records, dict):
+                records = records.get("searches", [])
+        elif extension == ".jsonl":
+            records = [json.loads(line) for line in file if line.strip()]
+        elif extension == ".csv":
+            records = list(csv.DictReader(file))
+        else:
+            raise ValueError(f"Unsupported spec file {path}, use .json, .jsonl or .csv")
+
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise ValueError(f"{path} must hold a list of searches")
+    specs = [parse_spec(record, index) for index, record in enumerate(records, 1)]
+
+    names = [spec.name for spec in specs]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate search names: {', '.join(sorted(duplicates))}")
+    return specs
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Benchmarks measure full scrapes, so the resume cache, the candidate store and
+# checkpoints are disabled before the settings are loaded.
+os.environ["RESUME_CACHE_PATH"] = ""
+os.environ["CANDIDATE_STORE_PATH"] = ""
+os.environ["CHECKPOINT_PATH"] = ""
+
+from .run import main  # noqa: E402
+
+sys.exit(main())
@@ -0,0 +1,81 @@
+import random
+
+EDUCATION_BLOCK = "<h2>Освіта</h2><p>Київський політехнічний інститут, 2015 – 2019</p>"
+ADDITIONAL_EDUCATION_BLOCK = (
+    "<h2>Додаткова освіта та сертифікати</h2><p>Курси, 2021</p>"
+)
+ENGLISH_BLOCK = "<p>Англійська — вище середнього</p>"
+FILLER_PARAGRAPH = (
+    "<p>Розробка та підтримка веб-сервісів, код-рев'ю, написання тестів "
+    "та документації, взаємодія з командою та замовником.</p>"
+)
+POSITIONS = ["Python developer", "Backend developer", "Software engineer", "QA engineer"]
+CONDITIONS = [
+    "Повна зайнятість, віддалена робота",
+    "Повна зайнятість",
+    "Неповна зайнятість, віддалена робота",
+]
+
+
+def listing_page(page: int, num_pages: int, per_page: int) -> str:
+    """Render a page of candidates with the markup of a work.ua search page.
+    Args:
+        page (int): The number of the page.
+        num_pages (int): The total number of pages.
+        per_page (int): The number of resume cards on the page.
+    Returns:
+        str: The HTML of the page.
+    """
+
+    cards = "".join(
+        f'<div class="card resume-link"><h2><a href="/resumes/{resume_id}/">'
+        f"Candidate {resume_id}</a></h2></div>"
+        for resume_id in range((page - 1) * per_page, page * per_page)
+    )
+    pagination = ""
+    if num_pages > 1:
+        links = "".join(
+            f'<li><a href="?page={number}">{number}</a></li>'
+            for number in range(1, num_pages + 1)
+        )
+        pagination = (
+            f'<nav><ul class="pagination">{links}'
+            f'<li><a href="?page={min(page + 1, num_pages)}">Наступна</a></li>'
+            f"</ul></nav>"
+        )
+    return (
+        '<html><head><meta charset="utf-8"></head><body>'
+        f'<div id="pjax-resume-list">{cards}</div>{pagination}</body></html>'
+    )
+
+
+def resume_page(resume_id: int, padding: int = 0, seed: int = 0) -> str:
+    """Render a resume page with the markup the extractors read.
+
+    The attributes of a resume only depend on its id and the seed, so every
+    run scrapes the same candidates.
+    Args:
+        resume_id (int): The id of the resume.
+        padding (int, optional): The number of filler paragraphs, to get realistic page sizes.
+        seed (int, optional): The seed of the random attributes.
+    Returns:
+        str: The HTML of the resume page.
+    """
+
+    rng = random.Random(seed * 1_000_003 + resume_id)
+    skills = "".join(
+        f'<li><span class="label"><span class="ellipsis">Skill {number}</span></span></li>'
+        for number in range(rng.randint(0, 30))
+    )
+    return (
+        '<html><head><meta charset="utf-8"></head><body><div class="card">'
+        f'<div class="add-top"><h1 class="cut-top"> Кандидат {resume_id} </h1>'
+        f"<h2>{rng.choice(POSITIONS)}, {rng.randint(20, 120)} 000 грн</h2></div>"
+        '<dl class="dl-horizontal"><dt>Місто</dt><dd>Київ</dd>'
+        f"<dt>Готовий працювати</dt><dd>{rng.choice(CONDITIONS)}</dd></dl>"
+        f"{EDUCATION_BLOCK if rng.random() < 0.7 else ''}"
+        f"{ADDITIONAL_EDUCATION_BLOCK if rng.random() < 0.4 else ''}"
+        f"{ENGLISH_BLOCK if rng.random() < 0.5 else ''}"
+        f"<ul>{skills}</ul>{FILLER_PARAGRAPH * padding}"
+        "</div></body></html>"
+    )
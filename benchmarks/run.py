@@ -0,0 +1,241 @@
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+from config.settings import EXTRACTOR, SCRAPER_WORKERS
+from monitoring.metrics import REGISTRY
+from scraper.candidates_scraper import CandidateScraper
+from scraper.extractors import get_extractor
+from scraper.http_client import close_http_client
+from scraper.scheduler import AdaptiveLimiter, FetchScheduler
+from .server import ServerConfig, ServerProcess
+
+# Metrics where a higher value is better, the others are better lower.
+HIGHER_IS_BETTER = {"pages_per_sec", "resumes_per_sec"}
+COMPARED_METRICS = ["pages_per_sec", "resumes_per_sec", "p50_latency", "p99_latency"]
+
+
+class RecordingScheduler(FetchScheduler):
+    """A FetchScheduler recording the latency of every request it makes."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    async def fetch_once(self, session, url, params=None, headers=None):
+        started = time.perf_counter()
+        try:
+            return await super().fetch_once(session, url, params, headers)
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+
+@dataclass
+class BenchmarkResult:
+    pages: int
+    resumes: int
+    failed: int
+    requests: int
+    injected_errors: int
+    elapsed: float
+    pages_per_sec: float
+    resumes_per_sec: float
+    p50_latency: float
+    p99_latency: float
+    peak_rss_mb: float
+    cpu_time: float
+
+    def format(self) -> str:
+        return "\n".join(
+            [
+                f"pages:           {self.pages}",
+                f"resumes:         {self.resumes} ({self.failed} failed)",
+                f"requests:        {self.requests} ({self.injected_errors} injected errors)",
+                f"elapsed:         {self.elapsed:.2f}s",
+                f"pages/sec:       {self.pages_per_sec:.1f}",
+                f"resumes/sec:     {self.resumes_per_sec:.1f}",
+                f"latency p50/p99: {self.p50_latency * 1000:.1f}ms / {self.p99_latency * 1000:.1f}ms",
+                f"peak RSS:        {self.peak_rss_mb:.1f} MB",
+                f"CPU time:        {self.cpu_time:.2f}s",
+            ]
+        )
+
+
+def cpu_time(who: int) -> float:
+    usage = resource.getrusage(who)
+    return usage.ru_utime + usage.ru_stime
+
+
+def peak_rss_mb() -> float:
+    """Get the peak resident set size of this process and its reaped children."""
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    unit = 1 if sys.platform == "darwin" else 1024
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return peak * unit / 1024 / 1024
+
+
+async def scrape(
+    url: str, workers: int, extractor: str, parse_workers: int
+) -> tuple[CandidateScraper, RecordingScheduler, int, float, float]:
+    executor = ProcessPoolExecutor(parse_workers) if parse_workers else None
+    scheduler = RecordingScheduler(
+        AdaptiveLimiter(maximum=workers), backoff=0.05, max_backoff=1
+    )
+    scraper = CandidateScraper(
+        url, workers, scheduler, get_extractor(extractor), executor
+    )
+    # Every run has to fetch and parse all pages.
+    scraper.cache = None
+    scraper.store = None
+    scraper.checkpoints = None
+    scraper.executor = executor
+
+    cpu_started = cpu_time(resource.RUSAGE_SELF) + cpu_time(resource.RUSAGE_CHILDREN)
+    started = time.perf_counter()
+    candidates = await scraper.get_all_candidates()
+    elapsed = time.perf_counter() - started
+    await close_http_client()
+    if executor is not None:
+        # Worker processes are only counted in RUSAGE_CHILDREN once they exit.
+        executor.shutdown()
+    cpu = cpu_time(resource.RUSAGE_SELF) + cpu_time(resource.RUSAGE_CHILDREN)
+    return scraper, scheduler, len(candidates), elapsed, cpu - cpu_started
+
+
+def run_benchmark(
+    config: ServerConfig,
+    workers: int = SCRAPER_WORKERS,
+    extractor: str = EXTRACTOR,
+    parse_workers: int = 0,
+) -> BenchmarkResult:
+    """Scrape a stand-in server and measure the scraper.
+    Args:
+        config (ServerConfig): The pages, latency and errors of the server.
+        workers (int): The maximum number of concurrent resume workers.
+        extractor (str): The resume page extractor, "lxml" or "soup".
+        parse_workers (int): The number of parse worker processes, 0 parses inline.
+    Returns:
+        BenchmarkResult: The throughput, latency and resource usage of the run.
+    """
+
+    with ServerProcess(config) as server:
+        scraper, scheduler, resumes, elapsed, cpu = asyncio.run(
+            scrape(server.url, workers, extractor, parse_workers)
+        )
+        # Read before the server process exits and is counted as a child.
+        rss = peak_rss_mb()
+
+    latencies = np.array(scheduler.latencies or [0.0])
+    return BenchmarkResult(
+        pages=config.pages,
+        resumes=resumes,
+        failed=len(scraper.failed),
+        requests=server.requests,
+        injected_errors=server.errors,
+        elapsed=elapsed,
+        pages_per_sec=config.pages / elapsed,
+        resumes_per_sec=resumes / elapsed,
+        p50_latency=float(np.percentile(latencies, 50)),
+        p99_latency=float(np.percentile(latencies, 99)),
+        peak_rss_mb=rss,
+        cpu_time=cpu,
+    )
+
+
+def compare(result: BenchmarkResult, baseline: dict, tolerance: float) -> list[str]:
+    """Get the metrics that regressed by more than the tolerance against a baseline."""
+
+    regressions = []
+    for metric in COMPARED_METRICS:
+        expected = baseline.get(metric)
+        if not expected:
+            continue
+        actual = getattr(result, metric)
+        change = (actual - expected) / expected
+        if metric in HIGHER_IS_BETTER:
+            change = -change
+        if change > tolerance:
+            regressions.append(
+                f"{metric}: {actual:.4g} against {expected:.4g} ({change:+.0%} worse)"
+            )
+    return regressions
+
+
+def parse_args(args: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the candidate scraper against a local stand-in for work.ua.",
+    )
+    parser.add_argument("--pages", type=int, default=10, help="listing pages to serve")
+    parser.add_argument("--per-page", type=int, default=14, help="resumes per listing page")
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="random extra latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of failed requests")
+    parser.add_argument("--error-status", type=int, default=503, help="status of failed requests")
+    parser.add_argument("--padding", type=int, default=200, help="filler paragraphs per resume")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=SCRAPER_WORKERS)
+    parser.add_argument("--extractor", default=EXTRACTOR, choices=["lxml", "soup"])
+    parser.add_argument("--parse-workers", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs, the best one is reported")
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--baseline", help="compare with a result written by --json")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed regression against the baseline"
+    )
+    parser.add_argument("--metrics", action="store_true", help="print the stage metrics")
+    parser.add_argument("--verbose", action="store_true", help="show the scraper logs")
+    return parser.parse_args(args)
+
+
+def main(args: list[str] | None = None) -> int:
+    options = parse_args(args)
+    logging.basicConfig(
+        level=logging.INFO if options.verbose else logging.WARNING,
+        format="[%(levelname)8s]: %(message)s",
+    )
+    config = ServerConfig(
+        pages=options.pages,
+        per_page=options.per_page,
+        latency=options.latency,
+        jitter=options.jitter,
+        error_rate=options.error_rate,
+        error_status=options.error_status,
+        padding=options.padding,
+        seed=options.seed,
+    )
+
+    results = [
+        run_benchmark(config, options.workers, options.extractor, options.parse_workers)
+        for _ in range(options.repeat)
+    ]
+    result = max(results, key=lambda run: run.resumes_per_sec)
+    print(result.format())
+    if options.metrics:
+        print(REGISTRY.render())
+
+    if options.json:
+        with open(options.json, "w") as file:
+            json.dump(asdict(result), file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as file:
+            regressions = compare(result, json.load(file), options.tolerance)
+        if regressions:
+            print("Regressions against the baseline:")
+            print("\n".join(f"  {regression}" for regression in regressions))
+            return 1
+        print("No regressions against the baseline.")
+    return 0
@@ -0,0 +1,133 @@
+import asyncio
+import multiprocessing
+import random
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from .pages import listing_page, resume_page
+
+SEARCH_PATH = "/resumes/"
+
+
+@dataclass
+class ServerConfig:
+    """The shape and behaviour of the stand-in server."""
+
+    pages: int = 10
+    per_page: int = 14
+    latency: float = 0.05
+    jitter: float = 0.05
+    error_rate: float = 0.0
+    error_status: int = 503
+    padding: int = 200
+    seed: int = 0
+
+
+class StandInServer:
+    """A local stand-in for work.ua serving synthetic search and resume pages.
+
+    Every response is delayed by `latency` plus a random part of `jitter`
+    seconds, and a share of `error_rate` requests fails with `error_status`.
+    """
+
+    def __init__(self, config: ServerConfig | None = None) -> None:
+        self.config = config or ServerConfig()
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(self.config.seed)
+        self._resumes: dict[int, bytes] = {}
+        self._runner = None
+        self.url = None
+
+    def build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(SEARCH_PATH, self.listing)
+        app.router.add_get(SEARCH_PATH + "{resume_id:\\d+}/", self.resume)
+        return app
+
+    async def respond(self, body: bytes) -> web.Response:
+        config = self.config
+        self.requests += 1
+        await asyncio.sleep(config.latency + self._random.uniform(0, config.jitter))
+        if self._random.random() < config.error_rate:
+            self.errors += 1
+            return web.Response(status=config.error_status)
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
+
+    async def listing(self, request: web.Request) -> web.Response:
+        config = self.config
+        page = min(max(int(request.query.get("page", 1)), 1), config.pages)
+        body = listing_page(page, config.pages, config.per_page).encode()
+        return await self.respond(body)
+
+    async def resume(self, request: web.Request) -> web.Response:
+        resume_id = int(request.match_info["resume_id"])
+        if resume_id >= self.config.pages * self.config.per_page:
+            raise web.HTTPNotFound()
+        body = self._resumes.get(resume_id)
+        if body is None:
+            body = resume_page(resume_id, self.config.padding, self.config.seed).encode()
+            self._resumes[resume_id] = body
+        return await self.respond(body)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving on the running event loop.
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on, 0 picks a free one.
+        Returns:
+            str: The URL of the search page.
+        """
+
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}{SEARCH_PATH}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _serve(config: ServerConfig, connection) -> None:
+    async def serve() -> None:
+        server = StandInServer(config)
+        connection.send(await server.start())
+        # Serve until the parent asks for the request counters.
+        await asyncio.get_running_loop().run_in_executor(None, connection.recv)
+        connection.send((server.requests, server.errors))
+        await server.stop()
+
+    asyncio.run(serve())
+
+
+class ServerProcess:
+    """Run a StandInServer in a child process, so it does not compete with the
+    scraper for the event loop and does not count towards its CPU time."""
+
+    def __init__(self, config: ServerConfig | None = None) -> None:
+        self.config = config or ServerConfig()
+        self.url = None
+        self.requests = 0
+        self.errors = 0
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(self.config, child), daemon=True
+        )
+
+    def __enter__(self) -> "ServerProcess":
+        self._process.start()
+        self.url = self._connection.recv()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._connection.send("stop")
+        self.requests, self.errors = self._connection.recv()
+        self._process.join(timeout=10)
+        if self._process.is_alive():
+            self._process.terminate()
@@ -1,8 +1,16 @@
 import logging
 import sys
 
+_configured = False
+
 
 def setup_logging() -> None:
+    """Configure logging to parser.log and stdout, once per process."""
+
+    global _configured
+    if _configured:
+        return
+    _configured = True
     logging.basicConfig(
         level=logging.INFO,
         format="[%(levelname)8s]: %(message)s",
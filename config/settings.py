@@ -0,0 +1,114 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "http" builds search URLs without a browser, "selenium" drives Chrome.
+PARSER_MODE = os.getenv("PARSER_MODE", "http")
+
+# Warm Chrome drivers shared by the Selenium parser.
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "4"))
+DRIVER_MAX_USES = int(os.getenv("DRIVER_MAX_USES", "50"))
+DRIVER_POOL_TIMEOUT = float(os.getenv("DRIVER_POOL_TIMEOUT", "60"))
+
+# Number of resume pages scraped concurrently by one search, and the most
+# requests all searches together send to one host at a time.
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "20"))
+
+# Adaptive request scheduling, shared by all searches per host: the limit starts at
+# SCRAPER_INITIAL_CONCURRENCY, grows up to SCRAPER_WORKERS while responses are
+# faster than TARGET_LATENCY seconds and halves on slow responses, 429 or 5xx.
+SCRAPER_INITIAL_CONCURRENCY = int(os.getenv("SCRAPER_INITIAL_CONCURRENCY", "5"))
+TARGET_LATENCY = float(os.getenv("TARGET_LATENCY", "2"))
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "15"))
+REQUEST_RETRIES = int(os.getenv("REQUEST_RETRIES", "3"))
+
+# Connection pool of the HTTP client shared by all scrapes: open connections in
+# total and per host, how long DNS lookups and idle connections are reused
+# (seconds), and whether certificates are verified against the certifi bundle.
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "20"))
+HTTP_DNS_CACHE_TTL = float(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_VERIFY_SSL = os.getenv("HTTP_VERIFY_SSL", "1") == "1"
+
+# Resume page extractor: "lxml" (fast, single pass) or "soup" (reference).
+# With EXTRACTOR_VERIFY=1 every page is also parsed by "soup" and mismatches are logged.
+EXTRACTOR = os.getenv("EXTRACTOR", "lxml")
+EXTRACTOR_VERIFY = os.getenv("EXTRACTOR_VERIFY", "0") == "1"
+
+# Number of worker processes pages are parsed in, 0 parses on the event loop.
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+
+# On-disk cache of resume pages, an empty path disables it.
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", "resume_cache.sqlite3")
+RESUME_CACHE_TTL = float(os.getenv("RESUME_CACHE_TTL", str(24 * 60 * 60)))
+RESUME_CACHE_MAX_MB = int(os.getenv("RESUME_CACHE_MAX_MB", "500"))
+
+# Local candidate store: resumes seen within CANDIDATE_MAX_AGE seconds are not
+# fetched again, and a query run within QUERY_MAX_AGE is answered from the store.
+CANDIDATE_STORE_PATH = os.getenv("CANDIDATE_STORE_PATH", "candidates.sqlite3")
+CANDIDATE_MAX_AGE = float(os.getenv("CANDIDATE_MAX_AGE", str(7 * 24 * 60 * 60)))
+QUERY_MAX_AGE = float(os.getenv("QUERY_MAX_AGE", str(60 * 60)))
+
+# Checkpoints of running scrapes: listing pages and candidates are saved every
+# CHECKPOINT_INTERVAL seconds, so a failed or interrupted search continues where
+# it stopped. CHECKPOINT_PATH is their SQLite file, an empty path disables them.
+# Checkpoints older than CHECKPOINT_MAX_AGE seconds are discarded.
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "checkpoints.sqlite3")
+CHECKPOINT_INTERVAL = float(os.getenv("CHECKPOINT_INTERVAL", "5"))
+CHECKPOINT_MAX_AGE = float(os.getenv("CHECKPOINT_MAX_AGE", str(24 * 60 * 60)))
+
+# How long the experience and salary menus of a search page are cached, in seconds.
+FILTER_OPTIONS_TTL = float(os.getenv("FILTER_OPTIONS_TTL", str(60 * 60)))
+
+# Scrape budget, 0 means unlimited: the number of resumes scraped in listing
+# order, the number of listing pages read and the time after which a search
+# stops and returns the candidates scraped so far, in seconds.
+MAX_RESULTS = int(os.getenv("MAX_RESULTS", "0"))
+MAX_PAGES = int(os.getenv("MAX_PAGES", "0"))
+SCRAPE_DEADLINE = float(os.getenv("SCRAPE_DEADLINE", "0"))
+
+# Minimum time between two progress updates of a running search, in seconds.
+PROGRESS_INTERVAL = float(os.getenv("PROGRESS_INTERVAL", "10"))
+
+# Scrape job queue: identical queries share one scrape, users are served round-robin.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_MAX_PER_USER = int(os.getenv("JOB_MAX_PER_USER", "3"))
+
+# Comma-separated job boards every search is run on concurrently.
+SEARCH_SOURCES = os.getenv("SEARCH_SOURCES", "workua")
+
+# Weights candidates are ranked with: "default", "skills", "education" or "english".
+SCORING_PROFILE = os.getenv("SCORING_PROFILE", "default")
+
+# Saved searches re-run every WATCH_INTERVAL seconds that send only new or
+# changed candidates. WATCH_STORE_PATH is their SQLite file, an empty path
+# disables them. Due searches are looked up every WATCH_CHECK_INTERVAL seconds.
+WATCH_STORE_PATH = os.getenv("WATCH_STORE_PATH", "watches.sqlite3")
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", str(24 * 60 * 60)))
+WATCH_CHECK_INTERVAL = float(os.getenv("WATCH_CHECK_INTERVAL", "60"))
+WATCH_MAX_PER_CHAT = int(os.getenv("WATCH_MAX_PER_CHAT", "5"))
+
+# Default format of exported candidate lists: "csv", "csv.gz", "jsonl",
+# "jsonl.gz" or "xlsx" (requires openpyxl). Users can change it with /format.
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "csv")
+
+# Profiling of searches: with PROFILE_JOBS=1 every search is profiled, and the
+# Telegram users in ADMIN_IDS (comma-separated) can profile the next search of
+# their chat with /profile. Reports list the PROFILE_TOP slowest awaits,
+# allocations and functions and are written to PROFILE_DIR.
+PROFILE_JOBS = os.getenv("PROFILE_JOBS", "0") == "1"
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOP = int(os.getenv("PROFILE_TOP", "25"))
+ADMIN_IDS = {
+    int(admin_id)
+    for admin_id in os.getenv("ADMIN_IDS", "").split(",")
+    if admin_id.strip()
+}
+
+# Local metrics endpoint in the Prometheus text format, port 0 disables it.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
@@ -1,73 +1,162 @@
+import logging
+from typing import Awaitable, Callable
+
+from config.settings import PARSER_MODE
+from models import CandidateBatch
+from monitoring.metrics import timed
+from monitoring.profiling import JobProfile
 from parsers.candidates_parser import CandidatesParser
+from parsers.http_parser import HttpCandidatesParser
 from scraper.candidates_scraper import CandidateScraper
+from scraper.limits import ScrapeLimits
+from scraper.multi_source import MultiSourceScraper
+from scraper.progress import ProgressReporter, ScrapeProgress
+from scraper.sources import SearchFilters, get_source_for_url, get_sources
+
+Parser = CandidatesParser | HttpCandidatesParser
+
+
+def create_parser(mode: str = PARSER_MODE) -> Parser:
+    """Create a parser for the given mode.
+    Args:
+        mode (str, optional): "http" to build URLs without a browser or "selenium"
+            to drive Chrome. Defaults to the PARSER_MODE setting.
+    """
+
+    if mode == "selenium":
+        return CandidatesParser()
+    return HttpCandidatesParser()
 
 
 def filter_employees_without_salary(
     position: str | None,
     location: str | None,
     skills: str | None,
-) -> CandidatesParser:
-    employees = CandidatesParser()
-    if position:
-        employees.get_employees_by_job_position(position)
-    if location:
-        employees.get_employees_by_location(location)
-    if skills:
-        employees.get_employees_by_skills_or_keywords(skills)
+) -> Parser:
+    with timed("navigation_start"):
+        employees = create_parser()
+    try:
+        if position:
+            with timed("navigation_position"):
+                employees.get_employees_by_job_position(position)
+        if location:
+            with timed("navigation_location"):
+                employees.get_employees_by_location(location)
+        if skills:
+            with timed("navigation_skills"):
+                employees.get_employees_by_skills_or_keywords(skills)
+    except Exception:
+        # The caller never gets the parser, so anything it holds is released here.
+        employees.close_driver()
+        raise
     return employees
 
 
 def get_available_candidates_experience(
-        parsed_candidates: CandidatesParser
+        parsed_candidates: Parser
 ) -> list[str]:
-    parsed_candidates.driver.get(parsed_candidates.BASE_URL)
-    experience = parsed_candidates.get_options_from_checkbox()
-    return experience
+    with timed("navigation_experience_options"):
+        options = parsed_candidates.get_filter_options().experience
+    return [option.label for option in options]
 
 
 def filter_candidates_by_experience(
-        parsed_candidates: CandidatesParser, value: str
-) -> CandidatesParser:
-    parsed_candidates.get_employees_by_years_of_experience(value)
+        parsed_candidates: Parser, value: str
+) -> Parser:
+    with timed("navigation_experience"):
+        parsed_candidates.get_employees_by_years_of_experience(value)
     return parsed_candidates
 
 
 def get_available_salary_expectations(
-    parsed_candidates: CandidatesParser, max_salary: bool = False
+    parsed_candidates: Parser, max_salary: bool = False
 ) -> list[str]:
-    parsed_candidates.driver.get(parsed_candidates.BASE_URL)
-    salary_expectations = parsed_candidates.get_options_from_select_list()
-    if max_salary:
-        salary_expectations = parsed_candidates.get_options_from_select_list(max_salary)
-    return salary_expectations
+    with timed("navigation_salary_options"):
+        options = parsed_candidates.get_salary_options(max_salary)
+    return [option.label for option in options]
 
 
 def filter_candidates_by_salary_expectations(
-        parsed_candidates: CandidatesParser,
+        parsed_candidates: Parser,
         value: str,
         max_salary: bool = False
-) -> CandidatesParser:
-    parsed_candidates.driver.get(parsed_candidates.BASE_URL)
-
-    if max_salary:
-        parsed_candidates.get_employee_by_salary_expectation(value, max_salary)
-    else:
-        parsed_candidates.get_employee_by_salary_expectation(value)
+) -> Parser:
+    with timed("navigation_salary"):
+        if max_salary:
+            parsed_candidates.get_employee_by_salary_expectation(value, max_salary)
+        else:
+            parsed_candidates.get_employee_by_salary_expectation(value)
 
     return parsed_candidates
 
 
-async def scrap_all_candidates(
-    candidates: CandidatesParser, doc_name: str = "candidates.csv"
-) -> None:
+def warm_filter_options() -> None:
+    """Load the filter menus of the unfiltered search page into the shared cache,
+    so the salary menus are ready before the first user asks for them."""
+
+    parser = create_parser()
+    try:
+        parser.get_filter_options()
+    except Exception as e:
+        logging.warning(f"Failed to preload the filter options: {e}")
+    finally:
+        parser.close_driver()
+
+
+def get_extra_search_urls(
+    url: str,
+    position: str | None,
+    location: str | None,
+    skills: str | None,
+    filters: SearchFilters | None = None,
+) -> list[str]:
+    """Get the search URLs of a query on the other configured sources.
+    Args:
+        url (str): The filtered candidates URL of the query on its own source.
+        position (str | None): The job position to search for.
+        location (str | None): The location to search for.
+        skills (str | None): The skills or keywords to search for.
+        filters (SearchFilters | None, optional): The experience and salary filters
+            applied to url, carried over to the other sources.
+    Returns:
+        [str]: The URLs on every SEARCH_SOURCES board other than the one of url.
     """
-    Scrapes all candidates' data and writes it to a CSV file.
+
+    primary = get_source_for_url(url).name
+    return [
+        source.search_url(position, location, skills, filters)
+        for source in get_sources()
+        if source.name != primary
+    ]
+
+
+async def sort_filtered_candidates(
+    url: str,
+    on_progress: Callable[[ScrapeProgress], Awaitable[None]] | None = None,
+    limits: ScrapeLimits | None = None,
+    extra_urls: tuple[str, ...] = (),
+    profile: JobProfile | None = None,
+) -> CandidateBatch:
+    """
+    Scrapes and sorts the candidates of a filtered candidates page.
     Args:
-        candidates (CandidatesParser): The parser object to use for scraping.
-        doc_name (str, optional): The name of the CSV file to write data to. Defaults to "candidates.csv".
+        url (str): The URL of the filtered candidates page.
+        on_progress (optional): A coroutine function receiving ScrapeProgress updates.
+        limits (ScrapeLimits | None, optional): The budget of the scrape. Defaults to no limits.
+        extra_urls (tuple[str, ...], optional): Search URLs of the same query on other
+            sources, scraped concurrently and merged into one ranking.
+        profile (JobProfile | None, optional): Records the scrape as its "scrape" section.
+    Returns:
+        CandidateBatch: The candidates sorted by ratings, the best partial
+            result if the scrape was stopped by its limits.
     """
 
-    scraper = CandidateScraper(candidates.BASE_URL)
-    result = await scraper.sort_candidates()
-    scraper.write_data_to_csv(result, doc_name)
-    candidates.close_driver()
+    if extra_urls:
+        scraper = MultiSourceScraper([url, *extra_urls], limits=limits)
+    else:
+        scraper = CandidateScraper(url, limits=limits)
+    progress = ProgressReporter(on_progress) if on_progress else None
+    if profile is None:
+        return await scraper.sort_candidates(progress)
+    with profile.section("scrape"):
+        return await scraper.sort_candidates(progress)
@@ -0,0 +1,266 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from config.settings import JOB_MAX_PER_USER, JOB_QUEUE_SIZE, JOB_WORKERS
+from models import CandidateBatch
+from monitoring.metrics import SEARCHES, timed
+from monitoring.profiling import JobProfile
+from scraper.limits import ScrapeLimits, job_key
+from scraper.progress import ScrapeProgress
+from storage.checkpoint_store import get_checkpoint_store
+
+ProgressCallback = Callable[[ScrapeProgress], Awaitable[None]]
+Runner = Callable[..., Awaitable[CandidateBatch]]
+
+
+class JobQueueFull(Exception):
+    """Raised when a job cannot be queued because of the queue limits."""
+
+
+def forget_checkpoint(
+    url: str, limits: ScrapeLimits | None = None, extra_urls: tuple[str, ...] = ()
+) -> None:
+    """Delete the saved progress of a search once its result is delivered, so
+    a later run of the same search scrapes fresh pages instead of continuing it.
+    Args:
+        url (str): The URL of the filtered candidates page.
+        limits (ScrapeLimits | None, optional): The budget the search ran with.
+        extra_urls (tuple[str, ...], optional): The query on other sources.
+    """
+
+    store = get_checkpoint_store()
+    if store is None:
+        return
+    key = job_key(url, limits or ScrapeLimits(), tuple(extra_urls))
+    try:
+        store.delete(key)
+    except Exception as e:
+        # The result is delivered already, a stale checkpoint only expires later.
+        logging.error(f"Failed to delete the checkpoint of {key}: {e!r}")
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One user's interest in the result of a scrape job."""
+
+    user_id: int
+    job: "ScrapeJob"
+    on_progress: ProgressCallback | None = None
+    future: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+    async def wait(self) -> CandidateBatch:
+        """Wait for the sorted candidates of the job."""
+
+        return await self.future
+
+
+@dataclass(eq=False)
+class ScrapeJob:
+    """A scrape of one normalized URL shared by all users who requested it."""
+
+    key: str
+    url: str
+    user_id: int
+    limits: ScrapeLimits = field(default_factory=ScrapeLimits)
+    extra_urls: tuple[str, ...] = ()
+    profile: JobProfile | None = None
+    subscriptions: list[Subscription] = field(default_factory=list)
+    task: asyncio.Task | None = None
+
+    async def report(self, progress: ScrapeProgress) -> None:
+        """Pass a progress update to every subscriber."""
+
+        for subscription in list(self.subscriptions):
+            if subscription.on_progress is None:
+                continue
+            try:
+                await subscription.on_progress(progress)
+            except Exception as e:
+                logging.warning(f"Failed to report progress to {subscription.user_id}: {e}")
+
+
+class JobQueue:
+    """A bounded queue of scrape jobs run by a pool of workers.
+
+    Users are served round-robin, so one user's jobs do not delay everybody
+    else's, and identical queries share one in-flight scrape.
+    """
+
+    def __init__(
+        self,
+        runner: Runner,
+        workers: int = JOB_WORKERS,
+        max_size: int = JOB_QUEUE_SIZE,
+        max_per_user: int = JOB_MAX_PER_USER,
+    ) -> None:
+        """Initialize the JobQueue.
+        Args:
+            runner: A coroutine function scraping a URL with a progress callback,
+                ScrapeLimits, the URLs of other sources and a JobProfile, and
+                returning sorted candidates.
+            workers (int): The number of jobs run at the same time.
+            max_size (int): The maximum number of queued jobs.
+            max_per_user (int): The maximum number of queued jobs of one user.
+        """
+
+        self.runner = runner
+        self.workers = workers
+        self.max_size = max_size
+        self.max_per_user = max_per_user
+        self._pending: dict[int, deque[ScrapeJob]] = {}
+        self._users: deque[int] = deque()
+        self._jobs: dict[str, ScrapeJob] = {}
+        self._size = 0
+        self._condition = None
+        self._workers = []
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+
+        self._condition = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers and the jobs they are running."""
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self,
+        user_id: int,
+        url: str,
+        on_progress: ProgressCallback | None = None,
+        limits: ScrapeLimits | None = None,
+        extra_urls: tuple[str, ...] = (),
+        profile: JobProfile | None = None,
+    ) -> Subscription:
+        """Request the sorted candidates of a filtered candidates URL.
+        Args:
+            user_id (int): The user the job is run for.
+            url (str): The URL of the filtered candidates page.
+            on_progress (optional): A coroutine function receiving ScrapeProgress updates.
+            limits (ScrapeLimits | None, optional): The budget of the scrape.
+            extra_urls (tuple[str, ...], optional): The query on other sources.
+            profile (JobProfile | None, optional): The profile the scrape is recorded in.
+                A request joining a running scrape does not change its profile.
+        Returns:
+            Subscription: The subscription to await the result with.
+        Raises:
+            JobQueueFull: If the queue or the user's share of it is full.
+        """
+
+        limits = limits or ScrapeLimits()
+        extra_urls = tuple(extra_urls)
+        key = job_key(url, limits, extra_urls)
+        job = self._jobs.get(key)
+        if job is None:
+            if self._size >= self.max_size:
+                raise JobQueueFull("The job queue is full.")
+            if len(self._pending.get(user_id, ())) >= self.max_per_user:
+                raise JobQueueFull(f"User {user_id} has too many queued jobs.")
+            job = ScrapeJob(key, url, user_id, limits, extra_urls, profile)
+            self._jobs[key] = job
+            async with self._condition:
+                if user_id not in self._pending:
+                    self._pending[user_id] = deque()
+                    self._users.append(user_id)
+                self._pending[user_id].append(job)
+                self._size += 1
+                self._condition.notify()
+        else:
+            logging.info(f"Joining the running scrape of {key}")
+
+        subscription = Subscription(user_id, job, on_progress)
+        job.subscriptions.append(subscription)
+        return subscription
+
+    def cancel(self, subscription: Subscription) -> None:
+        """Cancel a subscription, and its job if nobody else is waiting for it."""
+
+        job = subscription.job
+        if subscription in job.subscriptions:
+            job.subscriptions.remove(subscription)
+        subscription.future.cancel()
+        if job.subscriptions:
+            return
+
+        if job.task is not None:
+            self._jobs.pop(job.key, None)
+            job.task.cancel()
+            return
+        pending = self._pending.get(job.user_id)
+        if pending is not None and job in pending:
+            pending.remove(job)
+            self._size -= 1
+            if not pending:
+                del self._pending[job.user_id]
+                self._users.remove(job.user_id)
+        self._jobs.pop(job.key, None)
+
+    def _next_job(self) -> ScrapeJob:
+        """Take the next job, going round-robin over the users."""
+
+        user_id = self._users.popleft()
+        pending = self._pending[user_id]
+        job = pending.popleft()
+        if pending:
+            self._users.append(user_id)
+        else:
+            del self._pending[user_id]
+        self._size -= 1
+        return job
+
+    async def _work(self) -> None:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._size > 0)
+                job = self._next_job()
+            await self._run(job)
+
+    async def _run(self, job: ScrapeJob) -> None:
+        logging.info(f"Start scrape job {job.key} for user {job.user_id}")
+        job.task = asyncio.create_task(
+            self.runner(
+                job.url,
+                job.report,
+                limits=job.limits,
+                extra_urls=job.extra_urls,
+                profile=job.profile,
+            )
+        )
+        try:
+            # asyncio.wait does not raise if the job task is cancelled, so the
+            # worker itself keeps running.
+            with timed("search"):
+                await asyncio.wait({job.task})
+        finally:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            if not job.task.done():
+                job.task.cancel()
+
+        cancelled = job.task.cancelled()
+        error = None if cancelled else job.task.exception()
+        if error is not None:
+            logging.error(f"Scrape job {job.key} failed: {error!r}")
+        outcome = "cancelled" if cancelled else "failed" if error else "done"
+        SEARCHES.inc(outcome=outcome)
+        for subscription in job.subscriptions:
+            if subscription.future.done():
+                continue
+            if cancelled:
+                subscription.future.cancel()
+            elif error is not None:
+                subscription.future.set_exception(error)
+            else:
+                subscription.future.set_result(job.task.result())
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from config.settings import WATCH_CHECK_INTERVAL
+from models import CandidateBatch
+from storage.watch_store import Watch, WatchStore
+from .job_queue import JobQueue, JobQueueFull, forget_checkpoint
+
+Notifier = Callable[[Watch, CandidateBatch], Awaitable[None]]
+
+
+class WatchScheduler:
+    """Re-run saved searches through the job queue and report new candidates.
+
+    Candidates are only marked as seen once they are sent to the chat.
+
+    Runs go through the same queue as interactive searches, so they share its
+    fairness, its limits and the scrapes of identical queries. Resumes fresh
+    in the candidate store are not fetched again, which keeps recurring runs
+    incremental.
+    """
+
+    def __init__(
+        self,
+        store: WatchStore,
+        jobs: JobQueue,
+        notify: Notifier,
+        check_interval: float = WATCH_CHECK_INTERVAL,
+    ) -> None:
+        """Initialize the WatchScheduler.
+        Args:
+            store (WatchStore): The saved searches.
+            jobs (JobQueue): The queue the searches are run in.
+            notify: A coroutine function receiving a saved search and its new candidates.
+            check_interval (float): The time between two lookups of due searches, in seconds.
+        """
+
+        self.store = store
+        self.jobs = jobs
+        self.notify = notify
+        self.check_interval = check_interval
+        self._task = None
+        self._runs: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start looking for due searches on the running event loop."""
+
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and the runs it started."""
+
+        tasks = [task for task in (self._task, *self._runs) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_due()
+            except Exception as e:
+                logging.exception(f"Failed to run saved searches: {e}")
+            await asyncio.sleep(self.check_interval)
+
+    async def run_due(self) -> None:
+        """Start the runs of all due searches."""
+
+        now = time.time()
+        for watch in await asyncio.to_thread(self.store.get_due_watches, now):
+            # Move the next run first, so a slow run is not started twice.
+            await asyncio.to_thread(self.store.schedule, watch.id, now + watch.interval)
+            task = asyncio.create_task(self.run(watch))
+            self._runs.add(task)
+            task.add_done_callback(self._runs.discard)
+
+    async def run(self, watch: Watch) -> None:
+        """Run a saved search and notify its chat of new candidates."""
+
+        try:
+            subscription = await self.jobs.submit(
+                watch.chat_id, watch.url, limits=watch.limits
+            )
+        except JobQueueFull:
+            logging.info(f"Queue full, retrying saved search #{watch.id} later")
+            await asyncio.to_thread(
+                self.store.schedule, watch.id, time.time() + self.check_interval
+            )
+            return
+
+        try:
+            result = await subscription.wait()
+        except Exception as e:
+            logging.error(f"Saved search #{watch.id} failed: {e!r}")
+            return
+
+        await asyncio.to_thread(forget_checkpoint, watch.url, watch.limits)
+        new = await asyncio.to_thread(self.store.get_new_candidates, watch.id, result)
+        logging.info(f"Saved search #{watch.id} found {len(new)} new candidates")
+        if not len(new):
+            return
+        try:
+            await self.notify(watch, new)
+        except Exception as e:
+            # The candidates stay unseen, so the next run sends them again.
+            logging.error(f"Failed to notify saved search #{watch.id}: {e!r}")
+            return
+        await asyncio.to_thread(self.store.mark_seen, watch.id, new)
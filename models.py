@@ -1,7 +1,12 @@
+import sys
+from array import array
 from dataclasses import dataclass
+from typing import Iterable, Iterator
 
+import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Candidate:
     name: str
     position: str
@@ -14,3 +19,165 @@ class Candidate:
 
     def __hash__(self) -> int:
         return hash((self.name, self.position, self.url))
+
+
+@dataclass
+class FilterOption:
+    label: str
+    param: str
+    value: str
+    count: int | None = None
+
+
+class CandidateBatch:
+    """A compact, array-backed sequence of candidates.
+
+    Flags are kept as bitmaps, skills as an unsigned short array, and repeated
+    positions and work conditions as indexes into tables of interned strings.
+    Items are materialized as Candidate objects only when they are accessed.
+    `truncated` tells that the scrape was stopped by its deadline, so the
+    candidates are only the ones found until then.
+    """
+
+    __slots__ = (
+        "names",
+        "urls",
+        "position_ids",
+        "ready_to_work_ids",
+        "skills",
+        "education",
+        "additional_education",
+        "english",
+        "_strings",
+        "_string_ids",
+        "_size",
+        "truncated",
+    )
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.urls: list[str] = []
+        self.position_ids = array("I")
+        self.ready_to_work_ids = array("I")
+        self.skills = array("H")
+        self.education = bytearray()
+        self.additional_education = bytearray()
+        self.english = bytearray()
+        self._strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._size = 0
+        self.truncated = False
+
+    @classmethod
+    def from_candidates(cls, candidates: Iterable[Candidate]) -> "CandidateBatch":
+        if isinstance(candidates, cls):
+            return candidates
+        batch = cls()
+        for candidate in candidates:
+            batch.append(candidate)
+        return batch
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(sys.intern(value))
+            self._string_ids[value] = string_id
+        return string_id
+
+    @staticmethod
+    def _set_flag(bitmap: bytearray, index: int, value: bool) -> None:
+        if index % 8 == 0:
+            bitmap.append(0)
+        if value:
+            bitmap[index // 8] |= 1 << (index % 8)
+
+    @staticmethod
+    def _get_flag(bitmap: bytearray, index: int) -> bool:
+        return bool(bitmap[index // 8] >> (index % 8) & 1)
+
+    def append(self, candidate: Candidate) -> None:
+        self.append_row(
+            (
+                candidate.name,
+                candidate.position,
+                candidate.ready_to_work,
+                candidate.education,
+                candidate.additional_education,
+                candidate.skills,
+                candidate.english,
+                candidate.url,
+            )
+        )
+
+    def append_row(self, row: tuple) -> None:
+        """Append a candidate given as a tuple in Candidate field order."""
+
+        name, position, ready_to_work, education, additional, skills, english, url = row
+        index = self._size
+        self.names.append(name)
+        self.urls.append(url)
+        self.position_ids.append(self._intern(position))
+        self.ready_to_work_ids.append(self._intern(ready_to_work))
+        self.skills.append(min(skills, 0xFFFF))
+        self._set_flag(self.education, index, education)
+        self._set_flag(self.additional_education, index, additional)
+        self._set_flag(self.english, index, english)
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def row(self, index: int) -> tuple:
+        """Get the fields of a candidate in Candidate field order."""
+
+        return (
+            self.names[index],
+            self._strings[self.position_ids[index]],
+            self._strings[self.ready_to_work_ids[index]],
+            self._get_flag(self.education, index),
+            self._get_flag(self.additional_education, index),
+            self.skills[index],
+            self._get_flag(self.english, index),
+            self.urls[index],
+        )
+
+    def rows(self) -> Iterator[tuple]:
+        """Iterate over the candidates as plain tuples, e.g. for CSV rows."""
+
+        for index in range(self._size):
+            yield self.row(index)
+
+    def __getitem__(self, index: int) -> Candidate:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("CandidateBatch index out of range")
+        return Candidate(*self.row(index))
+
+    def __iter__(self) -> Iterator[Candidate]:
+        for row in self.rows():
+            yield Candidate(*row)
+
+    def take(self, indices: Iterable[int]) -> "CandidateBatch":
+        """Get a new batch with the candidates at the given indices, in that order."""
+
+        batch = CandidateBatch()
+        for index in indices:
+            batch.append_row(self.row(int(index)))
+        return batch
+
+    def flag_column(self, name: str) -> np.ndarray:
+        """Get a flag as a boolean column, unpacked from its bitmap."""
+
+        bitmap = np.frombuffer(getattr(self, name), dtype=np.uint8)
+        return np.unpackbits(bitmap, count=self._size, bitorder="little").view(bool)
+
+    def skills_column(self) -> np.ndarray:
+        """Get the skill counts as a column sharing memory with the batch.
+
+        The batch cannot grow while the column is alive.
+        """
+
+        return np.frombuffer(self.skills, dtype=np.uint16)[: self._size]
+
@@ -0,0 +1,208 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from config.settings import PROFILE_DIR, PROFILE_TOP
+
+# The spans of the section running in the current context. Tasks and threads
+# started by the section copy the context, so their spans are recorded too.
+_spans: ContextVar[list | None] = ContextVar("profile_spans", default=None)
+_local = threading.local()
+# The allocations of the profilers themselves are left out of the reports.
+PROFILER_FILTERS = [
+    tracemalloc.Filter(False, module.__file__)
+    for module in (cProfile, pstats, tracemalloc)
+] + [tracemalloc.Filter(False, __file__)]
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def record_span(stage: str, seconds: float) -> None:
+    """Record a timed stage in the profile section of the current context, if any."""
+
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((seconds, stage))
+
+
+def _start_tracing() -> bool:
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and tracemalloc.is_tracing():
+            # Traced by somebody else, who also decides when to stop.
+            return False
+        if _tracing_users == 0:
+            tracemalloc.start()
+        _tracing_users += 1
+        return True
+
+
+def _stop_tracing() -> None:
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+@dataclass
+class ProfileSection:
+    """The measurements of one profiled stage of a search."""
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    spans: list[tuple[float, str]] = field(default_factory=list)
+    functions: str = ""
+    allocations: list[str] = field(default_factory=list)
+    notes: list[str] = field(default_factory=list)
+
+
+class JobProfile:
+    """A profile of one search, from the filter navigation to the scrape.
+
+    Every section runs under cProfile and tracemalloc and records the timed
+    stages awaited in it. cProfile sees everything its thread runs, so other
+    searches running on the event loop at the same time show up in the scrape
+    section. The report is a plain text file.
+    """
+
+    def __init__(self, path: str, top: int = PROFILE_TOP) -> None:
+        """Initialize the JobProfile.
+        Args:
+            path (str): The path the report is written to.
+            top (int): The number of functions, allocations and awaits listed per section.
+        """
+
+        self.path = path
+        self.top = top
+        self.sections: list[ProfileSection] = []
+        self.started = time.time()
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[ProfileSection]:
+        """Profile the block as a section of the report.
+
+        Works around blocking code in a thread as well as around awaits on the
+        event loop, where the section covers every task the block starts.
+        Args:
+            name (str): The name of the section, e.g. "navigation" or "scrape".
+        """
+
+        section = ProfileSection(name)
+        self.sections.append(section)
+
+        profiler = None
+        if not getattr(_local, "profiling", False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                _local.profiling = True
+            except ValueError:
+                # Another profiler is active, e.g. with sys.monitoring.
+                profiler = None
+        if profiler is None:
+            section.notes.append("cProfile skipped: another profile was running.")
+        tracing = _start_tracing()
+        before = tracemalloc.take_snapshot() if tracing else None
+        token = _spans.set(section.spans)
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield section
+        finally:
+            section.cpu_time = time.thread_time() - cpu_started
+            section.wall_time = time.perf_counter() - wall_started
+            _spans.reset(token)
+            if profiler is not None:
+                profiler.disable()
+                _local.profiling = False
+            if tracing:
+                after = tracemalloc.take_snapshot()
+                _stop_tracing()
+                stats = after.filter_traces(PROFILER_FILTERS).compare_to(
+                    before.filter_traces(PROFILER_FILTERS), "lineno"
+                )
+                section.allocations = [str(stat) for stat in stats[: self.top]]
+            else:
+                section.notes.append("tracemalloc skipped: tracing was started elsewhere.")
+            if profiler is not None:
+                section.functions = self._format_functions(profiler)
+
+    def run(self, name: str, func: Callable, *args) -> Any:
+        """Call a function in a profile section, e.g. in a thread."""
+
+        with self.section(name):
+            return func(*args)
+
+    def _format_functions(self, profiler: cProfile.Profile) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        return stream.getvalue().strip()
+
+    def render(self) -> str:
+        """Render the report of all sections."""
+
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started))
+        lines = [f"Search profile started at {started}"]
+        for section in self.sections:
+            lines += [
+                "",
+                f"== {section.name}: {section.wall_time:.3f}s wall, "
+                f"{section.cpu_time:.3f}s CPU in its thread ==",
+                *section.notes,
+                "",
+                "-- Slowest awaits --",
+            ]
+            lines += [
+                f"{seconds:10.3f}s  {stage}"
+                for seconds, stage in sorted(section.spans, reverse=True)[: self.top]
+            ]
+            totals = {}
+            for seconds, stage in section.spans:
+                count, total = totals.get(stage, (0, 0.0))
+                totals[stage] = (count + 1, total + seconds)
+            lines += ["", "-- Time by stage --"]
+            lines += [
+                f"{total:10.3f}s  {count:6d}x  {stage}"
+                for stage, (count, total) in sorted(
+                    totals.items(), key=lambda item: item[1][1], reverse=True
+                )
+            ]
+            lines += ["", "-- Top allocations --", *section.allocations]
+            lines += ["", "-- Top functions --", section.functions]
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> str:
+        """Write the report.
+        Returns:
+            str: The path of the report.
+        """
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        logging.info(f"Profile written to {self.path}")
+        return self.path
+
+
+def new_profile(name: str) -> JobProfile:
+    """Create a profile whose report is written to PROFILE_DIR.
+    Args:
+        name (str): A name identifying the search, used in the file name.
+    """
+
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return JobProfile(os.path.join(PROFILE_DIR, f"{stamp}-{name}.txt"))
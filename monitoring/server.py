@@ -0,0 +1,38 @@
+import logging
+
+from aiohttp import web
+
+from config.settings import METRICS_HOST, METRICS_PORT
+from .metrics import REGISTRY, Registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def start_metrics_server(
+    host: str = METRICS_HOST, port: int = METRICS_PORT, registry: Registry = REGISTRY
+) -> web.AppRunner | None:
+    """Serve the metrics in the Prometheus text format at /metrics.
+    Args:
+        host (str): The host to listen on. Defaults to the METRICS_HOST setting.
+        port (int): The port to listen on, 0 disables the endpoint.
+            Defaults to the METRICS_PORT setting.
+        registry (Registry): The metrics to serve.
+    Returns:
+        web.AppRunner | None: The runner to clean up on shutdown, None if disabled.
+    """
+
+    if not port:
+        return None
+
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logging.info(f"Serving metrics at http://{host}:{port}/metrics")
+    return runner
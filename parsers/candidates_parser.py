@@ -1,7 +1,11 @@
 import logging
+
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 
-from .parse import ParseHelper
+from models import FilterOption
+from .options_cache import FilterOptions, get_options_cache
+from .parse import ParseHelper, uses_driver
 
 
 class CandidatesParser(ParseHelper):
@@ -11,6 +15,35 @@ class CandidatesParser(ParseHelper):
         super().__init__()
         self.BASE_URL = "https://www.work.ua/employer/"
 
+    @uses_driver
+    def refresh(self) -> None:
+        """Load the current filtered candidates page, unless it is open already."""
+
+        if self.driver.current_url != self.BASE_URL:
+            self.driver.get(self.BASE_URL)
+
+    @uses_driver
+    def load_filter_options(self) -> FilterOptions:
+        """Load the filter menus of the current page, bypassing the cache."""
+
+        self.refresh()
+        return FilterOptions.from_soup(
+            BeautifulSoup(self.driver.page_source, "html.parser")
+        )
+
+    def get_filter_options(self) -> FilterOptions:
+        """Get the filter menus of the current page from the shared cache."""
+
+        return get_options_cache().get(self.BASE_URL, self.load_filter_options)
+
+    def get_salary_options(self, max_salary: bool = False) -> list[FilterOption]:
+        """Get the salary menu from the shared cache."""
+
+        return get_options_cache().get_salary(
+            self.BASE_URL, self.load_filter_options, max_salary
+        )
+
+    @uses_driver
     def get_employees_by_job_position(self, position: str) -> None:
         """Get employees by job position.
         Args:
@@ -22,12 +55,14 @@ class CandidatesParser(ParseHelper):
         self.wait_and_click((By.ID, "sm-but"))
         self.BASE_URL = self.driver.current_url
 
+    @uses_driver
     def get_employees_by_years_of_experience(self, years: str) -> None:
         """Get employees by years of experience.
         Args:
             years (str): The years of experience to filter by.
         """
 
+        self.refresh()
         options = self.get_options_from_checkbox()
         years = years.capitalize()
         if years in options:
@@ -37,6 +72,7 @@ class CandidatesParser(ParseHelper):
             logging.exception(f"Option '{years}' not found in checkbox.")
             raise ValueError(f"Option '{years}' not found in checkbox.")
 
+    @uses_driver
     def get_employees_by_skills_or_keywords(self, skills: str) -> None:
         """Get employees by skills or keywords.
         Args:
@@ -50,6 +86,7 @@ class CandidatesParser(ParseHelper):
         self.wait_and_click((By.ID, "sm-but"))
         self.BASE_URL = self.driver.current_url
 
+    @uses_driver
     def get_employees_by_location(self, location: str) -> None:
         """Get employees by location.
         Args:
@@ -61,6 +98,7 @@ class CandidatesParser(ParseHelper):
         self.wait_and_click((By.ID, "sm-but"))
         self.BASE_URL = self.driver.current_url
 
+    @uses_driver
     def get_employee_by_salary_expectation(
         self, value: str, max_salary: bool = False
     ) -> None:
@@ -83,6 +121,6 @@ class CandidatesParser(ParseHelper):
         self.BASE_URL = self.driver.current_url
 
     def close_driver(self) -> None:
-        """Close the WebDriver."""
+        """Return the WebDriver to the shared pool, if a step still holds it."""
 
-        self.driver.quit()
+        self.release_driver()
@@ -0,0 +1,159 @@
+import logging
+import queue
+import threading
+
+from selenium import webdriver
+from selenium.common import WebDriverException
+
+from config.settings import DRIVER_MAX_USES, DRIVER_POOL_SIZE, DRIVER_POOL_TIMEOUT
+
+
+class DriverPool:
+    """A bounded pool of warm headless Chrome drivers shared across searches."""
+
+    def __init__(
+        self,
+        size: int = DRIVER_POOL_SIZE,
+        max_uses: int = DRIVER_MAX_USES,
+        timeout: float = DRIVER_POOL_TIMEOUT,
+        prewarm: int = 1,
+    ) -> None:
+        """Initialize the DriverPool.
+        Args:
+            size (int): The maximum number of drivers alive at the same time.
+            max_uses (int): The number of checkouts after which a driver is recycled.
+            timeout (float): How long to wait for a free driver, in seconds.
+            prewarm (int): The number of drivers to start right away.
+        """
+
+        self.size = size
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(min(prewarm, size)):
+            self._idle.put(self._create_driver())
+
+    @staticmethod
+    def create_options() -> webdriver.ChromeOptions:
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        return options
+
+    def _create_driver(self) -> webdriver.Chrome:
+        driver = webdriver.Chrome(options=self.create_options())
+        with self._lock:
+            self._uses[id(driver)] = 0
+        logging.info("Started a new Chrome driver.")
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome) -> None:
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException as e:
+            logging.warning(f"Failed to quit a Chrome driver: {e}")
+
+    @staticmethod
+    def is_healthy(driver: webdriver.Chrome) -> bool:
+        """Check that the driver's browser still responds."""
+
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def reset(driver: webdriver.Chrome) -> None:
+        """Drop the state of the previous user before the driver is reused."""
+
+        driver.delete_all_cookies()
+        driver.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();"
+        )
+        driver.get("about:blank")
+
+    def acquire(self) -> webdriver.Chrome:
+        """Check out a healthy driver, starting one if the pool is not full.
+        Raises:
+            TimeoutError: If no driver is freed within the pool timeout.
+        """
+
+        if self._closed:
+            raise RuntimeError("The driver pool is closed.")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("No free Chrome driver in the pool.")
+
+        try:
+            while True:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    driver = self._create_driver()
+                    break
+                if self.is_healthy(driver):
+                    break
+                logging.warning("Recycling an unresponsive Chrome driver.")
+                self._discard(driver)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver: webdriver.Chrome, broken: bool = False) -> None:
+        """Return a driver to the pool.
+        Args:
+            driver (webdriver.Chrome): The driver to return.
+            broken (bool, optional): Recycle the driver instead of reusing it.
+        """
+
+        try:
+            if self._closed or broken or self._uses.get(id(driver), 0) >= self.max_uses:
+                self._discard(driver)
+                return
+            try:
+                self.reset(driver)
+            except WebDriverException as e:
+                logging.warning(f"Recycling a Chrome driver that failed to reset: {e}")
+                self._discard(driver)
+                return
+            self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Quit all idle drivers and refuse new checkouts."""
+
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Get the process-wide driver pool, creating it on first use."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
@@ -0,0 +1,104 @@
+import re
+
+from bs4 import BeautifulSoup, Tag
+
+from models import FilterOption
+
+EXPERIENCE_SELECTOR = "#experience_selection > .checkbox"
+MIN_SALARY_SELECTOR = "#salaryfrom_selection"
+MAX_SALARY_SELECTOR = "#salaryto_selection"
+
+
+def _parse_count(element: Tag, label: str) -> int | None:
+    """Get the facet count shown next to a checkbox label, if there is one."""
+
+    rest = element.get_text(" ", strip=True).replace(label, "", 1)
+    digits = re.sub(r"\D", "", rest)
+    return int(digits) if digits else None
+
+
+def parse_experience_options(soup: BeautifulSoup) -> list[FilterOption]:
+    """Parse enabled experience checkboxes from a candidates page.
+    Args:
+        soup (BeautifulSoup): The BeautifulSoup object representing the page.
+    Returns:
+        [FilterOption]: The available experience options.
+    """
+
+    result = []
+    for element in soup.select(EXPERIENCE_SELECTOR):
+        if "disabled" in element.get("class", []):
+            continue
+        label = element.select_one("span")
+        checkbox = element.select_one("input")
+        if label is None or checkbox is None:
+            continue
+        text = label.text.strip()
+        result.append(
+            FilterOption(
+                label=text,
+                param=checkbox.get("name", "experience"),
+                value=checkbox.get("value", ""),
+                count=_parse_count(element, text),
+            )
+        )
+    return result
+
+
+def parse_salary_options(
+    soup: BeautifulSoup, max_salary: bool = False
+) -> list[FilterOption]:
+    """Parse salary select options from a candidates page.
+    Args:
+        soup (BeautifulSoup): The BeautifulSoup object representing the page.
+        max_salary (bool, optional): Indicates if it's a maximum salary. Defaults to False.
+    Returns:
+        [FilterOption]: The available salary options.
+    """
+
+    select = soup.select_one(MAX_SALARY_SELECTOR if max_salary else MIN_SALARY_SELECTOR)
+    if select is None:
+        return []
+
+    param = select.get("name", "salaryto" if max_salary else "salaryfrom")
+    return [
+        FilterOption(
+            label=option.text.strip(),
+            param=param,
+            value=option.get("value", option.text.strip()),
+        )
+        for option in select.select("option")
+    ]
+
+
+def parse_salary_amount(label: str) -> int | None:
+    """Get the amount of a salary option label, e.g. 10000 for "від 10 000 грн".
+    Args:
+        label (str): The label of the option.
+    Returns:
+        int | None: The amount in UAH, None if the label has no number.
+    """
+
+    digits = re.sub(r"\D", "", label)
+    return int(digits) if digits else None
+
+
+def parse_experience_years(label: str) -> tuple[int, int | None]:
+    """Get the range of years of an experience option label.
+
+    work.ua labels the options "Без досвіду", "До 1 року", "Від 1 до 2 років"
+    and "Понад 5 років".
+    Args:
+        label (str): The label of the option.
+    Returns:
+        (int, int | None): The minimum and maximum years, None for no maximum.
+    """
+
+    years = [int(number) for number in re.findall(r"\d+", label)]
+    if not years:
+        return 0, 0
+    if len(years) >= 2:
+        return years[0], years[1]
+    if label.strip().lower().startswith("до"):
+        return 0, years[0]
+    return years[0], None
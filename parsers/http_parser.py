@@ -0,0 +1,139 @@
+import logging
+
+import requests
+from bs4 import BeautifulSoup
+
+from config.logging_config import setup_logging
+from models import FilterOption
+from .options_cache import FilterOptions, get_options_cache
+from .url_builder import build_search_url
+
+
+class HttpCandidatesParser:
+    """A class for building the filtered candidates URL without a browser.
+
+    It mirrors the interface of CandidatesParser, so the filters work with
+    both of them, but composes the search URL directly and loads pages over
+    plain HTTP only when facet options are needed.
+    """
+
+    def __init__(self, session: requests.Session | None = None) -> None:
+        self.session = session or requests.Session()
+        self.position = None
+        self.location = None
+        self.skills = None
+        self.params = {}
+        self.BASE_URL = build_search_url()
+        self._soup = None
+        self._soup_url = None
+        setup_logging()
+
+    def _update_url(self) -> None:
+        self.BASE_URL = build_search_url(
+            self.position, self.location, self.skills, self.params
+        )
+
+    def refresh(self) -> None:
+        """Load the current filtered candidates page."""
+
+        if self._soup_url == self.BASE_URL:
+            return
+        response = self.session.get(self.BASE_URL, timeout=10)
+        response.raise_for_status()
+        self._soup = BeautifulSoup(response.text, "html.parser")
+        self._soup_url = self.BASE_URL
+
+    def load_filter_options(self) -> FilterOptions:
+        """Load the filter menus of the current page, bypassing the cache."""
+
+        self.refresh()
+        return FilterOptions.from_soup(self._soup)
+
+    def get_filter_options(self) -> FilterOptions:
+        """Get the filter menus of the current page from the shared cache."""
+
+        return get_options_cache().get(self.BASE_URL, self.load_filter_options)
+
+    def get_employees_by_job_position(self, position: str) -> None:
+        """Get employees by job position.
+        Args:
+            position (str): The job position to search for.
+        """
+
+        self.position = position
+        self._update_url()
+
+    def get_employees_by_location(self, location: str) -> None:
+        """Get employees by location.
+        Args:
+            location (str): The location to search for.
+        """
+
+        self.location = location
+        self._update_url()
+
+    def get_employees_by_skills_or_keywords(self, skills: str) -> None:
+        """Get employees by skills or keywords.
+        Args:
+            skills (str): The skills or keywords to search for.
+        """
+
+        self.skills = skills
+        self._update_url()
+
+    def get_experience_options(self) -> list[FilterOption]:
+        """Get the available experience options of the current page."""
+
+        return self.get_filter_options().experience
+
+    def get_salary_options(self, max_salary: bool = False) -> list[FilterOption]:
+        """Get the salary options of the current page."""
+
+        return get_options_cache().get_salary(
+            self.BASE_URL, self.load_filter_options, max_salary
+        )
+
+    def get_options_from_checkbox(self) -> list:
+        return [option.label for option in self.get_experience_options()]
+
+    def get_options_from_select_list(self, max_salary: bool = False) -> list:
+        return [option.label for option in self.get_salary_options(max_salary)]
+
+    def _select_option(self, options: list[FilterOption], label: str) -> None:
+        for option in options:
+            if option.label.lower() == label.lower():
+                values = self.params.setdefault(option.param, [])
+                if option.value not in values:
+                    values.append(option.value)
+                self._update_url()
+                return
+        logging.exception(f"Option '{label}' not found.")
+        raise ValueError(f"Option '{label}' not found.")
+
+    def get_employees_by_years_of_experience(self, years: str) -> None:
+        """Get employees by years of experience.
+        Args:
+            years (str): The years of experience to filter by.
+        """
+
+        self._select_option(self.get_experience_options(), years)
+
+    def get_employee_by_salary_expectation(
+        self, value: str, max_salary: bool = False
+    ) -> None:
+        """Get employees by salary expectation.
+        Args:
+            value (str): The value of the salary expectation.
+            max_salary (bool, optional): Indicates if it's a maximum salary. Defaults to False.
+        """
+
+        options = self.get_salary_options(max_salary)
+        if options:
+            # A salary select holds a single value, so replace the previous one.
+            self.params.pop(options[0].param, None)
+        self._select_option(options, value)
+
+    def close_driver(self) -> None:
+        """Close the HTTP session."""
+
+        self.session.close()
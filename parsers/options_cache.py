@@ -0,0 +1,123 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from config.settings import FILTER_OPTIONS_TTL
+from models import FilterOption
+from .facets import parse_experience_options, parse_salary_options
+
+
+@dataclass
+class FilterOptions:
+    """The filter menus of one filtered candidates page."""
+
+    experience: list[FilterOption] = field(default_factory=list)
+    min_salary: list[FilterOption] = field(default_factory=list)
+    max_salary: list[FilterOption] = field(default_factory=list)
+
+    @classmethod
+    def from_soup(cls, soup: BeautifulSoup) -> "FilterOptions":
+        return cls(
+            experience=parse_experience_options(soup),
+            min_salary=parse_salary_options(soup),
+            max_salary=parse_salary_options(soup, max_salary=True),
+        )
+
+    def salary(self, max_salary: bool = False) -> list[FilterOption]:
+        return self.max_salary if max_salary else self.min_salary
+
+
+class OptionsCache:
+    """A TTL cache of filter menus shared by all parsers and users.
+
+    Experience options and their counts are cached per filtered candidates URL.
+    The salary menus are the same on every page, so they are kept once and
+    reused for every URL. Concurrent lookups of the same URL share one load.
+    """
+
+    def __init__(self, ttl: float = FILTER_OPTIONS_TTL) -> None:
+        """Initialize the OptionsCache.
+        Args:
+            ttl (float): How long options are used before they are loaded again, in seconds.
+        """
+
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, FilterOptions]] = {}
+        self._salary: tuple[float, FilterOptions] | None = None
+        self._lock = threading.Lock()
+        self._loading: dict[str, threading.Lock] = {}
+
+    def _fresh(self, entry: tuple[float, FilterOptions] | None) -> FilterOptions | None:
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def _store(self, url: str, options: FilterOptions) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[url] = (now, options)
+            if options.min_salary or options.max_salary:
+                self._salary = (now, options)
+            # Drop expired pages, so the cache does not grow with every search.
+            for key, (loaded_at, _) in list(self._entries.items()):
+                if now - loaded_at >= self.ttl:
+                    del self._entries[key]
+
+    def get(self, url: str, load: Callable[[], FilterOptions]) -> FilterOptions:
+        """Get the filter options of a page, loading them if they are missing or expired.
+        Args:
+            url (str): The URL of the filtered candidates page.
+            load: A function loading the options of the page.
+        Returns:
+            FilterOptions: The options of the page.
+        """
+
+        options = self._fresh(self._entries.get(url))
+        if options is not None:
+            return options
+
+        with self._lock:
+            loading = self._loading.setdefault(url, threading.Lock())
+        with loading:
+            # Another thread may have loaded the page while this one waited.
+            options = self._fresh(self._entries.get(url))
+            if options is None:
+                logging.info(f"Loading filter options of {url}")
+                options = load()
+                self._store(url, options)
+        with self._lock:
+            self._loading.pop(url, None)
+        return options
+
+    def get_salary(
+        self, url: str, load: Callable[[], FilterOptions], max_salary: bool = False
+    ) -> list[FilterOption]:
+        """Get a salary menu, loading the page only if no menu is cached yet.
+        Args:
+            url (str): The URL of the filtered candidates page.
+            load: A function loading the options of the page.
+            max_salary (bool, optional): Indicates if it's a maximum salary. Defaults to False.
+        Returns:
+            [FilterOption]: The salary options.
+        """
+
+        options = self._fresh(self._salary)
+        if options is None:
+            options = self.get(url, load)
+        return options.salary(max_salary)
+
+
+_options_cache = None
+
+
+def get_options_cache() -> OptionsCache:
+    """Get the filter options cache shared by all parsers."""
+
+    global _options_cache
+    if _options_cache is None:
+        _options_cache = OptionsCache()
+    return _options_cache
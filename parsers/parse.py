@@ -1,10 +1,13 @@
+import functools
 import logging
 import time
-from selenium import webdriver
+from typing import Callable
+
 from selenium.common import (
     NoSuchElementException,
     TimeoutException,
     ElementNotInteractableException,
+    WebDriverException,
 )
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions
@@ -12,14 +15,62 @@ from selenium.webdriver.support.select import Select
 from selenium.webdriver.support.wait import WebDriverWait
 
 from config.logging_config import setup_logging
+from .driver_pool import DriverPool, get_driver_pool
+
+
+def uses_driver(method: Callable) -> Callable:
+    """Check out a pool driver for the call of a ParseHelper method.
+
+    The driver is held only while the outermost decorated method runs and is
+    returned when it finishes, so a parser waiting for the user's next answer
+    holds no driver. It is recycled instead of reused if the method raised a
+    WebDriverException.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._depth == 0:
+            self.acquire_driver()
+        self._depth += 1
+        try:
+            return method(self, *args, **kwargs)
+        except WebDriverException:
+            self.broken = True
+            raise
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.release_driver()
+
+    return wrapper
 
 
 class ParseHelper:
-    def __init__(self) -> None:
-        self.driver = webdriver.Chrome()
-        self.wait = WebDriverWait(self.driver, 10)
+    def __init__(self, pool: DriverPool | None = None) -> None:
+        self.pool = pool or get_driver_pool()
+        self.driver = None
+        self.wait = None
+        self.broken = False
+        self._depth = 0
         setup_logging()
 
+    def acquire_driver(self) -> None:
+        """Check out a WebDriver from the pool."""
+
+        self.driver = self.pool.acquire()
+        self.wait = WebDriverWait(self.driver, 10)
+        self.broken = False
+
+    def release_driver(self) -> None:
+        """Return the WebDriver to the pool, recycling it if it raised a
+        WebDriverException."""
+
+        if self.driver is not None:
+            self.pool.release(self.driver, broken=self.broken)
+            self.driver = None
+            self.wait = None
+
+    @uses_driver
     def wait_and_click(self, locator: tuple) -> None:
         try:
             element = self.wait.until(
@@ -29,6 +80,7 @@ class ParseHelper:
         except TimeoutException as e:
             logging.exception(f"An error occurred: {str(e)}")
 
+    @uses_driver
     def wait_and_send_keys(self, locator: tuple, keys: str) -> None:
         try:
             element = self.wait.until(
@@ -43,6 +95,7 @@ class ParseHelper:
         ) as e:
             logging.exception(f"An error occurred: {str(e)}")
 
+    @uses_driver
     def wait_and_select_option(self, locator: tuple, value: str) -> None:
         try:
             element = self.wait.until(
@@ -54,6 +107,7 @@ class ParseHelper:
         except (TimeoutException, NoSuchElementException) as e:
             logging.exception(f"An error occurred: {str(e)}")
 
+    @uses_driver
     def get_options_from_checkbox(self) -> list:
         try:
             result = []
@@ -69,6 +123,7 @@ class ParseHelper:
             logging.exception(f"An error occurred while getting options: {str(e)}")
             return []
 
+    @uses_driver
     def get_options_from_select_list(self, max_salary: bool = False) -> list:
         max_locator = (By.ID, "salaryto_selection")
         min_locator = (By.ID, "salaryfrom_selection")
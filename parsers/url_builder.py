@@ -0,0 +1,85 @@
+from urllib.parse import quote, urlencode
+
+SEARCH_URL = "https://www.work.ua/resumes"
+
+# Official Ukrainian transliteration (KMU 2010), which work.ua uses for city slugs.
+TRANSLITERATION = {
+    "а": "a", "б": "b", "в": "v", "г": "h", "ґ": "g", "д": "d", "е": "e",
+    "є": "ie", "ж": "zh", "з": "z", "и": "y", "і": "i", "ї": "i", "й": "i",
+    "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p", "р": "r",
+    "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts", "ч": "ch",
+    "ш": "sh", "щ": "shch", "ь": "", "ю": "iu", "я": "ia", "'": "", "’": "",
+}
+WORD_START_TRANSLITERATION = {"є": "ye", "ї": "yi", "й": "y", "ю": "yu", "я": "ya"}
+APOSTROPHES = ("'", "’")
+
+
+def transliterate(text: str) -> str:
+    """Transliterate Ukrainian text to latin letters.
+    Args:
+        text (str): The text to transliterate.
+    Returns:
+        str: The transliterated lowercase text.
+    """
+
+    result = []
+    previous = " "
+    for char in text.lower().replace("зг", "zgh"):
+        # An apostrophe is inside the word, e.g. Знам'янка is Znamianka.
+        at_word_start = not previous.isalpha() and previous not in APOSTROPHES
+        if at_word_start and char in WORD_START_TRANSLITERATION:
+            result.append(WORD_START_TRANSLITERATION[char])
+        else:
+            result.append(TRANSLITERATION.get(char, char))
+        previous = char
+    return "".join(result)
+
+
+def city_slug(location: str) -> str:
+    """Convert a city name to the slug used in search URLs."""
+
+    return "_".join(transliterate(location).split())
+
+
+def query_slug(query: str) -> str:
+    """Convert a search query to the slug used in search URLs."""
+
+    return "+".join(quote(word, safe="") for word in query.lower().split())
+
+
+def build_search_url(
+    position: str | None = None,
+    location: str | None = None,
+    skills: str | None = None,
+    params: dict[str, list[str]] | None = None,
+) -> str:
+    """Build the filtered candidates URL without loading any page.
+    Args:
+        position (str | None): The job position to search for.
+        location (str | None): The location to search for.
+        skills (str | None): The skills or keywords to search for in the whole resume.
+        params (dict[str, list[str]] | None): Additional filter query parameters.
+    Returns:
+        str: The URL of the filtered candidates page.
+    """
+
+    # Like the search form, skills replace the position in the search field
+    # and switch the search to the full resume text.
+    query = skills or position
+    path = SEARCH_URL
+    if location:
+        path += f"-{city_slug(location)}"
+    if query:
+        path += f"-{query_slug(query)}"
+
+    query_params = dict(params or {})
+    if skills:
+        query_params["notitle"] = ["1"]
+
+    url = path + "/"
+    if query_params:
+        url += "?" + urlencode(
+            {key: "+".join(values) for key, values in sorted(query_params.items())},
+            safe="+",
+        )
+    return url
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+from config.settings import (
+    RESUME_CACHE_MAX_MB,
+    RESUME_CACHE_PATH,
+    RESUME_CACHE_TTL,
+)
+from .scheduler import FetchScheduler
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: bytes
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self) -> dict:
+        """Get the headers of a conditional request for this page."""
+
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResumeCache:
+    """A size-bounded on-disk cache of resume pages with LRU eviction."""
+
+    def __init__(
+        self,
+        path: str = RESUME_CACHE_PATH,
+        ttl: float = RESUME_CACHE_TTL,
+        max_bytes: int = RESUME_CACHE_MAX_MB * 1024 * 1024,
+    ) -> None:
+        """Initialize the ResumeCache.
+        Args:
+            path (str): The path of the SQLite database file.
+            ttl (float): How long a page is used without revalidation, in seconds.
+            max_bytes (int): The total size of cached pages kept on disk.
+        """
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+            """
+        )
+        self.size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()[0]
+
+    def get(self, url: str) -> CachedPage | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url)
+            )
+        return CachedPage(url, *row)
+
+    def put(
+        self, url: str, body: bytes, etag: str | None, last_modified: str | None
+    ) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            previous = self._connection.execute(
+                "SELECT size FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, now, now, len(body)),
+            )
+            self.size += len(body) - (previous[0] if previous else 0)
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark a page as revalidated by the server."""
+
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+
+    def _evict(self) -> None:
+        """Drop the least recently used pages until the cache fits its size."""
+
+        while self.size > self.max_bytes:
+            rows = self._connection.execute(
+                "SELECT url, size FROM pages ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self.size = 0
+                return
+            for url, size in rows:
+                self._connection.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.size -= size
+                if self.size <= self.max_bytes:
+                    return
+
+    async def fetch(self, scheduler: FetchScheduler, session, url: str) -> bytes:
+        """Get a page from the cache, revalidating it with the server once stale.
+        Args:
+            scheduler (FetchScheduler): The scheduler used for requests.
+            session: The aiohttp ClientSession object.
+            url (str): The URL of the page.
+        Returns:
+            bytes: The page content.
+        """
+
+        cached = await asyncio.to_thread(self.get, url)
+        if cached is not None and cached.is_fresh(self.ttl):
+            return cached.body
+
+        headers = cached.validators() if cached is not None else None
+        response = await scheduler.fetch_response(session, url, headers=headers)
+        if response.status == 304 and cached is not None:
+            await asyncio.to_thread(self.touch, url)
+            return cached.body
+
+        await asyncio.to_thread(
+            self.put, url, response.body, response.etag, response.last_modified
+        )
+        return response.body
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_cache = None
+
+
+def get_resume_cache() -> ResumeCache | None:
+    """Get the cache shared by all scrapers, None if caching is disabled."""
+
+    global _cache
+    if RESUME_CACHE_PATH and _cache is None:
+        logging.info(f"Using resume cache at {RESUME_CACHE_PATH}")
+        _cache = ResumeCache()
+    return _cache
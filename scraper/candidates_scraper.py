@@ -1,167 +1,499 @@
-import csv
-import ssl
 import logging
 
-import aiohttp
 import asyncio
 
-from dataclasses import fields, astuple
+from concurrent.futures import Executor, ProcessPoolExecutor
+from array import array
+from typing import Any, AsyncIterator, Callable
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+import numpy as np
 
-from models import Candidate
+from models import Candidate, CandidateBatch
+from monitoring.metrics import RESUMES, timed
 from config.logging_config import setup_logging
+from config.settings import (
+    CANDIDATE_MAX_AGE,
+    CHECKPOINT_INTERVAL,
+    CHECKPOINT_MAX_AGE,
+    PARSE_WORKERS,
+    QUERY_MAX_AGE,
+    SCRAPER_WORKERS,
+)
+from storage.candidate_store import CandidateStore, get_candidate_store
+from storage.checkpoint_store import CheckpointStore, get_checkpoint_store
+from .cache import ResumeCache, get_resume_cache
+from .extractors import CandidateExtractor
+from .http_client import HttpClient, get_http_client
+from .limits import ScrapeLimits, job_key
+from .parsing import parse_resume_page
+from .progress import ProgressReporter
+from .scheduler import FetchScheduler
+from .scoring import ScoringEngine
+from .sources import CandidateSource, get_source_for_url
+
+
+_parse_executor = None
+
+
+def get_parse_executor() -> Executor | None:
+    """Get the process pool shared by all scrapers, None if parsing runs inline."""
+
+    global _parse_executor
+    if PARSE_WORKERS and _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _parse_executor
 
 
 class CandidateScraper:
     """A class for scraping candidate data from a website."""
 
-    def __init__(self, filtered_candidates: str) -> None:
+    def __init__(
+        self,
+        filtered_candidates: str,
+        workers: int = SCRAPER_WORKERS,
+        scheduler: FetchScheduler | None = None,
+        extractor: CandidateExtractor | None = None,
+        executor: Executor | None = None,
+        cache: ResumeCache | None = None,
+        store: CandidateStore | None = None,
+        scoring: ScoringEngine | None = None,
+        limits: ScrapeLimits | None = None,
+        source: CandidateSource | None = None,
+        http: HttpClient | None = None,
+        checkpoints: CheckpointStore | None = None,
+        checkpoint_key: str | None = None,
+    ) -> None:
         """Initialize the CandidateScraper.
-        Args: filtered_candidates (str): The URL of the filtered candidates page."""
+        Args:
+            filtered_candidates (str): The URL of the filtered candidates page.
+            workers (int, optional): The maximum number of concurrent resume workers.
+            scheduler (FetchScheduler | None, optional): The scheduler used for requests.
+                Defaults to one sharing the concurrency limit of each host with all scrapers.
+            extractor (CandidateExtractor | None, optional): The resume page extractor.
+                Defaults to the extractor of the source.
+            executor (Executor | None, optional): The executor pages are parsed in.
+                Defaults to the shared process pool, or inline if PARSE_WORKERS is 0.
+            cache (ResumeCache | None, optional): The resume page cache.
+                Defaults to the shared cache, if RESUME_CACHE_PATH is set.
+            store (CandidateStore | None, optional): The local candidate store.
+                Defaults to the shared store, if CANDIDATE_STORE_PATH is set.
+            scoring (ScoringEngine | None, optional): The engine candidates are ranked with.
+                Defaults to the SCORING_PROFILE weights.
+            limits (ScrapeLimits | None, optional): The budget of the scrape.
+                Defaults to no limits.
+            source (CandidateSource | None, optional): The job board adapter.
+                Defaults to the source of the URL's host.
+            http (HttpClient | None, optional): The client requests are sent with.
+                Defaults to the client shared by all scrapers.
+            checkpoints (CheckpointStore | None, optional): The store progress is saved to.
+                Defaults to the shared store, if CHECKPOINT_PATH is set.
+            checkpoint_key (str | None, optional): The key of the search job the
+                progress is saved under. Defaults to the job_key of the URL and limits."""
 
         self.candidates = filtered_candidates
-        self.BASE_URL = "https://www.work.ua/"
+        self.workers = workers
+        self.scheduler = scheduler or FetchScheduler()
+        self.source = source or get_source_for_url(filtered_candidates)
+        self.extractor = extractor or self.source.get_extractor()
+        self.executor = executor or get_parse_executor()
+        self.cache = cache or get_resume_cache()
+        self.store = store or get_candidate_store()
+        self.scoring = scoring or ScoringEngine()
+        self.limits = limits or ScrapeLimits()
+        self.http = http or get_http_client()
+        self.checkpoints = checkpoints or get_checkpoint_store()
+        self.checkpoint_key = checkpoint_key or job_key(filtered_candidates, self.limits)
+        self.checkpoint = None
+        self.unsaved_pages = []
+        self.unsaved_candidates = []
+        self.finished = False
+        self.failed = []
+        self.results = CandidateBatch()
+        self.result_keys = array("Q")
+        self.total = 0
+        self.listing_done = False
+        self.truncated = False
+        # Set when the deadline, rather than the limits, stopped the scrape.
+        self.deadline_passed = False
+        self.per_page = 0
+        self.output = None
+        # Resume links are relative to the site root of the search page.
+        self.BASE_URL = urljoin(filtered_candidates, "/")
         setup_logging()
 
-    @staticmethod
-    def get_ssl_connector():
-        """Create an SSL connector for aiohttp."""
+    async def run_parser(self, func: Callable, *args) -> Any:
+        """Run a parsing function in the process pool, or inline without one.
+
+        The parsing functions only take and return plain data, so the event loop
+        only does I/O while pages are parsed on other cores.
+        """
 
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        return aiohttp.TCPConnector(ssl=ssl_context)
+        if self.executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
 
-    async def scrap_one_candidate(
-        self, session, soup: BeautifulSoup
-    ) -> Candidate:
+    async def scrap_one_candidate(self, session, url: str) -> Candidate:
         """Scrape data for a single candidate.
         Args:
             session: The aiohttp ClientSession object.
-            soup (BeautifulSoup): The BeautifulSoup object representing the candidate's page.
+            url (str): The URL of the candidate's resume.
         Returns:
-            Candidate | dict: The scraped candidate data."""
+            Candidate: The scraped candidate data."""
 
-        url_name = soup.select_one("a")["href"]
-        url = urljoin(self.BASE_URL, url_name)
-        async with session.get(url, ssl=False) as response:
-            page_content = await response.text()
-            new_soup = BeautifulSoup(page_content, "html.parser")
+        with timed("resume_fetch"):
+            if self.cache is None:
+                page_content = await self.scheduler.fetch(session, url)
+            else:
+                page_content = await self.cache.fetch(self.scheduler, session, url)
+        with timed("resume_parse"):
+            return await self.run_parser(
+                parse_resume_page, page_content, url, self.extractor
+            )
 
-            high_education = new_soup.find(
-                lambda tag: tag.name == "h2" and "Освіта" in tag.text
+    async def get_page(self, session, page: int) -> tuple[int, list[str]]:
+        """Get one page of candidates.
+        Args:
+            session: The aiohttp ClientSession object.
+            page (int): The number of the page.
+        Returns:
+            (int, [str]): The total number of pages and the resume URLs on the page.
+        """
+
+        if self.checkpoint is not None and page in self.checkpoint.pages:
+            return self.checkpoint.total_pages, self.checkpoint.pages[page]
+
+        params = self.source.page_params(page)
+        with timed("listing_fetch"):
+            page_content = await self.scheduler.fetch(session, self.candidates, params)
+        with timed("listing_parse"):
+            total_pages, urls = await self.run_parser(
+                self.source.parse_listing_page, page_content, self.BASE_URL
             )
-            additional_education = new_soup.find(
-                lambda tag: tag.name == "h2"
-                and "Додаткова освіта та сертифікати" in tag.text
+        if self.checkpoints is not None:
+            self.unsaved_pages.append((page, total_pages, urls))
+        return total_pages, urls
+
+    async def enqueue_page(self, session, page: int, links: asyncio.Queue) -> None:
+        """Fetch a page of candidates and put its resume URLs into the work queue.
+        Args:
+            session: The aiohttp ClientSession object.
+            page (int): The number of the page.
+            links (asyncio.Queue): The queue of ((page, index), url) items.
+        """
+
+        logging.info(f"Start parsing page #{page}")
+        _, urls = await self.get_page(session, page)
+        await self.enqueue_resumes(page, urls, links)
+
+    async def enqueue_resumes(
+        self, page: int, urls: list[str], links: asyncio.Queue
+    ) -> None:
+        """Put the resumes of a page into the work queue, unless they are in the
+        checkpoint of the search or fresh in the store.
+
+        Resumes past the max_results limit in listing order are dropped.
+        Args:
+            page (int): The number of the page.
+            urls ([str]): The resume URLs on the page.
+            links (asyncio.Queue): The queue of ((page, index), url) items.
+        """
+
+        if self.limits.max_results is not None:
+            first = (page - 1) * self.per_page
+            allowed = max(0, self.limits.max_results - first)
+            if allowed < len(urls):
+                self.truncated = True
+                urls = urls[:allowed]
+
+        self.total += len(urls)
+        missing = []
+        restored = self.checkpoint.candidates if self.checkpoint is not None else {}
+        for index, url in enumerate(urls):
+            candidate = restored.get((page, index))
+            if candidate is not None and candidate.url == url:
+                RESUMES.inc(result="checkpoint")
+                self.emit((page, index), candidate, saved=True)
+            else:
+                missing.append((index, url))
+
+        known = {}
+        if self.store is not None and missing:
+            known = await asyncio.to_thread(
+                self.store.get_candidates, [url for _, url in missing], CANDIDATE_MAX_AGE
             )
-            english = new_soup.find(
-                lambda tag: tag.name == "p"
-                and "Англійська — вище середнього" in tag.text
+        for index, url in missing:
+            if url in known:
+                RESUMES.inc(result="stored")
+                self.emit((page, index), known[url])
+            else:
+                links.put_nowait(((page, index), url))
+
+    def emit(self, key: tuple[int, int], candidate: Candidate, saved: bool = False) -> None:
+        """Record a scraped candidate and pass it to the consumer of the stream.
+        Args:
+            key ((int, int)): The page and the index on the page of the candidate.
+            candidate (Candidate): The candidate.
+            saved (bool, optional): Whether the candidate is already in the checkpoint.
+        """
+
+        page, index = key
+        self.results.append(candidate)
+        self.result_keys.append(page << 16 | index)
+        if self.checkpoints is not None and not saved:
+            self.unsaved_candidates.append((key, candidate))
+        self.output.put_nowait(candidate)
+
+    async def checkpoint_writer(self, done: asyncio.Event) -> None:
+        """Save the progress of the scrape every CHECKPOINT_INTERVAL seconds.
+
+        When done is set, the checkpoint is deleted if the scrape finished, and
+        the remaining progress is saved otherwise, so the next run of the same
+        search job continues from it. The caller deletes it once the result of
+        a truncated scrape is delivered. Saves run one at a time, in this task.
+        Args:
+            done (asyncio.Event): Set when the scrape has ended, in any way.
+        """
+
+        while True:
+            try:
+                await asyncio.wait_for(done.wait(), CHECKPOINT_INTERVAL)
+            except TimeoutError:
+                pass
+            pages, candidates = self.unsaved_pages, self.unsaved_candidates
+            self.unsaved_pages, self.unsaved_candidates = [], []
+            try:
+                if done.is_set() and self.finished:
+                    await asyncio.to_thread(
+                        self.checkpoints.delete, self.checkpoint_key, self.candidates
+                    )
+                elif pages or candidates:
+                    await asyncio.to_thread(
+                        self.checkpoints.save,
+                        self.checkpoint_key,
+                        self.candidates,
+                        pages,
+                        candidates,
+                    )
+            except Exception as e:
+                # Losing a checkpoint must not fail the search itself.
+                logging.error(f"Failed to save the checkpoint of {self.candidates}: {e!r}")
+            if done.is_set():
+                return
+
+    async def load_checkpoint(self) -> None:
+        """Load the progress of an earlier, unfinished scrape of the URL.
+
+        A checkpoint that cannot be read is ignored and the scrape starts over.
+        """
+
+        try:
+            self.checkpoint = await asyncio.to_thread(
+                self.checkpoints.load,
+                self.checkpoint_key,
+                self.candidates,
+                CHECKPOINT_MAX_AGE,
             )
-            return Candidate(
-                name=new_soup.select_one(".add-top > h1.cut-top").text.strip(),
-                position=new_soup.select_one(".add-top > h2").text.split(",")[0],
-                ready_to_work=new_soup.select("dl.dl-horizontal > dd")[-1].text,
-                education=True if high_education else False,
-                additional_education=True if additional_education else False,
-                skills=len(new_soup.select(".label > .ellipsis")),
-                english=True if english else False,
-                url=urljoin(self.BASE_URL, url),
+        except Exception as e:
+            logging.error(f"Failed to load the checkpoint of {self.candidates}: {e!r}")
+            return
+        if self.checkpoint is not None:
+            logging.info(
+                f"Resuming from a checkpoint with {len(self.checkpoint.pages)} pages "
+                f"and {len(self.checkpoint.candidates)} candidates"
             )
 
-    @staticmethod
-    def get_num_pages(soup: BeautifulSoup) -> int:
-        """Get the total number of pages of candidates.
-        Args:
-            soup (BeautifulSoup): The BeautifulSoup object representing the page.
-        Returns:
-            int: The total number of pages."""
+    def get_results(self) -> CandidateBatch:
+        """Get the scraped candidates in listing order."""
 
-        pagination = soup.select_one("nav > ul.pagination")
+        order = np.argsort(np.frombuffer(self.result_keys, dtype=np.uint64), kind="stable")
+        return self.results.take(order)
 
-        if pagination is None:
-            return 1
-        return int(pagination.select("li > a")[-2].text)
+    async def resume_worker(self, session, links: asyncio.Queue) -> None:
+        """Scrape resumes from the work queue until the worker is cancelled.
 
-    async def get_candidates_from_one_page(
-        self, session, soup: BeautifulSoup
-    ) -> list[Candidate]:
-        """Get candidates from one page.
+        A resume that fails after all retries is logged and skipped, so it does
+        not fail the whole search.
         Args:
             session: The aiohttp ClientSession object.
-            soup (BeautifulSoup): The BeautifulSoup object representing the page.
-        Returns:
-            [Candidate]: A list of Candidate objects.
+            links (asyncio.Queue): The queue of ((page, index), url) items.
         """
 
-        candidates_cvs = soup.select(".resume-link")
-        tasks = [
-            self.scrap_one_candidate(session, one_soup) for one_soup in candidates_cvs
-        ]
+        while True:
+            key, url = await links.get()
+            try:
+                self.emit(key, await self.scrap_one_candidate(session, url))
+                RESUMES.inc(result="scraped")
+            except Exception as e:
+                RESUMES.inc(result="failed")
+                self.failed.append(url)
+                logging.error(f"Failed to scrape candidate {url}: {e!r}")
+            finally:
+                links.task_done()
 
-        return await asyncio.gather(*tasks)
+    async def scrape(self) -> None:
+        """Scrape all pages, streaming candidates into the output queue.
 
-    async def get_all_candidates(self) -> list[Candidate]:
-        """Get all candidates from all pages.
-        Returns:
-            [Candidate]: A list of Candidate objects.
+        Listing pages are fetched concurrently and their resume URLs are fed into
+        one shared queue, so resumes are scraped while the remaining pages load.
+        Only the pages and resumes within the limits are scraped, and when the
+        deadline passes the outstanding work is cancelled. None is put into the
+        output queue when the scrape is finished.
+
+        With a checkpoint store, the pages read and the candidates scraped are
+        saved while the scrape runs. A scrape of a URL that failed, timed out or
+        was interrupted earlier skips the listing pages and resumes in its checkpoint.
         """
 
-        async with aiohttp.ClientSession(connector=self.get_ssl_connector()) as session:
-            logging.info(f"Start parsing Candidates")
-            page = await session.get(self.candidates)
-            first_page_soup = BeautifulSoup(await page.text(), "html.parser")
+        links = asyncio.Queue()
+        done = asyncio.Event()
+        writer = None
+        if self.checkpoints is not None:
+            writer = asyncio.create_task(self.checkpoint_writer(done))
 
-            num_pages = self.get_num_pages(first_page_soup)
-            all_candidates = await self.get_candidates_from_one_page(
-                session, first_page_soup
+        deadline = asyncio.timeout(self.limits.deadline)
+        try:
+            async with deadline:
+                if self.checkpoints is not None:
+                    await self.load_checkpoint()
+                session = self.http.get_session()
+                logging.info(f"Start parsing Candidates")
+                total_pages, urls = await self.get_page(session, 1)
+                self.per_page = len(urls)
+                num_pages = self.limits.pages_needed(total_pages, self.per_page)
+                if num_pages < total_pages:
+                    self.truncated = True
+                    logging.info(f"Reading {num_pages} of {total_pages} pages")
+                await self.enqueue_resumes(1, urls, links)
+
+                workers = [
+                    asyncio.create_task(self.resume_worker(session, links))
+                    for _ in range(self.workers)
+                ]
+                try:
+                    await asyncio.gather(
+                        *(
+                            self.enqueue_page(session, page, links)
+                            for page in range(2, num_pages + 1)
+                        )
+                    )
+                    self.listing_done = True
+                    await links.join()
+                    self.finished = True
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+        except TimeoutError:
+            if not deadline.expired():
+                # A request that timed out after its retries, not the deadline.
+                raise
+            self.truncated = True
+            self.deadline_passed = True
+            logging.warning(
+                f"Deadline of {self.limits.deadline}s passed, "
+                f"keeping {len(self.results)} of {self.total} candidates"
             )
-            for page in range(2, num_pages + 1):
-                logging.info(f"Start parsing page #{page}")
-                page = await session.get(self.candidates, params={"page": page})
-                soup = BeautifulSoup(await page.text(), "html.parser")
-                all_candidates.extend(
-                    await self.get_candidates_from_one_page(session, soup)
-                )
+        finally:
+            done.set()
+            if writer is not None:
+                await asyncio.gather(writer, return_exceptions=True)
+            self.output.put_nowait(None)
 
-        return all_candidates
+        if self.failed:
+            logging.warning(f"Skipped {len(self.failed)} candidates that failed to load")
 
-    async def sort_candidates(self) -> list[Candidate]:
-        """Sort candidates based on their ratings.
+    async def iter_candidates(self) -> AsyncIterator[Candidate]:
+        """Yield candidates as soon as they are scraped.
+
+        While iterating, `total` holds the number of resumes found so far and
+        `listing_done` tells whether all listing pages have been read.
+        Yields:
+            Candidate: The scraped candidates in completion order.
+        """
+
+        self.results = CandidateBatch()
+        self.result_keys = array("Q")
+        self.failed = []
+        self.total = 0
+        self.listing_done = False
+        self.truncated = False
+        self.deadline_passed = False
+        self.finished = False
+        self.checkpoint = None
+        self.unsaved_pages = []
+        self.unsaved_candidates = []
+        self.output = asyncio.Queue()
+
+        task = asyncio.create_task(self.scrape())
+        try:
+            while (candidate := await self.output.get()) is not None:
+                yield candidate
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def get_all_candidates(self) -> CandidateBatch:
+        """Get all candidates from all pages.
         Returns:
-            [Candidate]: A list of Candidate objects sorted by ratings.
+            CandidateBatch: The candidates in listing order.
         """
 
-        candidate_list = await self.get_all_candidates()
-        ratings = {candidate: 0 for candidate in candidate_list}
+        async for _ in self.iter_candidates():
+            pass
+        return self.get_results()
 
-        for candidate in candidate_list:
-            ratings[candidate] = sum(
-                [
-                    5 if candidate.education else 0,
-                    4 if candidate.additional_education else 0,
-                    candidate.skills // 6,
-                    4 if candidate.english else 0,
-                ]
-            )
-        return sorted(ratings, key=ratings.get, reverse=True)
+    def rate_candidate(self, candidate: Candidate) -> int:
+        """Rate a candidate by education, additional education, skills and English."""
+
+        return self.scoring.score(candidate)
+
+    async def sort_candidates(
+        self,
+        progress: ProgressReporter | None = None,
+    ) -> CandidateBatch:
+        """Sort candidates based on their ratings.
 
-    @staticmethod
-    def write_data_to_csv(data: list[Candidate], doc_name: str) -> None:
-        """Write candidate data to a CSV file.
+        A query run within QUERY_MAX_AGE is answered from the candidate store
+        without any requests. Only complete scrapes are stored as query results,
+        so a scrape stopped by its limits is not reused for later queries.
         Args:
-            data ([Candidate]): A list of Candidate objects.
-            doc_name (str): The name of the CSV file to write.
+            progress (ProgressReporter | None, optional): Receives every candidate as it is scraped.
+        Returns:
+            CandidateBatch: The candidates sorted by ratings.
         """
 
-        try:
-            with open(doc_name, "w") as file:
-                writer = csv.writer(file)
-                writer.writerow(field.name for field in fields(Candidate))
-                writer.writerows([astuple(item) for item in data])
-            logging.info("Data written to CSV successfully.")
-        except Exception as e:
-            logging.error(f"Error writing data to CSV: {e}")
+        if self.store is not None:
+            stored = await asyncio.to_thread(
+                self.store.get_query, self.candidates, QUERY_MAX_AGE
+            )
+            if stored is not None:
+                logging.info("Answering the query from the candidate store")
+                if self.limits.max_results is not None:
+                    stored = stored.take(range(min(self.limits.max_results, len(stored))))
+                return stored
+
+        async for candidate in self.iter_candidates():
+            if progress is not None:
+                await progress.update(
+                    candidate,
+                    self.rate_candidate(candidate),
+                    self.total,
+                    self.listing_done,
+                )
+
+        with timed("scoring"):
+            result, scores = self.scoring.rank(self.get_results())
+
+        if self.store is not None:
+            with timed("store"):
+                await asyncio.to_thread(self.store.save_candidates, result, scores)
+                if not self.truncated:
+                    await asyncio.to_thread(
+                        self.store.save_query, self.candidates, result
+                    )
+        result.truncated = self.deadline_passed
+        return result
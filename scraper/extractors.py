@@ -0,0 +1,195 @@
+import logging
+import re
+from collections import Counter
+
+from bs4 import BeautifulSoup
+
+from config.settings import EXTRACTOR, EXTRACTOR_VERIFY
+from models import Candidate
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+EDUCATION_TITLE = "Освіта"
+ADDITIONAL_EDUCATION_TITLE = "Додаткова освіта та сертифікати"
+ENGLISH_LEVEL = "Англійська — вище середнього"
+
+# The tags of the fields whose end tags libxml2 implies and html.parser does
+# not: an unclosed <p> ends at the next block in lxml but keeps everything up to
+# its parent's end tag in BeautifulSoup, so the two trees give different text.
+IMPLIED_END_TAGS = re.compile(r"<(/?)(p|dt|dd|h1|h2)\b", re.IGNORECASE)
+
+
+class CandidateExtractor:
+    """Base class for extracting a Candidate from a resume page."""
+
+    name = ""
+
+    def extract(self, page_content: str, url: str) -> Candidate:
+        """Extract the candidate data from a resume page.
+        Args:
+            page_content (str): The HTML of the resume page.
+            url (str): The URL of the resume.
+        Returns:
+            Candidate: The extracted candidate data.
+        """
+
+        raise NotImplementedError
+
+
+class SoupExtractor(CandidateExtractor):
+    """The reference extractor built on a full BeautifulSoup tree."""
+
+    name = "soup"
+
+    def extract(self, page_content: str, url: str) -> Candidate:
+        new_soup = BeautifulSoup(page_content, "html.parser")
+
+        high_education = new_soup.find(
+            lambda tag: tag.name == "h2" and EDUCATION_TITLE in tag.text
+        )
+        additional_education = new_soup.find(
+            lambda tag: tag.name == "h2" and ADDITIONAL_EDUCATION_TITLE in tag.text
+        )
+        english = new_soup.find(
+            lambda tag: tag.name == "p" and ENGLISH_LEVEL in tag.text
+        )
+        return Candidate(
+            name=new_soup.select_one(".add-top > h1.cut-top").text.strip(),
+            position=new_soup.select_one(".add-top > h2").text.split(",")[0],
+            ready_to_work=new_soup.select("dl.dl-horizontal > dd")[-1].text,
+            education=True if high_education else False,
+            additional_education=True if additional_education else False,
+            skills=len(new_soup.select(".label > .ellipsis")),
+            english=True if english else False,
+            url=url,
+        )
+
+
+def _classes(element) -> list[str]:
+    return element.get("class", "").split() if element is not None else []
+
+
+def has_implied_end_tags(page_content: str) -> bool:
+    """Tell whether a page leaves out end tags that lxml and BeautifulSoup imply differently."""
+
+    balance = Counter()
+    for closing, tag in IMPLIED_END_TAGS.findall(page_content):
+        balance[tag.lower()] += -1 if closing else 1
+    return any(balance.values())
+
+
+class LxmlExtractor(CandidateExtractor):
+    """A fast extractor that collects all fields in one walk over an lxml tree.
+
+    Pages that leave out end tags of the extracted elements are read by the
+    reference extractor, since libxml2 builds a different tree for them.
+    """
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        self.reference = SoupExtractor()
+
+    def extract(self, page_content: str, url: str) -> Candidate:
+        if has_implied_end_tags(page_content):
+            return self.reference.extract(page_content, url)
+        tree = lxml.html.document_fromstring(page_content)
+
+        name = position = ready_to_work = None
+        education = additional_education = english = False
+        skills = 0
+
+        for element in tree.iter():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == "h2":
+                text = element.text_content()
+                education = education or EDUCATION_TITLE in text
+                additional_education = (
+                    additional_education or ADDITIONAL_EDUCATION_TITLE in text
+                )
+                if position is None and "add-top" in _classes(element.getparent()):
+                    position = text.split(",")[0]
+            elif tag == "h1":
+                if (
+                    name is None
+                    and "cut-top" in _classes(element)
+                    and "add-top" in _classes(element.getparent())
+                ):
+                    name = element.text_content().strip()
+            elif tag == "dd":
+                parent = element.getparent()
+                if parent.tag == "dl" and "dl-horizontal" in _classes(parent):
+                    ready_to_work = element.text_content()
+            elif tag == "p":
+                english = english or ENGLISH_LEVEL in element.text_content()
+
+            if "ellipsis" in _classes(element) and "label" in _classes(
+                element.getparent()
+            ):
+                skills += 1
+
+        if name is None or position is None or ready_to_work is None:
+            raise ValueError(f"Resume page {url} misses required fields.")
+
+        # text_content() returns str subclasses that keep the whole tree alive.
+        return Candidate(
+            name=str(name),
+            position=str(position),
+            ready_to_work=str(ready_to_work),
+            education=education,
+            additional_education=additional_education,
+            skills=skills,
+            english=english,
+            url=url,
+        )
+
+
+class VerifyingExtractor(CandidateExtractor):
+    """Run a fast extractor and check it against the reference one."""
+
+    def __init__(self, extractor: CandidateExtractor) -> None:
+        self.extractor = extractor
+        self.reference = SoupExtractor()
+        self.name = f"{extractor.name}+verify"
+
+    def extract(self, page_content: str, url: str) -> Candidate:
+        candidate = self.extractor.extract(page_content, url)
+        expected = self.reference.extract(page_content, url)
+        if candidate != expected:
+            logging.error(
+                f"Extractor '{self.extractor.name}' mismatch for {url}: "
+                f"{candidate} != {expected}"
+            )
+            return expected
+        return candidate
+
+
+EXTRACTORS = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+
+
+def get_extractor(
+    name: str = EXTRACTOR, verify: bool = EXTRACTOR_VERIFY
+) -> CandidateExtractor:
+    """Get a candidate extractor by name.
+    Args:
+        name (str, optional): "lxml" or "soup". Defaults to the EXTRACTOR setting.
+        verify (bool, optional): Compare the results with the reference extractor.
+    Returns:
+        CandidateExtractor: The extractor, "soup" if lxml is not installed.
+    """
+
+    if name == LxmlExtractor.name and lxml is None:
+        logging.warning("lxml is not installed, falling back to BeautifulSoup.")
+        name = SoupExtractor.name
+    extractor = EXTRACTORS[name]()
+    if verify and not isinstance(extractor, SoupExtractor):
+        extractor = VerifyingExtractor(extractor)
+    return extractor
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import ssl
+
+import aiohttp
+import certifi
+
+from config.settings import (
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_POOL_PER_HOST,
+    HTTP_POOL_SIZE,
+    HTTP_VERIFY_SSL,
+)
+
+from .scheduler import request_timing
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# aiohttp decodes brotli responses only when the Brotli package is installed.
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli is not None else "gzip, deflate"
+
+
+class HttpClient:
+    """A process-wide aiohttp session shared by all scrape jobs.
+
+    Connections are kept alive and reused across searches, DNS lookups are
+    cached, and the pool limits how many connections one host gets.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = HTTP_POOL_SIZE,
+        per_host: int = HTTP_POOL_PER_HOST,
+        dns_cache_ttl: float = HTTP_DNS_CACHE_TTL,
+        keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+        verify_ssl: bool = HTTP_VERIFY_SSL,
+    ) -> None:
+        """Initialize the HttpClient.
+        Args:
+            pool_size (int): The maximum number of open connections.
+            per_host (int): The maximum number of open connections to one host.
+            dns_cache_ttl (float): How long resolved addresses are reused, in seconds.
+            keepalive_timeout (float): How long an idle connection is kept open, in seconds.
+            verify_ssl (bool): Verify server certificates against the certifi bundle.
+        """
+
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.verify_ssl = verify_ssl
+        self._session = None
+        self._loop = None
+
+    def create_ssl_context(self) -> ssl.SSLContext | bool:
+        if not self.verify_ssl:
+            logging.warning("TLS certificate verification is disabled.")
+            return False
+        return ssl.create_default_context(cafile=certifi.where())
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                ssl=self.create_ssl_context(),
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={aiohttp.hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING},
+                auto_decompress=True,
+                trace_configs=[request_timing()],
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its connections."""
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+_client = None
+
+
+def get_http_client() -> HttpClient:
+    """Get the HTTP client shared by all scrapers."""
+
+    global _client
+    if _client is None:
+        _client = HttpClient()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, e.g. on shutdown."""
+
+    if _client is not None:
+        await _client.close()
@@ -0,0 +1,82 @@
+import json
+from dataclasses import asdict, dataclass
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.settings import MAX_PAGES, MAX_RESULTS, SCRAPE_DEADLINE
+
+
+@dataclass(frozen=True)
+class ScrapeLimits:
+    """The budget of a scrape. None means unlimited.
+
+    max_results: The number of resumes scraped, taken in listing order.
+    max_pages: The number of listing pages read.
+    deadline: The time after which outstanding work is dropped, in seconds.
+    """
+
+    max_results: int | None = None
+    max_pages: int | None = None
+    deadline: float | None = None
+
+    @classmethod
+    def from_settings(cls, max_results: int | None = None) -> "ScrapeLimits":
+        """Get the configured limits, optionally with a result limit chosen by the user."""
+
+        return cls(
+            max_results=max_results or MAX_RESULTS or None,
+            max_pages=MAX_PAGES or None,
+            deadline=SCRAPE_DEADLINE or None,
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "ScrapeLimits":
+        """Rebuild limits saved with to_json(), so a stored search keeps its job_key."""
+
+        return cls(**json.loads(text))
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    def is_unlimited(self) -> bool:
+        return self.max_results is None and self.max_pages is None and self.deadline is None
+
+    def pages_needed(self, num_pages: int, per_page: int) -> int:
+        """Get the number of listing pages to read.
+        Args:
+            num_pages (int): The total number of pages of the search.
+            per_page (int): The number of resumes on the first page.
+        Returns:
+            int: The number of pages that can hold resumes within the limits.
+        """
+
+        if self.max_pages is not None:
+            num_pages = min(num_pages, self.max_pages)
+        if self.max_results is not None and per_page:
+            num_pages = min(num_pages, -(-self.max_results // per_page))
+        return max(num_pages, 1)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a filtered candidates URL, so identical queries compare equal.
+    Args:
+        url (str): The URL of the filtered candidates page.
+    Returns:
+        str: The URL with a lowercase host, sorted query and trailing slash.
+    """
+
+    parts = urlsplit(url.strip())
+    path = parts.path if parts.path.endswith("/") else parts.path + "/"
+    query = urlencode(sorted(parse_qsl(parts.query)), safe="+")
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, query, "")
+    )
+
+
+def job_key(url: str, limits: ScrapeLimits, extra_urls: tuple[str, ...] = ()) -> str:
+    """Get the key of a scrape, so only identical queries with the same limits
+    and sources share it."""
+
+    key = " ".join([normalize_url(url), *sorted(map(normalize_url, extra_urls))])
+    if limits.is_unlimited():
+        return key
+    return f"{key} {limits}"
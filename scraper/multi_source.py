@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from config.settings import QUERY_MAX_AGE
+from models import Candidate, CandidateBatch
+from monitoring.metrics import timed
+from storage.candidate_store import CandidateStore, get_candidate_store
+from .candidates_scraper import CandidateScraper
+from .limits import ScrapeLimits, job_key
+from .progress import ProgressReporter
+from .scoring import ScoringEngine
+from .sources import get_source_for_url
+
+
+def identity(candidate: Candidate) -> tuple:
+    """Get the key a candidate is recognized by on different job boards.
+
+    Besides the name and position, the resume must agree on education and
+    English, so namesakes applying for the same position are kept apart. The
+    skills and work conditions are left out, since boards list them differently.
+    """
+
+    return (
+        " ".join(candidate.name.casefold().split()),
+        " ".join(candidate.position.casefold().split()),
+        candidate.education,
+        candidate.additional_education,
+        candidate.english,
+    )
+
+
+class MultiSourceScraper:
+    """Scrape one query on several job boards at the same time.
+
+    Every source runs its own CandidateScraper concurrently, limited by the
+    adaptive limiter of its board's host. Candidates are merged as they arrive: a resume URL is
+    only kept once, and a candidate already found on another board with the
+    same identity() is dropped, so the ranking holds every person once.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        limits: ScrapeLimits | None = None,
+        scoring: ScoringEngine | None = None,
+        store: CandidateStore | None = None,
+    ) -> None:
+        """Initialize the MultiSourceScraper.
+        Args:
+            urls ([str]): The search URLs, one per job board.
+            limits (ScrapeLimits | None, optional): The budget of every source's scrape.
+            scoring (ScoringEngine | None, optional): The engine the merged candidates are ranked with.
+            store (CandidateStore | None, optional): The local candidate store.
+                Defaults to the shared store, if CANDIDATE_STORE_PATH is set.
+        """
+
+        self.limits = limits or ScrapeLimits()
+        self.scoring = scoring or ScoringEngine()
+        self.store = store or get_candidate_store()
+        # All sources save their progress under the key of the whole search.
+        key = job_key(urls[0], self.limits, tuple(urls[1:]))
+        # Complete results are stored under the query of all sources.
+        self.query = job_key(urls[0], ScrapeLimits(), tuple(urls[1:]))
+        self.scrapers = [
+            CandidateScraper(
+                url,
+                limits=self.limits,
+                checkpoint_key=key,
+                source=get_source_for_url(url),
+                store=self.store,
+                scoring=self.scoring,
+            )
+            for url in urls
+        ]
+        self.results = CandidateBatch()
+        self.duplicates = 0
+        self.failed_sources = []
+
+    @property
+    def total(self) -> int:
+        return sum(scraper.total for scraper in self.scrapers)
+
+    @property
+    def listing_done(self) -> bool:
+        return all(scraper.listing_done for scraper in self.scrapers)
+
+    async def _pump(self, scraper: CandidateScraper, output: asyncio.Queue) -> None:
+        try:
+            async for candidate in scraper.iter_candidates():
+                output.put_nowait((scraper, candidate))
+        except Exception as e:
+            # A failing board must not cost the results of the others.
+            logging.error(f"Source {scraper.source.name} failed: {e!r}")
+            self.failed_sources.append(scraper.source.name)
+        finally:
+            output.put_nowait(None)
+
+    async def iter_candidates(self) -> AsyncIterator[Candidate]:
+        """Yield the unique candidates of all sources as soon as they are scraped."""
+
+        self.results = CandidateBatch()
+        self.duplicates = 0
+        self.failed_sources = []
+        output = asyncio.Queue()
+        urls = set()
+        people = {}
+        tasks = [
+            asyncio.create_task(self._pump(scraper, output)) for scraper in self.scrapers
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                item = await output.get()
+                if item is None:
+                    remaining -= 1
+                    continue
+                scraper, candidate = item
+                key = identity(candidate)
+                if candidate.url in urls or people.get(key, scraper) is not scraper:
+                    self.duplicates += 1
+                    continue
+                urls.add(candidate.url)
+                people.setdefault(key, scraper)
+                self.results.append(candidate)
+                yield candidate
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def sort_candidates(
+        self,
+        progress: ProgressReporter | None = None,
+    ) -> CandidateBatch:
+        """Sort the merged candidates of all sources based on their ratings.
+
+        Like a single source, a query run within QUERY_MAX_AGE is answered from
+        the candidate store, and only complete scrapes are stored as its result.
+        Args:
+            progress (ProgressReporter | None, optional): Receives every candidate as it is scraped.
+        Returns:
+            CandidateBatch: The unique candidates of all sources sorted by ratings.
+        """
+
+        if self.store is not None:
+            stored = await asyncio.to_thread(self.store.get_query, self.query, QUERY_MAX_AGE)
+            if stored is not None:
+                logging.info("Answering the query from the candidate store")
+                if self.limits.max_results is not None:
+                    stored = stored.take(range(min(self.limits.max_results, len(stored))))
+                return stored
+
+        async for candidate in self.iter_candidates():
+            if progress is not None:
+                await progress.update(
+                    candidate,
+                    self.scoring.score(candidate),
+                    self.total,
+                    self.listing_done,
+                )
+        if self.duplicates:
+            logging.info(f"Dropped {self.duplicates} candidates found on several sources")
+
+        with timed("scoring"):
+            result, scores = self.scoring.rank(self.results)
+        if self.store is not None:
+            with timed("store"):
+                await asyncio.to_thread(self.store.save_candidates, result, scores)
+                complete = not self.failed_sources and not any(
+                    scraper.truncated for scraper in self.scrapers
+                )
+                if complete:
+                    await asyncio.to_thread(self.store.save_query, self.query, result)
+        result.truncated = any(scraper.deadline_passed for scraper in self.scrapers)
+        return result
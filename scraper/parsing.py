@@ -0,0 +1,65 @@
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from models import Candidate
+from .extractors import CandidateExtractor
+
+# work.ua serves its pages in UTF-8.
+ENCODING = "utf-8"
+
+
+def get_num_pages(soup: BeautifulSoup) -> int:
+    """Get the total number of pages of candidates.
+    Args:
+        soup (BeautifulSoup): The BeautifulSoup object representing the page.
+    Returns:
+        int: The total number of pages."""
+
+    pagination = soup.select_one("nav > ul.pagination")
+
+    if pagination is None:
+        return 1
+    return int(pagination.select("li > a")[-2].text)
+
+
+def get_resume_urls(soup: BeautifulSoup, base_url: str) -> list[str]:
+    """Get resume URLs from a page of candidates.
+    Args:
+        soup (BeautifulSoup): The BeautifulSoup object representing the page.
+        base_url (str): The URL the resume links are relative to.
+    Returns:
+        [str]: The absolute URLs of the resumes on the page.
+    """
+
+    return [
+        urljoin(base_url, card.select_one("a")["href"])
+        for card in soup.select(".resume-link")
+    ]
+
+
+def parse_listing_page(page_content: bytes, base_url: str) -> tuple[int, list[str]]:
+    """Parse a page of candidates.
+    Args:
+        page_content (bytes): The raw HTML of the page.
+        base_url (str): The URL the resume links are relative to.
+    Returns:
+        (int, [str]): The total number of pages and the resume URLs on the page.
+    """
+
+    soup = BeautifulSoup(page_content.decode(ENCODING, "replace"), "html.parser")
+    return get_num_pages(soup), get_resume_urls(soup, base_url)
+
+
+def parse_resume_page(
+    page_content: bytes, url: str, extractor: CandidateExtractor
+) -> Candidate:
+    """Parse a candidate's resume page.
+    Args:
+        page_content (bytes): The raw HTML of the resume page.
+        url (str): The URL of the resume.
+        extractor (CandidateExtractor): The extractor to use.
+    Returns:
+        Candidate: The parsed candidate data."""
+
+    return extractor.extract(page_content.decode(ENCODING, "replace"), url)
@@ -0,0 +1,76 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from config.settings import PROGRESS_INTERVAL
+from models import Candidate
+
+
+@dataclass
+class ScrapeProgress:
+    done: int
+    total: int
+    listing_done: bool
+    top: list[tuple[int, Candidate]]
+
+
+class ProgressReporter:
+    """Report scrape progress with a preview of the best candidates so far."""
+
+    def __init__(
+        self,
+        callback: Callable[[ScrapeProgress], Awaitable[None]],
+        interval: float = PROGRESS_INTERVAL,
+        top_size: int = 10,
+    ) -> None:
+        """Initialize the ProgressReporter.
+        Args:
+            callback: The coroutine function progress is reported to.
+            interval (float): The minimum time between two reports, in seconds.
+            top_size (int): The number of best candidates in the preview.
+        """
+
+        self.callback = callback
+        self.interval = interval
+        self.top_size = top_size
+        self.done = 0
+        self._top = []
+        self._counter = itertools.count()
+        # The first candidate is reported right away.
+        self._last_report = float("-inf")
+
+    def get_top(self) -> list[tuple[int, Candidate]]:
+        """Get the best candidates so far with their scores, best first."""
+
+        return [
+            (score, candidate)
+            for score, _, candidate in sorted(self._top, reverse=True)
+        ]
+
+    async def update(
+        self, candidate: Candidate, score: int, total: int, listing_done: bool
+    ) -> None:
+        """Count a scraped candidate and report progress if the interval has passed.
+        Args:
+            candidate (Candidate): The scraped candidate.
+            score (int): The candidate's rating.
+            total (int): The number of resumes found so far.
+            listing_done (bool): Whether all listing pages have been read.
+        """
+
+        self.done += 1
+        # Earlier candidates win ties, as in the final stable sort.
+        item = (score, -next(self._counter), candidate)
+        if len(self._top) < self.top_size:
+            heapq.heappush(self._top, item)
+        elif item[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, item)
+
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            await self.callback(
+                ScrapeProgress(self.done, total, listing_done, self.get_top())
+            )
@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from config.settings import (
+    REQUEST_RETRIES,
+    REQUEST_TIMEOUT,
+    SCRAPER_INITIAL_CONCURRENCY,
+    SCRAPER_WORKERS,
+    TARGET_LATENCY,
+)
+from monitoring.metrics import HTTP_RESPONSES, HTTP_RETRIES
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HttpStatusError(Exception):
+    """Raised when a page responds with an error status."""
+
+    def __init__(self, url: str, status: int, retry_after: float | None = None) -> None:
+        super().__init__(f"{url} responded with status {status}")
+        self.url = url
+        self.status = status
+        self.retry_after = retry_after
+
+
+@dataclass
+class Response:
+    status: int
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class AdaptiveLimiter:
+    """A concurrency limit that adapts to the server (additive increase,
+    multiplicative decrease)."""
+
+    def __init__(
+        self,
+        initial: int = SCRAPER_INITIAL_CONCURRENCY,
+        minimum: int = 1,
+        maximum: int = SCRAPER_WORKERS,
+        target_latency: float = TARGET_LATENCY,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """Initialize the AdaptiveLimiter.
+        Args:
+            initial (int): The starting number of concurrent requests.
+            minimum (int): The lowest allowed limit.
+            maximum (int): The highest allowed limit.
+            target_latency (float): Responses slower than this, in seconds, count as congestion.
+            decrease_factor (float): The factor the limit is multiplied by on congestion.
+        """
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float | None, overloaded: bool = False) -> None:
+        """Release a slot and adjust the limit.
+        Args:
+            latency (float | None): The request latency, None if it failed without a response.
+            overloaded (bool, optional): The server signalled overload (429/5xx/timeout).
+        """
+
+        async with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            congested = overloaded or (
+                latency is not None and latency > self.target_latency
+            )
+            if congested:
+                # Decrease at most once per latency window, since the requests
+                # already in flight all see the same congestion.
+                if now - self._last_decrease > self.target_latency:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    logging.info(f"Concurrency limit decreased to {int(self.limit)}")
+            elif latency is not None:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+_limiters_loop = None
+
+
+def get_host_limiter(host: str) -> AdaptiveLimiter:
+    """Get the limiter shared by every request to a host, whichever job sends it.
+    Args:
+        host (str): The host name.
+    Returns:
+        AdaptiveLimiter: The limiter of the host on the running event loop.
+    """
+
+    global _limiters_loop
+    loop = asyncio.get_running_loop()
+    if _limiters_loop is not loop:
+        # The limiters wait on conditions bound to the loop they were used on.
+        _limiters.clear()
+        _limiters_loop = loop
+    if host not in _limiters:
+        _limiters[host] = AdaptiveLimiter()
+    return _limiters[host]
+
+
+def request_timing() -> aiohttp.TraceConfig:
+    """Create a trace config recording when a request has been sent, i.e.
+    after a connection was taken from the pool, in its trace_request_ctx."""
+
+    async def on_request_headers_sent(session, context, params) -> None:
+        if isinstance(context.trace_request_ctx, dict):
+            context.trace_request_ctx["sent"] = time.monotonic()
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_headers_sent.append(on_request_headers_sent)
+    return trace
+
+
+class FetchScheduler:
+    """Fetch pages through an adaptive limiter with timeouts and jittered retries."""
+
+    def __init__(
+        self,
+        limiter: AdaptiveLimiter | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+        retries: int = REQUEST_RETRIES,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """Initialize the FetchScheduler.
+        Args:
+            limiter (AdaptiveLimiter | None): The concurrency limiter to use.
+                Defaults to the limiter shared by all requests to the URL's host.
+            timeout (float): The timeout of a single request, in seconds.
+            retries (int): How many times a failed request is retried.
+            backoff (float): The base delay between retries, in seconds.
+            max_backoff (float): The maximum delay between retries, in seconds.
+        """
+
+        self.limiter = limiter
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def get_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Get a full-jitter exponential backoff delay for an attempt."""
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_limiter(self, url: str) -> AdaptiveLimiter:
+        return self.limiter or get_host_limiter(urlsplit(url).hostname or "")
+
+    @staticmethod
+    def parse_retry_after(response: aiohttp.ClientResponse) -> float | None:
+        value = response.headers.get("Retry-After")
+        if value is None or not value.isdigit():
+            return None
+        return float(value)
+
+    async def fetch_once(
+        self,
+        session,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+    ) -> Response:
+        limiter = self.get_limiter(url)
+        await limiter.acquire()
+        # Sessions created with request_timing() record when the request was
+        # sent, so waiting for a pooled connection is not counted as latency.
+        timing = {"sent": time.monotonic()}
+        latency = None
+        overloaded = False
+        try:
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.timeout,
+                trace_request_ctx=timing,
+            ) as response:
+                HTTP_RESPONSES.inc(status=response.status)
+                if response.status >= 400:
+                    overloaded = response.status in RETRY_STATUSES
+                    raise HttpStatusError(
+                        url, response.status, self.parse_retry_after(response)
+                    )
+                body = await response.read()
+                latency = time.monotonic() - timing["sent"]
+                return Response(
+                    status=response.status,
+                    body=body,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+        except asyncio.TimeoutError:
+            HTTP_RESPONSES.inc(status="timeout")
+            overloaded = True
+            raise
+        except aiohttp.ClientConnectionError:
+            HTTP_RESPONSES.inc(status="connection_error")
+            raise
+        finally:
+            await limiter.release(latency, overloaded)
+
+    async def fetch(self, session, url: str, params: dict | None = None) -> bytes:
+        """Fetch the raw content of a page, retrying timeouts, 429 and 5xx responses.
+        Args:
+            session: The aiohttp ClientSession object.
+            url (str): The URL of the page.
+            params (dict | None): The query parameters.
+        Returns:
+            bytes: The page content.
+        """
+
+        response = await self.fetch_response(session, url, params)
+        return response.body
+
+    async def fetch_response(
+        self,
+        session,
+        url: str,
+        params: dict | None = None,
+        headers: dict | None = None,
+    ) -> Response:
+        """Fetch a page with its validators, retrying timeouts, 429 and 5xx responses.
+        Args:
+            session: The aiohttp ClientSession object.
+            url (str): The URL of the page.
+            params (dict | None): The query parameters.
+            headers (dict | None): Additional request headers.
+        Returns:
+            Response: The response status, content and validators.
+        """
+
+        for attempt in range(self.retries + 1):
+            try:
+                return await self.fetch_once(session, url, params, headers)
+            except HttpStatusError as e:
+                if e.status not in RETRY_STATUSES or attempt == self.retries:
+                    raise
+                delay = self.get_delay(attempt, e.retry_after)
+                HTTP_RETRIES.inc(reason=e.status)
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.get_delay(attempt)
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else "connection_error"
+                HTTP_RETRIES.inc(reason=reason)
+            logging.warning(
+                f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1})"
+            )
+            await asyncio.sleep(delay)
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+from config.settings import SCORING_PROFILE
+from models import Candidate, CandidateBatch
+
+
+@dataclass(frozen=True)
+class ScoringProfile:
+    """The weights a candidate's rating is computed with."""
+
+    education: int = 5
+    additional_education: int = 4
+    skills_divisor: int = 6
+    english: int = 4
+
+
+PROFILES = {
+    "default": ScoringProfile(),
+    "skills": ScoringProfile(education=3, additional_education=2, skills_divisor=3),
+    "education": ScoringProfile(education=8, additional_education=6, skills_divisor=8),
+    "english": ScoringProfile(english=8),
+}
+
+
+class ScoringEngine:
+    """Rate and rank candidates over columns of their attributes."""
+
+    def __init__(self, profile: ScoringProfile | str = SCORING_PROFILE) -> None:
+        """Initialize the ScoringEngine.
+        Args:
+            profile (ScoringProfile | str): The weights, or the name of a profile in PROFILES.
+        """
+
+        self.profile = PROFILES[profile] if isinstance(profile, str) else profile
+
+    def score(self, candidate: Candidate) -> int:
+        """Rate a single candidate."""
+
+        profile = self.profile
+        return (
+            (profile.education if candidate.education else 0)
+            + (profile.additional_education if candidate.additional_education else 0)
+            + candidate.skills // profile.skills_divisor
+            + (profile.english if candidate.english else 0)
+        )
+
+    def score_columns(
+        self,
+        education: np.ndarray,
+        additional_education: np.ndarray,
+        skills: np.ndarray,
+        english: np.ndarray,
+    ) -> np.ndarray:
+        """Rate a batch of candidates given as attribute columns.
+        Args:
+            education (np.ndarray): Boolean column of higher education.
+            additional_education (np.ndarray): Boolean column of additional education.
+            skills (np.ndarray): Integer column of skill counts.
+            english (np.ndarray): Boolean column of English level.
+        Returns:
+            np.ndarray: The scores of the candidates.
+        """
+
+        profile = self.profile
+        return (
+            education.astype(np.int64) * profile.education
+            + additional_education.astype(np.int64) * profile.additional_education
+            + skills.astype(np.int64) // profile.skills_divisor
+            + english.astype(np.int64) * profile.english
+        )
+
+    def score_batch(self, candidates: Iterable[Candidate]) -> np.ndarray:
+        """Rate a batch of candidates."""
+
+        batch = CandidateBatch.from_candidates(candidates)
+        return self.score_columns(
+            batch.flag_column("education"),
+            batch.flag_column("additional_education"),
+            batch.skills_column(),
+            batch.flag_column("english"),
+        )
+
+    @staticmethod
+    def unique(candidates: Iterable[Candidate]) -> CandidateBatch:
+        """Drop repeated resumes, keeping the first occurrence of every URL."""
+
+        batch = CandidateBatch.from_candidates(candidates)
+        first = {}
+        for index, url in enumerate(batch.urls):
+            first.setdefault(url, index)
+        if len(first) == len(batch):
+            return batch
+        return batch.take(first.values())
+
+    def rank(
+        self, candidates: Iterable[Candidate]
+    ) -> tuple[CandidateBatch, list[int]]:
+        """Sort candidates by score, keeping the listing order of equal scores.
+        Args:
+            candidates (Iterable[Candidate]): The candidates in listing order.
+        Returns:
+            (CandidateBatch, [int]): The sorted unique candidates and their scores.
+        """
+
+        batch = self.unique(candidates)
+        scores = self.score_batch(batch)
+        order = np.argsort(-scores, kind="stable")
+        return batch.take(order), scores[order].tolist()
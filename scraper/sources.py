@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from config.settings import SEARCH_SOURCES
+from parsers.facets import parse_experience_years, parse_salary_amount
+from parsers.http_parser import HttpCandidatesParser
+from parsers.url_builder import build_search_url
+from .extractors import CandidateExtractor, get_extractor
+from .parsing import parse_listing_page
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """The filters of a query besides its text.
+
+    They are kept as the labels of the work.ua filter options the user chose,
+    e.g. "Від 1 до 2 років" or "від 10 000 грн". Other boards translate them
+    from experience_years() and salary_range().
+    """
+
+    experience: tuple[str, ...] = ()
+    min_salary: str | None = None
+    max_salary: str | None = None
+
+    def experience_years(self) -> list[tuple[int, int | None]]:
+        """Get the chosen experience ranges as (min, max) years, max None for no limit."""
+
+        return [parse_experience_years(label) for label in self.experience]
+
+    def salary_range(self) -> tuple[int | None, int | None]:
+        """Get the chosen minimum and maximum salary expectation in UAH."""
+
+        return (
+            parse_salary_amount(self.min_salary) if self.min_salary else None,
+            parse_salary_amount(self.max_salary) if self.max_salary else None,
+        )
+
+
+class CandidateSource:
+    """A job board candidates are scraped from.
+
+    An adapter knows how to build a search URL, how listing pages are
+    paginated and parsed, and how a resume page is turned into a Candidate.
+    Its methods only take and return plain data, so listing pages can be
+    parsed in worker processes.
+    """
+
+    name = ""
+    hosts: tuple[str, ...] = ()
+
+    def search_url(
+        self,
+        position: str | None = None,
+        location: str | None = None,
+        skills: str | None = None,
+        filters: SearchFilters | None = None,
+    ) -> str:
+        """Build the URL of the search results of a query.
+        Args:
+            position (str | None): The job position to search for.
+            location (str | None): The location to search for.
+            skills (str | None): The skills or keywords to search for.
+            filters (SearchFilters | None, optional): The experience and salary filters.
+        Returns:
+            str: The URL of the first page of search results.
+        """
+
+        raise NotImplementedError
+
+    def page_params(self, page: int) -> dict | None:
+        """Get the query parameters of a page of search results."""
+
+        raise NotImplementedError
+
+    def parse_listing_page(
+        self, page_content: bytes, base_url: str
+    ) -> tuple[int, list[str]]:
+        """Parse a page of search results.
+        Args:
+            page_content (bytes): The raw HTML of the page.
+            base_url (str): The URL the resume links are relative to.
+        Returns:
+            (int, [str]): The total number of pages and the resume URLs on the page.
+        """
+
+        raise NotImplementedError
+
+    def get_extractor(self) -> CandidateExtractor:
+        """Get the extractor of the resume pages."""
+
+        raise NotImplementedError
+
+
+class WorkUaSource(CandidateSource):
+    name = "workua"
+    hosts = ("www.work.ua", "work.ua")
+
+    def search_url(
+        self,
+        position: str | None = None,
+        location: str | None = None,
+        skills: str | None = None,
+        filters: SearchFilters | None = None,
+    ) -> str:
+        if filters is None or filters == SearchFilters():
+            return build_search_url(position, location, skills)
+
+        # The values of the filter options are only known from the menus of
+        # the search page, so they are selected like in the bot.
+        parser = HttpCandidatesParser()
+        try:
+            if position:
+                parser.get_employees_by_job_position(position)
+            if location:
+                parser.get_employees_by_location(location)
+            if skills:
+                parser.get_employees_by_skills_or_keywords(skills)
+            for label in filters.experience:
+                parser.get_employees_by_years_of_experience(label)
+            if filters.min_salary:
+                parser.get_employee_by_salary_expectation(filters.min_salary)
+            if filters.max_salary:
+                parser.get_employee_by_salary_expectation(filters.max_salary, True)
+            return parser.BASE_URL
+        finally:
+            parser.close_driver()
+
+    def page_params(self, page: int) -> dict | None:
+        return {"page": page} if page > 1 else None
+
+    def parse_listing_page(
+        self, page_content: bytes, base_url: str
+    ) -> tuple[int, list[str]]:
+        return parse_listing_page(page_content, base_url)
+
+    def get_extractor(self) -> CandidateExtractor:
+        return get_extractor()
+
+
+SOURCES = {
+    WorkUaSource.name: WorkUaSource,
+}
+
+
+def get_sources(names: str = SEARCH_SOURCES) -> list[CandidateSource]:
+    """Get the configured sources.
+    Args:
+        names (str): Comma-separated source names. Defaults to the SEARCH_SOURCES setting.
+    Returns:
+        [CandidateSource]: The sources, in the given order.
+    Raises:
+        ValueError: If a source is unknown.
+    """
+
+    sources = []
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        if name not in SOURCES:
+            raise ValueError(f"Unknown candidate source '{name}'.")
+        sources.append(SOURCES[name]())
+    return sources
+
+
+def get_source_for_url(url: str) -> CandidateSource:
+    """Get the source a search URL belongs to, work.ua for unknown hosts."""
+
+    host = urlsplit(url).hostname or ""
+    for source in SOURCES.values():
+        if host in source.hosts:
+            return source()
+    return WorkUaSource()
@@ -0,0 +1,156 @@
+import csv
+import gzip
+import io
+import json
+from dataclasses import fields
+from typing import BinaryIO, Iterable
+
+from models import Candidate, CandidateBatch
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+FIELD_NAMES = [field.name for field in fields(Candidate)]
+
+
+class CandidateExporter:
+    """Base class for writing candidate rows into a binary stream.
+
+    The stream is not closed, so it can be an in-memory buffer read afterwards.
+    """
+
+    extension = ""
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+
+    def write(self, row: tuple) -> None:
+        """Write a candidate given as a tuple in Candidate field order."""
+
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Flush everything written so far into the stream."""
+
+
+class CsvExporter(CandidateExporter):
+    extension = "csv"
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__(stream)
+        self.text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(FIELD_NAMES)
+
+    def write(self, row: tuple) -> None:
+        self.writer.writerow(row)
+
+    def close(self) -> None:
+        self.text.flush()
+        # Detach, so closing the wrapper does not close the stream.
+        self.text.detach()
+
+
+class JsonLinesExporter(CandidateExporter):
+    extension = "jsonl"
+
+    def write(self, row: tuple) -> None:
+        line = json.dumps(dict(zip(FIELD_NAMES, row)), ensure_ascii=False)
+        self.stream.write(line.encode("utf-8") + b"\n")
+
+
+class XlsxExporter(CandidateExporter):
+    extension = "xlsx"
+
+    def __init__(self, stream: BinaryIO) -> None:
+        super().__init__(stream)
+        # A write-only workbook streams rows instead of keeping cell objects.
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Candidates")
+        self.sheet.append(FIELD_NAMES)
+
+    def write(self, row: tuple) -> None:
+        self.sheet.append(row)
+
+    def close(self) -> None:
+        self.workbook.save(self.stream)
+
+
+class GzipExporter(CandidateExporter):
+    """Compress the output of another exporter."""
+
+    def __init__(self, exporter: type[CandidateExporter], stream: BinaryIO) -> None:
+        super().__init__(stream)
+        self.gzip = gzip.GzipFile(fileobj=stream, mode="wb", mtime=0)
+        self.exporter = exporter(self.gzip)
+        self.extension = f"{exporter.extension}.gz"
+
+    def write(self, row: tuple) -> None:
+        self.exporter.write(row)
+
+    def close(self) -> None:
+        self.exporter.close()
+        # Closing a GzipFile writes the trailer but leaves fileobj open.
+        self.gzip.close()
+
+
+EXPORTERS = {
+    "csv": CsvExporter,
+    "jsonl": JsonLinesExporter,
+    "xlsx": XlsxExporter,
+}
+
+
+def get_export_formats() -> list[str]:
+    """Get the available export formats, "xlsx" only if openpyxl is installed."""
+
+    formats = []
+    for name in EXPORTERS:
+        if name == XlsxExporter.extension and openpyxl is None:
+            continue
+        formats.append(name)
+        if name != XlsxExporter.extension:
+            # XLSX files are zip archives already.
+            formats.append(f"{name}.gz")
+    return formats
+
+
+def get_exporter(export_format: str, stream: BinaryIO) -> CandidateExporter:
+    """Create an exporter writing into a stream.
+    Args:
+        export_format (str): One of get_export_formats(), e.g. "csv" or "jsonl.gz".
+        stream (BinaryIO): The binary stream to write into.
+    Returns:
+        CandidateExporter: The exporter.
+    Raises:
+        ValueError: If the format is unknown or its library is not installed.
+    """
+
+    if export_format not in get_export_formats():
+        raise ValueError(f"Unsupported export format '{export_format}'.")
+    name, _, compression = export_format.partition(".")
+    if compression:
+        return GzipExporter(EXPORTERS[name], stream)
+    return EXPORTERS[name](stream)
+
+
+def export_candidates(
+    candidates: Iterable[Candidate], export_format: str = "csv"
+) -> io.BytesIO:
+    """Export candidates into an in-memory buffer.
+    Args:
+        candidates (Iterable[Candidate]): The candidates, a list or a CandidateBatch.
+        export_format (str, optional): One of get_export_formats(). Defaults to "csv".
+    Returns:
+        io.BytesIO: The exported file, positioned at its start.
+    """
+
+    buffer = io.BytesIO()
+    exporter = get_exporter(export_format, buffer)
+    for row in CandidateBatch.from_candidates(candidates).rows():
+        exporter.write(row)
+    exporter.close()
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,146 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable
+
+from config.settings import CANDIDATE_STORE_PATH
+from models import Candidate, CandidateBatch
+
+CANDIDATE_COLUMNS = (
+    "name, position, ready_to_work, education, additional_education, skills, "
+    "english, url"
+)
+
+
+class CandidateStore:
+    """A local SQLite index of scraped candidates and recently run queries."""
+
+    def __init__(self, path: str = CANDIDATE_STORE_PATH) -> None:
+        """Initialize the CandidateStore.
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                url TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                position TEXT NOT NULL,
+                ready_to_work TEXT NOT NULL,
+                education INTEGER NOT NULL,
+                additional_education INTEGER NOT NULL,
+                skills INTEGER NOT NULL,
+                english INTEGER NOT NULL,
+                score INTEGER NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS candidates_score ON candidates (score);
+            CREATE TABLE IF NOT EXISTS queries (
+                url TEXT PRIMARY KEY,
+                candidate_urls TEXT NOT NULL,
+                finished_at REAL NOT NULL
+            );
+            """
+        )
+
+    @staticmethod
+    def _to_candidate(row: tuple) -> Candidate:
+        name, position, ready_to_work, education, additional, skills, english, url = row
+        return Candidate(
+            name=name,
+            position=position,
+            ready_to_work=ready_to_work,
+            education=bool(education),
+            additional_education=bool(additional),
+            skills=skills,
+            english=bool(english),
+            url=url,
+        )
+
+    def get_candidates(self, urls: list[str], max_age: float) -> dict[str, Candidate]:
+        """Get stored candidates seen within max_age seconds.
+        Args:
+            urls ([str]): The resume URLs to look up.
+            max_age (float): The age after which a stored candidate is stale.
+        Returns:
+            dict[str, Candidate]: The fresh candidates keyed by their URL.
+        """
+
+        rows = []
+        since = time.time() - max_age
+        with self._lock:
+            # Stay below SQLite's limit on the number of query parameters.
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows += self._connection.execute(
+                    f"SELECT {CANDIDATE_COLUMNS} FROM candidates "
+                    f"WHERE url IN ({placeholders}) AND last_seen >= ?",
+                    (*chunk, since),
+                ).fetchall()
+        return {row[-1]: self._to_candidate(row) for row in rows}
+
+    def save_candidates(
+        self, candidates: Iterable[Candidate], scores: list[int]
+    ) -> None:
+        """Insert or update candidates with their scores."""
+
+        now = time.time()
+        rows = CandidateBatch.from_candidates(candidates).rows()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO candidates ({CANDIDATE_COLUMNS}, score, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((*row, score, now) for row, score in zip(rows, scores)),
+            )
+
+    def save_query(self, query_url: str, candidates: Iterable[Candidate]) -> None:
+        """Remember the ranked result of a query."""
+
+        urls = CandidateBatch.from_candidates(candidates).urls
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?, ?)",
+                (query_url, json.dumps(urls), time.time()),
+            )
+
+    def get_query(self, query_url: str, max_age: float) -> CandidateBatch | None:
+        """Get the ranked result of a query run within max_age seconds.
+        Args:
+            query_url (str): The URL of the filtered candidates page.
+            max_age (float): The age after which a query result is stale.
+        Returns:
+            CandidateBatch | None: The candidates in ranking order, None if unknown or stale.
+        """
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT candidate_urls FROM queries WHERE url = ? AND finished_at >= ?",
+                (query_url, time.time() - max_age),
+            ).fetchone()
+        if row is None:
+            return None
+        urls = json.loads(row[0])
+        candidates = self.get_candidates(urls, float("inf"))
+        return CandidateBatch.from_candidates(
+            candidates[url] for url in urls if url in candidates
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_store = None
+
+
+def get_candidate_store() -> CandidateStore | None:
+    """Get the store shared by all scrapers, None if it is disabled."""
+
+    global _store
+    if CANDIDATE_STORE_PATH and _store is None:
+        _store = CandidateStore()
+    return _store
@@ -0,0 +1,322 @@
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import astuple, dataclass, field
+
+from config.settings import CHECKPOINT_PATH
+from models import Candidate
+from scraper.limits import ScrapeLimits
+from .candidate_store import CANDIDATE_COLUMNS
+
+
+@dataclass
+class Checkpoint:
+    """The progress of an unfinished scrape of one search URL."""
+
+    total_pages: int = 0
+    pages: dict[int, list[str]] = field(default_factory=dict)
+    candidates: dict[tuple[int, int], Candidate] = field(default_factory=dict)
+
+
+@dataclass
+class InterruptedSearch:
+    """A search of a chat that has not been delivered yet."""
+
+    id: int
+    chat_id: int
+    url: str
+    limits: ScrapeLimits
+    extra_urls: tuple[str, ...]
+
+
+# Bumped whenever the tables change. Saved progress older than the last change
+# of the progress tables is dropped, since a scrape can always start over.
+SCHEMA_VERSION = 5
+PROGRESS_SCHEMA_VERSION = 4
+
+
+class CheckpointStore:
+    """A local SQLite store of the progress of running scrapes.
+
+    Every listing page read and every candidate extracted is recorded under
+    the key of the search job and the URL of the source, so a scrape that failed or was stopped by a restart
+    continues where it stopped instead of starting over. The searches waiting
+    for delivery to a chat are recorded too, so they can be run again.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_PATH) -> None:
+        """Initialize the CheckpointStore.
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._migrate()
+        self._connection.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS checkpoint_pages (
+                job TEXT NOT NULL,
+                url TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                total_pages INTEGER NOT NULL,
+                resume_urls TEXT NOT NULL,
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (job, url, page)
+            );
+            CREATE TABLE IF NOT EXISTS checkpoint_candidates (
+                job TEXT NOT NULL,
+                search_url TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                position_index INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                position TEXT NOT NULL,
+                ready_to_work TEXT NOT NULL,
+                education INTEGER NOT NULL,
+                additional_education INTEGER NOT NULL,
+                skills INTEGER NOT NULL,
+                english INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                saved_at REAL NOT NULL,
+                PRIMARY KEY (job, search_url, page, position_index)
+            );
+            CREATE TABLE IF NOT EXISTS interrupted_searches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                limits TEXT NOT NULL,
+                extra_urls TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            PRAGMA user_version = {SCHEMA_VERSION};
+            """
+        )
+
+    def _migrate(self) -> None:
+        """Drop the saved progress of an older schema and add the columns the
+        recorded searches are missing."""
+
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        if version >= SCHEMA_VERSION:
+            return
+        if version < PROGRESS_SCHEMA_VERSION:
+            self._connection.executescript(
+                """
+                DROP TABLE IF EXISTS checkpoint_pages;
+                DROP TABLE IF EXISTS checkpoint_candidates;
+                """
+            )
+        columns = {
+            row[1]
+            for row in self._connection.execute("PRAGMA table_info(interrupted_searches)")
+        }
+        if columns and "created_at" not in columns:
+            # Searches recorded before get the full CHECKPOINT_MAX_AGE from now.
+            with self._connection:
+                self._connection.execute(
+                    "ALTER TABLE interrupted_searches "
+                    "ADD COLUMN created_at REAL NOT NULL DEFAULT 0"
+                )
+                self._connection.execute(
+                    "UPDATE interrupted_searches SET created_at = ?", (time.time(),)
+                )
+        if columns and "limits" not in columns:
+            # Searches recorded with only their result limit get the limits
+            # they were started with before the limits were saved.
+            with self._connection:
+                self._connection.execute(
+                    "ALTER TABLE interrupted_searches "
+                    "ADD COLUMN limits TEXT NOT NULL DEFAULT ''"
+                )
+                rows = self._connection.execute(
+                    "SELECT id, max_results FROM interrupted_searches"
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE interrupted_searches SET limits = ? WHERE id = ?",
+                    (
+                        (ScrapeLimits.from_settings(max_results).to_json(), id)
+                        for id, max_results in rows
+                    ),
+                )
+
+    def load(self, job: str, url: str, max_age: float) -> Checkpoint | None:
+        """Get the progress of a search saved within max_age seconds.
+        Args:
+            job (str): The key of the search job, see job_key().
+            url (str): The search URL on the scraped source.
+            max_age (float): The age after which a checkpoint is stale.
+        Returns:
+            Checkpoint | None: The saved progress, None if there is none.
+        """
+
+        since = time.time() - max_age
+        with self._lock:
+            pages = self._connection.execute(
+                "SELECT page, total_pages, resume_urls FROM checkpoint_pages "
+                "WHERE job = ? AND url = ? AND saved_at >= ?",
+                (job, url, since),
+            ).fetchall()
+            rows = self._connection.execute(
+                f"SELECT page, position_index, {CANDIDATE_COLUMNS} "
+                "FROM checkpoint_candidates "
+                "WHERE job = ? AND search_url = ? AND saved_at >= ?",
+                (job, url, since),
+            ).fetchall()
+        if not pages:
+            return None
+
+        checkpoint = Checkpoint()
+        for page, total_pages, resume_urls in pages:
+            checkpoint.total_pages = max(checkpoint.total_pages, total_pages)
+            checkpoint.pages[page] = json.loads(resume_urls)
+        for page, index, *row in rows:
+            name, position, ready, education, additional, skills, english, resume_url = row
+            checkpoint.candidates[page, index] = Candidate(
+                name=name,
+                position=position,
+                ready_to_work=ready,
+                education=bool(education),
+                additional_education=bool(additional),
+                skills=skills,
+                english=bool(english),
+                url=resume_url,
+            )
+        return checkpoint
+
+    def save(
+        self,
+        job: str,
+        url: str,
+        pages: list[tuple[int, int, list[str]]],
+        candidates: list[tuple[tuple[int, int], Candidate]],
+    ) -> None:
+        """Add the pages read and the candidates extracted since the last save.
+        Args:
+            job (str): The key of the search job.
+            url (str): The search URL on the scraped source.
+            pages ([(int, int, [str])]): The page numbers, total page counts and resume URLs.
+            candidates ([((int, int), Candidate)]): The candidates by (page, index) in the listing.
+        """
+
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO checkpoint_pages VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (job, url, page, total_pages, json.dumps(resume_urls), now)
+                    for page, total_pages, resume_urls in pages
+                ),
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO checkpoint_candidates "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (job, url, page, index, *astuple(candidate), now)
+                    for (page, index), candidate in candidates
+                ),
+            )
+
+    def delete(self, job: str, url: str | None = None) -> None:
+        """Forget the progress of a finished or delivered search.
+        Args:
+            job (str): The key of the search job.
+            url (str | None, optional): The source whose progress is deleted.
+                Defaults to all sources of the job.
+        """
+
+        pages_query = "DELETE FROM checkpoint_pages WHERE job = ?"
+        candidates_query = "DELETE FROM checkpoint_candidates WHERE job = ?"
+        params = (job,)
+        if url is not None:
+            pages_query += " AND url = ?"
+            candidates_query += " AND search_url = ?"
+            params = (job, url)
+        with self._lock, self._connection:
+            self._connection.execute(pages_query, params)
+            self._connection.execute(candidates_query, params)
+
+    def prune(self, max_age: float) -> None:
+        """Delete the progress saved and the searches recorded more than max_age
+        seconds ago, so a search that keeps failing is not run again forever."""
+
+        since = time.time() - max_age
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM checkpoint_pages WHERE saved_at < ?", (since,)
+            )
+            self._connection.execute(
+                "DELETE FROM checkpoint_candidates WHERE saved_at < ?", (since,)
+            )
+            self._connection.execute(
+                "DELETE FROM interrupted_searches WHERE created_at < ?", (since,)
+            )
+
+    def add_search(
+        self,
+        chat_id: int,
+        url: str,
+        limits: ScrapeLimits,
+        extra_urls: tuple[str, ...] = (),
+    ) -> int:
+        """Record a search until it is delivered to its chat, or for at most
+        CHECKPOINT_MAX_AGE if it keeps failing.
+
+        The limits are saved as they are, so the search is continued under
+        the same job_key and finds its checkpoint.
+        Returns:
+            int: The id of the record.
+        """
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO interrupted_searches "
+                "(chat_id, url, limits, extra_urls, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chat_id, url, limits.to_json(), json.dumps(list(extra_urls)), time.time()),
+            )
+        return cursor.lastrowid
+
+    def get_searches(self, chat_id: int | None = None) -> list[InterruptedSearch]:
+        """Get the undelivered searches of a chat, or of all chats."""
+
+        query = "SELECT id, chat_id, url, limits, extra_urls FROM interrupted_searches"
+        params = ()
+        if chat_id is not None:
+            query += " WHERE chat_id = ?"
+            params = (chat_id,)
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY id", params).fetchall()
+        return [
+            InterruptedSearch(
+                id,
+                chat_id,
+                url,
+                ScrapeLimits.from_json(limits),
+                tuple(json.loads(extra_urls)),
+            )
+            for id, chat_id, url, limits, extra_urls in rows
+        ]
+
+    def remove_search(self, search_id: int) -> None:
+        """Forget a delivered or cancelled search."""
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM interrupted_searches WHERE id = ?", (search_id,)
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_store = None
+
+
+def get_checkpoint_store() -> CheckpointStore | None:
+    """Get the shared checkpoint store, None if checkpointing is disabled."""
+
+    global _store
+    if CHECKPOINT_PATH and _store is None:
+        _store = CheckpointStore()
+    return _store
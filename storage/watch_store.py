@@ -0,0 +1,226 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from config.settings import WATCH_STORE_PATH
+from models import Candidate, CandidateBatch
+from scraper.limits import ScrapeLimits
+
+
+@dataclass
+class Watch:
+    """A saved search re-run periodically for a chat."""
+
+    id: int
+    chat_id: int
+    url: str
+    interval: float
+    limits: ScrapeLimits
+    next_run: float
+
+
+def fingerprint(row: tuple) -> str:
+    """Get a short digest of a candidate row, to notice changed resumes."""
+
+    return hashlib.sha1(repr(row).encode("utf-8")).hexdigest()[:16]
+
+
+class WatchStore:
+    """A local SQLite store of saved searches and the resumes they have seen."""
+
+    def __init__(self, path: str = WATCH_STORE_PATH) -> None:
+        """Initialize the WatchStore.
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._migrate()
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS watches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chat_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                interval REAL NOT NULL,
+                limits TEXT NOT NULL,
+                next_run REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS watches_next_run ON watches (next_run);
+            CREATE TABLE IF NOT EXISTS watch_seen (
+                watch_id INTEGER NOT NULL,
+                url TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                PRIMARY KEY (watch_id, url)
+            );
+            """
+        )
+
+    def _migrate(self) -> None:
+        """Add the limits column to the watches saved with only their result limit."""
+
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(watches)")
+        }
+        if columns and "limits" not in columns:
+            with self._connection:
+                self._connection.execute(
+                    "ALTER TABLE watches ADD COLUMN limits TEXT NOT NULL DEFAULT ''"
+                )
+                rows = self._connection.execute(
+                    "SELECT id, max_results FROM watches"
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE watches SET limits = ? WHERE id = ?",
+                    (
+                        (ScrapeLimits.from_settings(max_results).to_json(), id)
+                        for id, max_results in rows
+                    ),
+                )
+
+    def add_watch(
+        self,
+        chat_id: int,
+        url: str,
+        interval: float,
+        limits: ScrapeLimits,
+        seen: Iterable[Candidate] = (),
+    ) -> Watch:
+        """Save a search.
+        Args:
+            chat_id (int): The chat new candidates are sent to.
+            url (str): The URL of the filtered candidates page.
+            interval (float): The time between two runs, in seconds.
+            limits (ScrapeLimits): The budget of every run, saved as it is so
+                every run has the same job_key.
+            seen (Iterable[Candidate], optional): The candidates the chat has already received.
+        Returns:
+            Watch: The saved search.
+        """
+
+        next_run = time.time() + interval
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO watches (chat_id, url, interval, limits, next_run) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (chat_id, url, interval, limits.to_json(), next_run),
+            )
+            watch = Watch(cursor.lastrowid, chat_id, url, interval, limits, next_run)
+            self._remember(watch.id, CandidateBatch.from_candidates(seen))
+        return watch
+
+    def get_watches(self, chat_id: int) -> list[Watch]:
+        """Get the saved searches of a chat."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, chat_id, url, interval, limits, next_run "
+                "FROM watches WHERE chat_id = ? ORDER BY id",
+                (chat_id,),
+            ).fetchall()
+        return [self._watch(*row) for row in rows]
+
+    def remove_watch(self, chat_id: int, watch_id: int) -> bool:
+        """Delete a saved search of a chat.
+        Returns:
+            bool: Whether the search existed.
+        """
+
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM watches WHERE id = ? AND chat_id = ?", (watch_id, chat_id)
+            )
+            if not cursor.rowcount:
+                return False
+            self._connection.execute(
+                "DELETE FROM watch_seen WHERE watch_id = ?", (watch_id,)
+            )
+        return True
+
+    def get_due_watches(self, now: float) -> list[Watch]:
+        """Get the saved searches whose next run is due."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, chat_id, url, interval, limits, next_run "
+                "FROM watches WHERE next_run <= ? ORDER BY next_run",
+                (now,),
+            ).fetchall()
+        return [self._watch(*row) for row in rows]
+
+    def schedule(self, watch_id: int, next_run: float) -> None:
+        """Set the time of the next run of a saved search."""
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE watches SET next_run = ? WHERE id = ?", (next_run, watch_id)
+            )
+
+    @staticmethod
+    def _watch(id, chat_id, url, interval, limits, next_run) -> Watch:
+        return Watch(id, chat_id, url, interval, ScrapeLimits.from_json(limits), next_run)
+
+    def _remember(self, watch_id: int, batch: CandidateBatch) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO watch_seen VALUES (?, ?, ?)",
+            ((watch_id, row[-1], fingerprint(row)) for row in batch.rows()),
+        )
+
+    def get_new_candidates(
+        self, watch_id: int, candidates: Iterable[Candidate]
+    ) -> CandidateBatch:
+        """Get the candidates a saved search has not seen yet, or has seen with
+        different data. They are only remembered by mark_seen(), once the chat
+        has received them.
+        Args:
+            watch_id (int): The id of the saved search.
+            candidates (Iterable[Candidate]): The result of the latest run.
+        Returns:
+            CandidateBatch: The new and changed candidates, in the order of the result.
+        """
+
+        batch = CandidateBatch.from_candidates(candidates)
+        with self._lock:
+            seen = dict(
+                self._connection.execute(
+                    "SELECT url, fingerprint FROM watch_seen WHERE watch_id = ?",
+                    (watch_id,),
+                ).fetchall()
+            )
+        return batch.take(
+            index
+            for index, row in enumerate(batch.rows())
+            if seen.get(row[-1]) != fingerprint(row)
+        )
+
+    def mark_seen(self, watch_id: int, candidates: CandidateBatch) -> None:
+        """Remember the candidates a saved search has sent to its chat.
+
+        Nothing is remembered for a search removed in the meantime.
+        """
+
+        with self._lock, self._connection:
+            exists = self._connection.execute(
+                "SELECT 1 FROM watches WHERE id = ?", (watch_id,)
+            ).fetchone()
+            if exists:
+                self._remember(watch_id, candidates)
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+_store = None
+
+
+def get_watch_store() -> WatchStore | None:
+    """Get the shared watch store, None if saved searches are disabled."""
+
+    global _store
+    if WATCH_STORE_PATH and _store is None:
+        _store = WatchStore()
+    return _store
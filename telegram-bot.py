@@ -1,33 +1,97 @@
 import asyncio
+import logging
 import os
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 
-import telebot
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiTelegramException
 from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
 from dotenv import load_dotenv
 from config.logging_config import setup_logging
+from config.settings import (
+    ADMIN_IDS,
+    CHECKPOINT_MAX_AGE,
+    EXPORT_FORMAT,
+    PROFILE_JOBS,
+    WATCH_INTERVAL,
+    WATCH_MAX_PER_CHAT,
+)
 from filters import (
+    Parser,
     filter_employees_without_salary,
     filter_candidates_by_experience,
     filter_candidates_by_salary_expectations,
+    get_extra_search_urls,
     get_available_salary_expectations,
     get_available_candidates_experience,
-    scrap_all_candidates,
+    sort_filtered_candidates,
+    warm_filter_options,
+)
+from jobs.job_queue import (
+    JobQueue,
+    JobQueueFull,
+    Subscription,
+    forget_checkpoint,
 )
+from jobs.watch_scheduler import WatchScheduler
+from models import CandidateBatch
+from monitoring.metrics import timed
+from monitoring.profiling import JobProfile, new_profile
+from monitoring.server import start_metrics_server
+from scraper.http_client import close_http_client
+from scraper.limits import ScrapeLimits
+from scraper.sources import SearchFilters
+from scraper.progress import ScrapeProgress
+from scraper.writers import export_candidates, get_export_formats
+from storage.checkpoint_store import InterruptedSearch, get_checkpoint_store
+from storage.watch_store import Watch, get_watch_store
 
 load_dotenv()
 
 
+@dataclass
+class FinishedSearch:
+    """The last search delivered to a chat, which can be saved with /watch."""
+
+    url: str
+    limits: ScrapeLimits
+    result: CandidateBatch
+
+
+@dataclass
+class ChatSession:
+    """The conversation state of one chat."""
+
+    all_user_answers: dict = field(default_factory=dict)
+    user_answer: dict = field(default_factory=dict)
+    salary: str = ""
+    candidates: Parser | None = None
+    count: int = 0
+    max_results: int | None = None
+    export_format: str = EXPORT_FORMAT
+    next_step: Callable[..., Awaitable[None]] | None = None
+    task: asyncio.Task | None = None
+    subscription: Subscription | None = None
+    last_search: FinishedSearch | None = None
+    profile: JobProfile | None = None
+    send_profile: bool = False
+
+
 class BotSession:
     """A class representing a session with the Telegram bot."""
 
     def __init__(self) -> None:
         self.__bot_token = os.getenv("BOT_TOKEN")
-        self.bot = telebot.TeleBot(self.__bot_token)
-        self.all_user_answers = {}
-        self.user_answer = {}
-        self.salary = ""
-        self.candidates = None
-        self.count = 0
+        self.bot = AsyncTeleBot(self.__bot_token)
+        self.sessions: dict[int, ChatSession] = {}
+        self.jobs = JobQueue(sort_filtered_candidates)
+        self.checkpoints = get_checkpoint_store()
+        self.running_searches: set[int] = set()
+        self.watch_store = get_watch_store()
+        self.watches = None
+        if self.watch_store is not None:
+            self.watches = WatchScheduler(self.watch_store, self.jobs, self.notify_watch)
         self.messages = {
             "Welcome": "Welcome to HR-Helper!",
             "Start": "Let's find the best candidates! Push the button to begin.",
@@ -42,36 +106,148 @@ class BotSession:
             "Salary_question": "Would you like to specify salary expectation?",
             "Minimum_salary": "Please, choose the the MINIMUM salary value.",
             "Maximum_salary": "Please, choose the the MAXIMUM salary value.",
+            "Limit_question": "How many candidates do you need? Fewer candidates are found faster.",
             "Waiting": "Please wait, it will take a minute...",
             "Finish": "Here is the list of candidates you were looking for!",
+            "Finish_partial": "The search reached its time limit, so the list only has "
+            "the candidates found until then.",
+            "Progress": "Processed {done} of {total} resumes.",
+            "Progress_listing": "Processed {done} of at least {total} resumes.",
+            "Preview": "The best candidates so far:",
+            "Failed": "Sorry, the search failed. Please, try again later.",
+            "Failed_resumable": "Sorry, the search failed. Send /resume to continue it from where it stopped.",
+            "Resuming": "Continuing your interrupted search...",
+            "Nothing_to_resume": "There is no interrupted search to continue.",
+            "Profile_enabled": "The next search of this chat will be profiled.",
+            "Profile_report": "The profile of the search.",
+            "Busy": "Too many searches are running now. Please, try again in a few minutes.",
+            "Cancelled": "The search was cancelled.",
+            "Nothing_to_cancel": "There is no running search to cancel.",
+            "Format": "Please, choose the format of the candidate list:",
+            "Format_selected": "The candidate list will be sent as {export_format}.",
+            "Watch_saved": "Saved search #{watch_id}. New candidates will be sent every {hours:g} hours. "
+            "Use /watches to see your saved searches.",
+            "Watch_nothing": "Please, run a search first, then send /watch to receive its new candidates regularly.",
+            "Watch_too_many": "You can save at most {limit} searches. Remove one with /unwatch <number>.",
+            "Watch_disabled": "Saved searches are disabled.",
+            "Watch_list": "Your saved searches:",
+            "Watch_empty": "You have no saved searches.",
+            "Watch_removed": "Saved search #{watch_id} was removed.",
+            "Watch_not_found": "Please, send /unwatch with the number of one of your saved searches.",
+            "Watch_new": "{count} new candidates for saved search #{watch_id}!",
         }
         setup_logging()
 
-    def start(self) -> None:
+    async def start(self) -> None:
         self.register_handlers()
-        self.bot.polling()
+        self.jobs.start()
+        if self.watches is not None:
+            self.watches.start()
+        metrics_server = await start_metrics_server()
+        warmup = asyncio.create_task(asyncio.to_thread(warm_filter_options))
+        try:
+            await self.resume_searches()
+        except Exception as e:
+            logging.exception(f"Failed to resume interrupted searches: {e}")
+        try:
+            await self.bot.polling(non_stop=True)
+        finally:
+            warmup.cancel()
+            if self.watches is not None:
+                await self.watches.stop()
+            await self.jobs.stop()
+            await close_http_client()
+            if metrics_server is not None:
+                await metrics_server.cleanup()
+
+    def get_session(self, chat_id: int) -> ChatSession:
+        """Get the conversation state of a chat, creating it on first use."""
+
+        return self.sessions.setdefault(chat_id, ChatSession())
 
     def register_handlers(self) -> None:
         """Register message and callback query handlers."""
 
         @self.bot.message_handler(commands=["start"], content_types=["text"])
-        def handle_message_responses(message) -> None:
+        async def handle_message_responses(message) -> None:
             """Handle message responses."""
 
-            self.send_welcome(message)
+            await self.send_welcome(message)
+
+        @self.bot.message_handler(commands=["cancel"], content_types=["text"])
+        async def handle_cancel(message) -> None:
+            """Cancel the running search."""
+
+            await self.cancel_search(message)
+
+        @self.bot.message_handler(commands=["resume"], content_types=["text"])
+        async def handle_resume(message) -> None:
+            """Continue the interrupted searches of a chat."""
+
+            await self.resume_searches(message.chat.id)
+
+        @self.bot.message_handler(commands=["profile"], content_types=["text"])
+        async def handle_profile(message) -> None:
+            """Profile the next search of the chat, for admins only."""
+
+            await self.enable_profile(message)
+
+        @self.bot.message_handler(commands=["format"], content_types=["text"])
+        async def handle_format(message) -> None:
+            """Choose the format of the candidate list."""
+
+            formats = get_export_formats()
+            await self.send_options(
+                [export_format.upper() for export_format in formats],
+                "Format",
+                message,
+                [f"format_{export_format}" for export_format in formats],
+            )
+
+        @self.bot.message_handler(commands=["watch"], content_types=["text"])
+        async def handle_watch(message) -> None:
+            """Save the last search to receive its new candidates regularly."""
+
+            await self.save_watch(message)
+
+        @self.bot.message_handler(commands=["watches"], content_types=["text"])
+        async def handle_watches(message) -> None:
+            """List the saved searches."""
+
+            await self.list_watches(message)
+
+        @self.bot.message_handler(commands=["unwatch"], content_types=["text"])
+        async def handle_unwatch(message) -> None:
+            """Remove a saved search."""
+
+            await self.remove_watch(message)
+
+        @self.bot.message_handler(func=lambda message: True, content_types=["text"])
+        async def handle_next_step(message) -> None:
+            """Pass a text answer to the step waiting for it."""
+
+            session = self.get_session(message.chat.id)
+            if session.next_step is not None:
+                next_step, session.next_step = session.next_step, None
+                await next_step(message)
 
         @self.bot.callback_query_handler(func=lambda call: True)
-        def handle_callback_query(call) -> None:
+        async def handle_callback_query(call) -> None:
             """Handle callback queries."""
 
+            session = self.get_session(call.message.chat.id)
             if call.data == "Start_search":
-                self.position_question(call.message)
+                await self.position_question(call.message)
             elif call.data in ["location", "skills", "continue"]:
-                self.select_filters_handler(call)
+                await self.select_filters_handler(call)
             elif call.data in ["experience_yes", "experience_no"]:
-                self.experience_question_handler(call)
+                await self.experience_question_handler(call)
             elif call.data in ["salary_yes", "salary_no"]:
-                self.salary_question_handler(call)
+                await self.salary_question_handler(call)
+            elif call.data.startswith("limit_"):
+                await self.limit_handler(call)
+            elif call.data.startswith("format_"):
+                await self.format_handler(call)
             elif call.data in [
                 "без досвіду",
                 "до 1 року",
@@ -79,11 +255,11 @@ class BotSession:
                 "від 2 до 5 років",
                 "понад 5 років",
             ]:
-                self.filter_by_experience(call)
-            elif self.count == 2:
-                self.filter_by_salary(call)
+                await self.filter_by_experience(call)
+            elif session.count == 2:
+                await self.filter_by_salary(call)
             else:
-                self.salary_handler(call)
+                await self.salary_handler(call)
 
     @staticmethod
     def generate_markup(
@@ -98,7 +274,7 @@ class BotSession:
         markup.add(*buttons, row_width=2)
         return markup
 
-    def send_options(
+    async def send_options(
             self,
             button_names: [str],
             message_key: str,
@@ -108,7 +284,7 @@ class BotSession:
         """Send options with inline keyboard markup."""
 
         markup = self.generate_markup(button_names, call_data)
-        self.bot.send_message(
+        await self.bot.send_message(
             message.chat.id,
             self.messages[message_key],
             reply_markup=markup,
@@ -117,161 +293,534 @@ class BotSession:
     def update_user_answer(self, message) -> None:
         """Update user answer."""
 
-        if "current_filter" in self.user_answer:
-            key = self.user_answer["current_filter"]
-            self.all_user_answers[key] = message.text
+        session = self.get_session(message.chat.id)
+        if "current_filter" in session.user_answer:
+            key = session.user_answer["current_filter"]
+            session.all_user_answers[key] = message.text
 
-    def send_welcome(self, message) -> None:
+    async def send_welcome(self, message) -> None:
         """Send welcome message."""
 
-        self.bot.send_message(
+        await self.bot.send_message(
             message.chat.id,
             self.messages["Welcome"],
         )
-        self.start_button(message)
+        await self.start_button(message)
 
-    def start_button(self, message) -> None:
+    async def start_button(self, message) -> None:
         """Send start button."""
-        self.all_user_answers = {}
-        self.user_answer = {}
-        self.salary = ""
-        self.candidates = None
+
+        previous = self.sessions.get(message.chat.id)
+        session = ChatSession()
+        if previous is not None:
+            # Let a search that is still running finish and deliver its file.
+            session.task = previous.task
+            session.subscription = previous.subscription
+            session.export_format = previous.export_format
+            session.last_search = previous.last_search
+            session.profile = previous.profile
+            session.send_profile = previous.send_profile
+            if previous.candidates is not None:
+                await asyncio.to_thread(previous.candidates.close_driver)
+        if PROFILE_JOBS and session.profile is None:
+            session.profile = new_profile(f"chat{message.chat.id}")
+        self.sessions[message.chat.id] = session
         markup = InlineKeyboardMarkup()
         markup.add(InlineKeyboardButton("Start Search", callback_data="Start_search"))
-        self.bot.send_message(
+        await self.bot.send_message(
             message.chat.id, self.messages["Start"], reply_markup=markup
         )
 
-    def position_question(self, message) -> None:
+    async def navigate(self, session: ChatSession, func: Callable, *args):
+        """Run a filter navigation step in a thread, in the profile of the
+        chat's search if it is profiled."""
+
+        if session.profile is None:
+            return await asyncio.to_thread(func, *args)
+        return await asyncio.to_thread(
+            session.profile.run, f"navigation: {func.__name__}", func, *args
+        )
+
+    async def enable_profile(self, message) -> None:
+        """Profile the next search of a chat and send the report when it is delivered."""
+
+        if message.from_user.id not in ADMIN_IDS:
+            logging.warning(f"User {message.from_user.id} is not allowed to profile searches")
+            return
+        session = self.get_session(message.chat.id)
+        session.profile = new_profile(f"chat{message.chat.id}")
+        session.send_profile = True
+        await self.bot.send_message(message.chat.id, self.messages["Profile_enabled"])
+
+    async def position_question(self, message) -> None:
         """Ask position question."""
 
-        self.bot.send_message(message.chat.id, self.messages["position"])
-        self.bot.register_next_step_handler(message, self.position_handler)
+        await self.bot.send_message(message.chat.id, self.messages["position"])
+        self.get_session(message.chat.id).next_step = self.position_handler
 
-    def position_handler(self, message) -> None:
+    async def position_handler(self, message) -> None:
         """Handle position response."""
 
-        self.all_user_answers["position"] = message.text
-        self.select_filters(message)
+        self.get_session(message.chat.id).all_user_answers["position"] = message.text
+        await self.select_filters(message)
 
-    def select_filters(self, message) -> None:
+    async def select_filters(self, message) -> None:
         """Select filters."""
 
         button_names = ["Location", "Skills", "Continue"]
         self.update_user_answer(message)
-        self.send_options(button_names, "Filter", message)
+        await self.send_options(button_names, "Filter", message)
 
-    def select_filters_handler(self, call) -> None:
+    async def select_filters_handler(self, call) -> None:
         """Handle the selection of filters."""
 
+        session = self.get_session(call.message.chat.id)
         if call.data in ["location", "skills"]:
-            self.user_answer["current_filter"] = call.data
-            self.bot.send_message(
+            session.user_answer["current_filter"] = call.data
+            await self.bot.send_message(
                 call.message.chat.id,
                 self.messages[call.data],
             )
-            self.bot.register_next_step_handler(call.message, self.select_filters)
+            session.next_step = self.select_filters
         elif call.data == "continue":
-            self.continue_with_selected_filters(call.message)
+            await self.continue_with_selected_filters(call.message)
 
-    def continue_with_selected_filters(self, message) -> None:
+    async def continue_with_selected_filters(self, message) -> None:
         """Continue with the selected filters."""
 
-        self.bot.send_message(message.chat.id, self.messages["Waiting"])
-        position = self.all_user_answers.get("position", None)
-        location = self.all_user_answers.get("location", None)
-        skills = self.all_user_answers.get("skills", None)
+        await self.bot.send_message(message.chat.id, self.messages["Waiting"])
+        session = self.get_session(message.chat.id)
+        position = session.all_user_answers.get("position", None)
+        location = session.all_user_answers.get("location", None)
+        skills = session.all_user_answers.get("skills", None)
 
-        self.candidates = filter_employees_without_salary(position, location, skills)
-        self.experience_question(message)
+        session.candidates = await self.navigate(
+            session, filter_employees_without_salary, position, location, skills
+        )
+        await self.experience_question(message)
 
-    def experience_question(self, message) -> None:
+    async def experience_question(self, message) -> None:
         """Ask about the candidate's experience."""
 
-        self.send_options(
+        await self.send_options(
             ["Yes", "No"],
             "Experience_question",
             message,
             ["experience_yes", "experience_no"],
         )
 
-    def experience_question_handler(self, call) -> None:
+    async def experience_question_handler(self, call) -> None:
         """Handle the response to the experience question."""
 
+        session = self.get_session(call.message.chat.id)
         if call.data == "experience_yes":
-            experience = get_available_candidates_experience(self.candidates)
+            experience = await self.navigate(
+                session, get_available_candidates_experience, session.candidates
+            )
             buttons = [value for value in experience]
-            self.send_options(buttons, "Experience", call.message)
+            await self.send_options(buttons, "Experience", call.message)
 
         elif call.data == "experience_no":
-            self.salary_question(call)
+            await self.salary_question(call)
 
-    def filter_by_experience(self, call) -> None:
+    async def filter_by_experience(self, call) -> None:
         """Filter candidates based on experience."""
 
-        self.bot.send_message(
+        await self.bot.send_message(
             call.message.chat.id,
             self.messages["Waiting"],
         )
-        self.candidates = filter_candidates_by_experience(self.candidates, call.data)
-        self.salary_question(call)
+        session = self.get_session(call.message.chat.id)
+        session.candidates = await self.navigate(
+            session, filter_candidates_by_experience, session.candidates, call.data
+        )
+        session.all_user_answers["experience"] = call.data
+        await self.salary_question(call)
 
-    def salary_question(self, call) -> None:
+    async def salary_question(self, call) -> None:
         """Ask about salary expectation."""
 
-        self.send_options(
+        await self.send_options(
             ["Yes", "No"], "Salary_question", call.message, ["salary_yes", "salary_no"]
         )
 
-    def salary_question_handler(self, call) -> None:
+    async def salary_question_handler(self, call) -> None:
         """Handle the response to the salary question."""
 
         if call.data == "salary_yes":
-            self.salary_handler(call)
+            await self.salary_handler(call)
         elif call.data == "salary_no":
-            self.get_candidate_list(call.message)
+            await self.limit_question(call.message)
 
-    def salary_handler(self, call) -> None:
+    async def salary_handler(self, call) -> None:
         """Handle salary input."""
 
-        salary = get_available_salary_expectations(self.candidates)
-        if self.count == 1:
-            self.salary = call.data
-            self.candidates = filter_candidates_by_salary_expectations(
-                self.candidates, self.salary
+        session = self.get_session(call.message.chat.id)
+        if session.count == 1:
+            session.salary = call.data
+            session.candidates = await self.navigate(
+                session, filter_candidates_by_salary_expectations,
+                session.candidates,
+                session.salary,
+            )
+            session.all_user_answers["min_salary"] = session.salary
+            salary = await self.navigate(
+                session, get_available_salary_expectations, session.candidates, True
             )
-            salary = get_available_salary_expectations(self.candidates, max_salary=True)
-        self.bot.send_message(call.message.chat.id, self.messages["Waiting"])
+        else:
+            salary = await self.navigate(
+                session, get_available_salary_expectations, session.candidates
+            )
+        await self.bot.send_message(call.message.chat.id, self.messages["Waiting"])
 
-        message_key = "Maximum_salary" if self.count == 1 else "Minimum_salary"
-        self.send_options(salary, message_key, call.message)
-        self.count += 1
+        message_key = "Maximum_salary" if session.count == 1 else "Minimum_salary"
+        await self.send_options(salary, message_key, call.message)
+        session.count += 1
 
-    def filter_by_salary(self, call) -> None:
+    async def filter_by_salary(self, call) -> None:
         """Filter candidates by salary."""
 
-        self.candidates = filter_candidates_by_salary_expectations(
-            self.candidates, call.data, max_salary=True
+        session = self.get_session(call.message.chat.id)
+        session.candidates = await self.navigate(
+            session, filter_candidates_by_salary_expectations,
+            session.candidates,
+            call.data,
+            True,
         )
-        self.get_candidate_list(call.message)
-        self.stop_bot()
+        session.all_user_answers["max_salary"] = call.data
+        await self.limit_question(call.message)
 
-    def get_candidate_list(self, message) -> None:
-        """Get the list of candidates."""
+    async def limit_question(self, message) -> None:
+        """Ask how many candidates to look for."""
+
+        await self.send_options(
+            ["50", "100", "200", "All"],
+            "Limit_question",
+            message,
+            ["limit_50", "limit_100", "limit_200", "limit_all"],
+        )
+
+    async def limit_handler(self, call) -> None:
+        """Handle the number of candidates and start the search."""
+
+        value = call.data.removeprefix("limit_")
+        session = self.get_session(call.message.chat.id)
+        session.max_results = int(value) if value.isdigit() else None
+        self.schedule_candidate_list(call.message)
+
+    async def save_watch(self, message) -> None:
+        """Save the last search of a chat, seeded with the candidates it delivered."""
+
+        chat_id = message.chat.id
+        last_search = self.get_session(chat_id).last_search
+        if self.watch_store is None:
+            await self.bot.send_message(chat_id, self.messages["Watch_disabled"])
+            return
+        if last_search is None:
+            await self.bot.send_message(chat_id, self.messages["Watch_nothing"])
+            return
+        watches = await asyncio.to_thread(self.watch_store.get_watches, chat_id)
+        if len(watches) >= WATCH_MAX_PER_CHAT:
+            await self.bot.send_message(
+                chat_id, self.messages["Watch_too_many"].format(limit=WATCH_MAX_PER_CHAT)
+            )
+            return
+        watch = await asyncio.to_thread(
+            self.watch_store.add_watch,
+            chat_id,
+            last_search.url,
+            WATCH_INTERVAL,
+            last_search.limits,
+            last_search.result,
+        )
+        await self.bot.send_message(
+            chat_id,
+            self.messages["Watch_saved"].format(
+                watch_id=watch.id, hours=WATCH_INTERVAL / 3600
+            ),
+        )
 
-        self.bot.send_message(message.chat.id, self.messages["Waiting"])
-        asyncio.run(scrap_all_candidates(self.candidates))
+    async def list_watches(self, message) -> None:
+        """Send the saved searches of a chat."""
+
+        chat_id = message.chat.id
+        if self.watch_store is None:
+            await self.bot.send_message(chat_id, self.messages["Watch_disabled"])
+            return
+        watches = await asyncio.to_thread(self.watch_store.get_watches, chat_id)
+        if not watches:
+            await self.bot.send_message(chat_id, self.messages["Watch_empty"])
+            return
+        lines = [self.messages["Watch_list"]]
+        lines.extend(f"#{watch.id} {watch.url}" for watch in watches)
+        await self.bot.send_message(
+            chat_id, "\n".join(lines), disable_web_page_preview=True
+        )
+
+    async def remove_watch(self, message) -> None:
+        """Remove a saved search given as "/unwatch <number>"."""
+
+        chat_id = message.chat.id
+        if self.watch_store is None:
+            await self.bot.send_message(chat_id, self.messages["Watch_disabled"])
+            return
+        argument = message.text.partition(" ")[2].strip().lstrip("#")
+        removed = argument.isdigit() and await asyncio.to_thread(
+            self.watch_store.remove_watch, chat_id, int(argument)
+        )
+        if not removed:
+            await self.bot.send_message(chat_id, self.messages["Watch_not_found"])
+            return
+        await self.bot.send_message(
+            chat_id, self.messages["Watch_removed"].format(watch_id=int(argument))
+        )
 
-        with open("candidates.csv", "rb") as file:
-            self.bot.send_document(
+    async def notify_watch(self, watch: Watch, candidates: CandidateBatch) -> None:
+        """Send the new candidates of a saved search to its chat."""
+
+        export_format = self.get_session(watch.chat_id).export_format
+        document = await asyncio.to_thread(export_candidates, candidates, export_format)
+        await self.bot.send_document(
+            watch.chat_id,
+            document,
+            caption=self.messages["Watch_new"].format(
+                count=len(candidates), watch_id=watch.id
+            ),
+            visible_file_name=f"new_candidates_{watch.id}.{export_format}",
+        )
+
+    async def format_handler(self, call) -> None:
+        """Remember the export format chosen for a chat."""
+
+        export_format = call.data.removeprefix("format_")
+        if export_format not in get_export_formats():
+            return
+        self.get_session(call.message.chat.id).export_format = export_format
+        await self.bot.send_message(
+            call.message.chat.id,
+            self.messages["Format_selected"].format(export_format=export_format.upper()),
+        )
+
+    def format_progress(self, progress: ScrapeProgress) -> str:
+        """Format a progress update with a preview of the best candidates."""
+
+        message_key = "Progress" if progress.listing_done else "Progress_listing"
+        lines = [self.messages[message_key].format(done=progress.done, total=progress.total)]
+        if progress.top:
+            lines.append(self.messages["Preview"])
+            lines.extend(
+                f"{number}. {candidate.name} – {candidate.position} ({score}) {candidate.url}"
+                for number, (score, candidate) in enumerate(progress.top, start=1)
+            )
+        return "\n".join(lines)
+
+    def schedule_candidate_list(self, message) -> None:
+        """Run the search as a background task, so other chats are served meanwhile."""
+
+        session = self.get_session(message.chat.id)
+        candidates, session.candidates = session.candidates, None
+        limits = ScrapeLimits.from_settings(session.max_results)
+        answers = session.all_user_answers
+        filters = SearchFilters(
+            experience=(answers["experience"],) if "experience" in answers else (),
+            min_salary=answers.get("min_salary"),
+            max_salary=answers.get("max_salary"),
+        )
+        extra_urls = get_extra_search_urls(
+            candidates.BASE_URL,
+            answers.get("position"),
+            answers.get("location"),
+            answers.get("skills"),
+            filters,
+        )
+        profile, session.profile = session.profile, None
+        send_profile, session.send_profile = session.send_profile, False
+        session.task = asyncio.create_task(
+            self.get_candidate_list(
+                message, candidates, limits, extra_urls, profile, send_profile
+            )
+        )
+
+    async def cancel_search(self, message) -> None:
+        """Cancel the running search of a chat."""
+
+        session = self.get_session(message.chat.id)
+        if session.subscription is None or session.subscription.future.done():
+            await self.bot.send_message(message.chat.id, self.messages["Nothing_to_cancel"])
+            return
+        self.jobs.cancel(session.subscription)
+
+    async def get_candidate_list(
+        self,
+        message,
+        candidates: Parser,
+        limits: ScrapeLimits | None = None,
+        extra_urls: list[str] | None = None,
+        profile: JobProfile | None = None,
+        send_profile: bool = False,
+    ) -> None:
+        """Get the list of candidates."""
+
+        url = candidates.BASE_URL
+        await asyncio.to_thread(candidates.close_driver)
+        try:
+            await self.run_search(
                 message.chat.id,
-                file,
-                caption=self.messages["Finish"],
+                url,
+                limits or ScrapeLimits(),
+                tuple(extra_urls or ()),
+                profile=profile,
+            )
+        finally:
+            if profile is not None:
+                await self.deliver_profile(message.chat.id, profile, send_profile)
+
+    async def deliver_profile(
+        self, chat_id: int, profile: JobProfile, send: bool
+    ) -> None:
+        """Write the profile of a search and send it to the chat if an admin asked for it."""
+
+        try:
+            path = await asyncio.to_thread(profile.write)
+            if send:
+                with open(path, "rb") as report:
+                    await self.bot.send_document(
+                        chat_id, report, caption=self.messages["Profile_report"]
+                    )
+        except Exception as e:
+            logging.error(f"Failed to deliver the profile of a search in chat {chat_id}: {e}")
+
+    async def resume_searches(self, chat_id: int | None = None) -> None:
+        """Continue the searches that were not delivered because they failed or
+        the bot was restarted. Their scrapes continue from their checkpoints.
+        Args:
+            chat_id (int | None, optional): The chat whose searches are continued.
+                Defaults to all chats, e.g. on startup.
+        """
+
+        if self.checkpoints is None:
+            searches = []
+        else:
+            await asyncio.to_thread(self.checkpoints.prune, CHECKPOINT_MAX_AGE)
+            searches = await asyncio.to_thread(self.checkpoints.get_searches, chat_id)
+        searches = [
+            search for search in searches if search.id not in self.running_searches
+        ]
+        if chat_id is not None and not searches:
+            await self.bot.send_message(chat_id, self.messages["Nothing_to_resume"])
+            return
+
+        for search in searches:
+            logging.info(f"Resuming search #{search.id} in chat {search.chat_id}")
+            try:
+                await self.bot.send_message(search.chat_id, self.messages["Resuming"])
+            except ApiTelegramException as e:
+                logging.warning(f"Failed to resume search #{search.id}: {e}")
+                await asyncio.to_thread(self.checkpoints.remove_search, search.id)
+                continue
+            self.get_session(search.chat_id).task = asyncio.create_task(
+                self.run_search(
+                    search.chat_id,
+                    search.url,
+                    search.limits,
+                    search.extra_urls,
+                    search,
+                )
             )
 
-    def stop_bot(self) -> None:
-        self.bot.stop_polling()
+    async def run_search(
+        self,
+        chat_id: int,
+        url: str,
+        limits: ScrapeLimits,
+        extra_urls: tuple[str, ...] = (),
+        interrupted: InterruptedSearch | None = None,
+        profile: JobProfile | None = None,
+    ) -> None:
+        """Run a search in the job queue and send its candidate list to the chat.
+
+        The search is recorded in the checkpoint store until it is delivered or
+        cancelled, so a search that failed or was interrupted by a restart can be
+        continued.
+        Args:
+            chat_id (int): The chat the candidate list is sent to.
+            url (str): The URL of the filtered candidates page.
+            limits (ScrapeLimits): The budget of the scrape.
+            extra_urls (tuple[str, ...], optional): The query on other sources.
+            interrupted (InterruptedSearch | None, optional): The record of the
+                search, if it is continued.
+            profile (JobProfile | None, optional): The profile the scrape is recorded in.
+        """
+
+        status = await self.bot.send_message(chat_id, self.messages["Waiting"])
+
+        async def report_progress(progress: ScrapeProgress) -> None:
+            try:
+                await self.bot.edit_message_text(
+                    self.format_progress(progress),
+                    chat_id=status.chat.id,
+                    message_id=status.message_id,
+                    disable_web_page_preview=True,
+                )
+            except ApiTelegramException as e:
+                logging.warning(f"Failed to update progress in chat {chat_id}: {e}")
+
+        search_id = interrupted.id if interrupted is not None else None
+        if search_id is None and self.checkpoints is not None:
+            search_id = await asyncio.to_thread(
+                self.checkpoints.add_search, chat_id, url, limits, extra_urls
+            )
+        if search_id is not None:
+            self.running_searches.add(search_id)
+        delivered = False
+        try:
+            try:
+                subscription = await self.jobs.submit(
+                    chat_id, url, report_progress, limits, extra_urls, profile
+                )
+            except JobQueueFull as e:
+                logging.warning(f"Search rejected in chat {chat_id}: {e}")
+                await self.bot.send_message(chat_id, self.messages["Busy"])
+                delivered = True
+                return
+            self.get_session(chat_id).subscription = subscription
+
+            # asyncio.wait does not raise when the subscription is cancelled.
+            await asyncio.wait({subscription.future})
+            if subscription.future.cancelled():
+                await self.bot.send_message(chat_id, self.messages["Cancelled"])
+                delivered = True
+                return
+
+            session = self.get_session(chat_id)
+            export_format = session.export_format
+            try:
+                result = subscription.future.result()
+                session.last_search = FinishedSearch(url, limits, result)
+                with timed("export"):
+                    document = await asyncio.to_thread(
+                        export_candidates, result, export_format
+                    )
+                with timed("telegram_upload"):
+                    await self.bot.send_document(
+                        chat_id,
+                        document,
+                        caption=self.messages[
+                            "Finish_partial" if result.truncated else "Finish"
+                        ],
+                        visible_file_name=f"candidates.{export_format}",
+                    )
+                delivered = True
+                await asyncio.to_thread(forget_checkpoint, url, limits, extra_urls)
+            except Exception as e:
+                logging.exception(f"Search failed in chat {chat_id}: {e}")
+                message_key = "Failed" if search_id is None else "Failed_resumable"
+                await self.bot.send_message(chat_id, self.messages[message_key])
+        finally:
+            self.running_searches.discard(search_id)
+            if delivered and search_id is not None:
+                await asyncio.to_thread(self.checkpoints.remove_search, search_id)
 
 
 bot_session = BotSession()
-bot_session.start()
+asyncio.run(bot_session.start())
@@ -0,0 +1,6 @@
+import os
+
+# The shared SQLite stores are disabled, so tests do not read or leave
+# databases in the working directory.
+for name in ("RESUME_CACHE_PATH", "CANDIDATE_STORE_PATH", "CHECKPOINT_PATH", "WATCH_STORE_PATH"):
+    os.environ[name] = ""
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from models import Candidate, CandidateBatch
+from scraper.candidates_scraper import CandidateScraper
+from scraper.scoring import PROFILES, ScoringEngine
+
+
+def random_candidates(count: int, seed: int = 0) -> list[Candidate]:
+    rng = random.Random(seed)
+    return [
+        Candidate(
+            name=f"Candidate {index}",
+            position=rng.choice(["Python developer", "QA engineer", "Data analyst"]),
+            ready_to_work=rng.choice(["Повна зайнятість", "Віддалена робота"]),
+            education=rng.random() < 0.7,
+            additional_education=rng.random() < 0.4,
+            skills=rng.randint(0, 200),
+            english=rng.random() < 0.5,
+            url=f"https://www.work.ua/resumes/{rng.randint(0, count // 2 or 1)}/",
+        )
+        for index in range(count)
+    ]
+
+
+# Sizes around the byte boundaries of the flag bitmaps.
+SIZES = [0, 1, 7, 8, 9, 16, 17, 100]
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_batch_round_trip(size):
+    candidates = random_candidates(size)
+    batch = CandidateBatch.from_candidates(candidates)
+
+    assert len(batch) == size
+    assert list(batch) == candidates
+    assert [batch[index] for index in range(-size, 0)] == candidates
+    for name in ("education", "additional_education", "english"):
+        assert batch.flag_column(name).tolist() == [
+            getattr(candidate, name) for candidate in candidates
+        ]
+
+
+def test_take_keeps_the_rows_in_the_given_order():
+    candidates = random_candidates(20)
+    batch = CandidateBatch.from_candidates(candidates)
+
+    assert list(batch.take([19, 0, 8, 8])) == [
+        candidates[19], candidates[0], candidates[8], candidates[8]
+    ]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+@pytest.mark.parametrize("size", SIZES)
+def test_batch_scores_match_rate_candidate(profile, size):
+    scraper = CandidateScraper("https://www.work.ua/resumes/", scoring=ScoringEngine(profile))
+    candidates = random_candidates(size, seed=size)
+
+    scores = scraper.scoring.score_batch(CandidateBatch.from_candidates(candidates))
+
+    assert scores.tolist() == [scraper.rate_candidate(candidate) for candidate in candidates]
+
+
+@pytest.mark.parametrize("profile", PROFILES)
+def test_rank_is_a_stable_sort_of_unique_resumes(profile):
+    scraper = CandidateScraper("https://www.work.ua/resumes/", scoring=ScoringEngine(profile))
+    candidates = random_candidates(100, seed=1)
+
+    ranked, scores = scraper.scoring.rank(candidates)
+
+    first = {}
+    for candidate in candidates:
+        first.setdefault(candidate.url, candidate)
+    expected = sorted(first.values(), key=scraper.rate_candidate, reverse=True)
+    assert list(ranked) == expected
+    assert scores == [scraper.rate_candidate(candidate) for candidate in expected]
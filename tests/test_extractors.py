@@ -0,0 +1,50 @@
+import pytest
+
+from benchmarks.pages import resume_page
+from scraper.extractors import LxmlExtractor, SoupExtractor, has_implied_end_tags
+
+pytest.importorskip("lxml")
+
+PAGE = resume_page(3)
+
+# Markup that libxml2 and html.parser build different trees for.
+MALFORMED = {
+    "nested english paragraph": PAGE.replace(
+        "<ul>", "<p>Англійська — вище <p>середнього</p><ul>"
+    ),
+    "block in an unclosed paragraph": PAGE.replace(
+        "<ul>", "<p>Мови<div>Англійська — вище середнього</div><ul>"
+    ),
+    "unclosed dt": PAGE.replace("<dt>Готовий працювати</dt>", "<dt>Готовий працювати"),
+    "unclosed dd": PAGE.replace("<dd>Київ</dd>", "<dd>Київ"),
+    "unclosed heading": PAGE.replace("<ul>", "<h2>Освіта<p>КПІ</p><ul>"),
+}
+
+
+def extract(extractor, page: str):
+    try:
+        return extractor.extract(page, "https://www.work.ua/resumes/3/")
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_extractors_agree_on_stand_in_pages(seed):
+    soup, fast = SoupExtractor(), LxmlExtractor()
+    for resume_id in range(40):
+        page = resume_page(resume_id, padding=resume_id % 3, seed=seed)
+        assert not has_implied_end_tags(page)
+        assert extract(fast, page) == extract(soup, page)
+
+
+@pytest.mark.parametrize("page", MALFORMED.values(), ids=MALFORMED.keys())
+def test_extractors_agree_on_malformed_pages(page):
+    assert has_implied_end_tags(page)
+    assert extract(LxmlExtractor(), page) == extract(SoupExtractor(), page)
+
+
+def test_nested_english_paragraph_counts_like_the_reference():
+    page = MALFORMED["nested english paragraph"]
+
+    assert extract(SoupExtractor(), page).english is True
+    assert extract(LxmlExtractor(), page).english is True
@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+
+from jobs.job_queue import JobQueue, JobQueueFull
+from scraper.limits import ScrapeLimits
+
+
+class FakeRunner:
+    """A runner whose scrapes only finish when the test releases them."""
+
+    def __init__(self) -> None:
+        self.started: list[str] = []
+        self.cancelled: list[str] = []
+        self.gates: dict[str, asyncio.Event] = {}
+
+    def release(self, url: str) -> None:
+        self.gates.setdefault(url, asyncio.Event()).set()
+
+    async def __call__(self, url, report, limits=None, extra_urls=(), profile=None):
+        self.started.append(url)
+        try:
+            await self.gates.setdefault(url, asyncio.Event()).wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        if url.endswith("/broken/"):
+            raise RuntimeError("the board is down")
+        return f"candidates of {url}"
+
+
+async def settle() -> None:
+    """Let the workers pick up and finish what they can."""
+
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def run(test):
+    """Run a test coroutine with a started queue and stop the queue afterwards."""
+
+    async def main():
+        runner = FakeRunner()
+        queue = JobQueue(runner, workers=1, max_size=4, max_per_user=2)
+        queue.start()
+        try:
+            await test(queue, runner)
+        finally:
+            await queue.stop()
+
+    asyncio.run(main())
+
+
+def test_identical_queries_share_one_scrape():
+    async def test(queue, runner):
+        first = await queue.submit(1, "https://www.work.ua/resumes/?b=2&a=1")
+        second = await queue.submit(2, "https://WWW.work.ua/resumes?a=1&b=2")
+        other_limits = await queue.submit(
+            3, "https://www.work.ua/resumes/?a=1&b=2", limits=ScrapeLimits(max_results=50)
+        )
+        assert first.job is second.job
+        assert other_limits.job is not first.job
+
+        await settle()
+        runner.release(first.job.url)
+        runner.release(other_limits.job.url)
+        assert await first.wait() == await second.wait()
+        await other_limits.wait()
+        assert len(runner.started) == 2
+
+    run(test)
+
+
+def test_queue_and_user_limits():
+    async def test(queue, runner):
+        await queue.submit(1, "https://www.work.ua/resumes/running/")
+        await settle()
+        # The running job no longer counts, the queued ones do.
+        await queue.submit(1, "https://www.work.ua/resumes/1/")
+        await queue.submit(1, "https://www.work.ua/resumes/2/")
+        with pytest.raises(JobQueueFull):
+            await queue.submit(1, "https://www.work.ua/resumes/3/")
+        # A user at the cap can still join a queued scrape of another query.
+        await queue.submit(1, "https://www.work.ua/resumes/1/")
+
+        await queue.submit(2, "https://www.work.ua/resumes/4/")
+        await queue.submit(2, "https://www.work.ua/resumes/5/")
+        with pytest.raises(JobQueueFull):
+            await queue.submit(3, "https://www.work.ua/resumes/6/")
+
+    run(test)
+
+
+def test_users_are_served_round_robin():
+    async def test(queue, runner):
+        queue.max_per_user = 3
+        queue.max_size = 10
+        blocker = await queue.submit(9, "https://www.work.ua/resumes/blocker/")
+        await settle()
+        urls = {
+            1: ["https://www.work.ua/resumes/a1/", "https://www.work.ua/resumes/a2/",
+                "https://www.work.ua/resumes/a3/"],
+            2: ["https://www.work.ua/resumes/b1/", "https://www.work.ua/resumes/b2/"],
+        }
+        subscriptions = [
+            await queue.submit(user_id, url)
+            for user_id, user_urls in urls.items()
+            for url in user_urls
+        ]
+
+        runner.release(blocker.job.url)
+        for subscription in subscriptions:
+            runner.release(subscription.job.url)
+        await asyncio.gather(*(subscription.wait() for subscription in subscriptions))
+
+        order = [url.rsplit("/", 2)[1] for url in runner.started]
+        assert order == ["blocker", "a1", "b1", "a2", "b2", "a3"]
+
+    run(test)
+
+
+def test_cancel_drops_a_queued_job():
+    async def test(queue, runner):
+        running = await queue.submit(1, "https://www.work.ua/resumes/running/")
+        await settle()
+        queued = await queue.submit(2, "https://www.work.ua/resumes/queued/")
+
+        queue.cancel(queued)
+        runner.release(running.job.url)
+        await running.wait()
+        await settle()
+
+        assert queued.future.cancelled()
+        assert runner.started == [running.job.url]
+        # The slot of the cancelled job is free again.
+        assert (await queue.submit(2, queued.job.url)).job is not queued.job
+
+    run(test)
+
+
+def test_cancel_stops_a_running_job_only_without_other_subscribers():
+    async def test(queue, runner):
+        first = await queue.submit(1, "https://www.work.ua/resumes/shared/")
+        second = await queue.submit(2, "https://www.work.ua/resumes/shared/")
+        await settle()
+
+        queue.cancel(first)
+        await settle()
+        assert runner.cancelled == []
+
+        queue.cancel(second)
+        await settle()
+        assert runner.cancelled == [second.job.url]
+        assert second.future.cancelled()
+
+    run(test)
+
+
+def test_failures_reach_every_subscriber():
+    async def test(queue, runner):
+        url = "https://www.work.ua/resumes/broken/"
+        first = await queue.submit(1, url)
+        second = await queue.submit(2, url)
+        runner.release(url)
+
+        for subscription in (first, second):
+            with pytest.raises(RuntimeError):
+                await subscription.wait()
+
+    run(test)
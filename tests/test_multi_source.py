@@ -0,0 +1,103 @@
+import asyncio
+from urllib.parse import urlencode, urlsplit
+
+import filters
+from benchmarks.server import SEARCH_PATH, ServerConfig, ServerProcess
+from models import Candidate
+from scraper.http_client import close_http_client
+from scraper.multi_source import MultiSourceScraper, identity
+from scraper.sources import SOURCES, SearchFilters, WorkUaSource
+from storage.candidate_store import CandidateStore
+
+FILTERS = SearchFilters(("Від 1 до 2 років",), "від 10 000 грн", "до 30 000 грн")
+
+
+class StandInSource(WorkUaSource):
+    """A second board with the markup of the stand-in server, served on localhost
+    while the work.ua stand-in is served on 127.0.0.1."""
+
+    name = "standin"
+    hosts = ("localhost",)
+    port = 0
+
+    def search_url(self, position=None, location=None, skills=None, filters=None):
+        params = {"q": " ".join(filter(None, (position, skills))), "city": location or ""}
+        for low, high in (filters or SearchFilters()).experience_years():
+            params["experience"] = f"{low}-{'' if high is None else high}"
+        salary_from, salary_to = (filters or SearchFilters()).salary_range()
+        params.update(salary_from=salary_from or "", salary_to=salary_to or "")
+        return f"http://localhost:{self.port}{SEARCH_PATH}?{urlencode(params)}"
+
+
+def test_filter_labels_are_translated():
+    assert FILTERS.experience_years() == [(1, 2)]
+    assert FILTERS.salary_range() == (10000, 30000)
+    labels = ("Без досвіду", "До 1 року", "Понад 5 років")
+    assert SearchFilters(labels).experience_years() == [(0, 0), (0, 1), (5, None)]
+    assert SearchFilters().salary_range() == (None, None)
+
+
+def test_filters_are_carried_to_every_source(monkeypatch):
+    monkeypatch.setattr(filters, "get_sources", lambda: [WorkUaSource(), StandInSource()])
+
+    urls = filters.get_extra_search_urls(
+        "https://www.work.ua/resumes-kyiv-python/?experience=164",
+        "Python", "Київ", None, FILTERS,
+    )
+
+    assert urls == [
+        "http://localhost:0/resumes/?q=Python&city=%D0%9A%D0%B8%D1%97%D0%B2"
+        "&experience=1-2&salary_from=10000&salary_to=30000"
+    ]
+
+
+def test_identity_keeps_namesakes_apart():
+    candidate = Candidate(
+        "Олена  Коваль", "Python developer", "Повна зайнятість",
+        True, False, 10, True, "https://www.work.ua/resumes/1/",
+    )
+    same = Candidate(
+        "олена коваль", "Python  Developer", "Full time",
+        True, False, 12, True, "http://localhost/resumes/7/",
+    )
+    namesake = Candidate(
+        "Олена Коваль", "Python developer", "Повна зайнятість",
+        False, False, 10, True, "https://www.work.ua/resumes/2/",
+    )
+
+    assert identity(candidate) == identity(same)
+    assert identity(candidate) != identity(namesake)
+
+
+def test_sources_are_merged_and_stored(monkeypatch):
+    monkeypatch.setitem(SOURCES, StandInSource.name, StandInSource)
+    store = CandidateStore(":memory:")
+    config = ServerConfig(pages=2, per_page=5, latency=0, jitter=0, padding=0)
+
+    with ServerProcess(config) as workua, ServerProcess(config) as standin:
+        monkeypatch.setattr(StandInSource, "port", urlsplit(standin.url).port)
+        urls = [workua.url, StandInSource().search_url("Python", filters=FILTERS)]
+
+        async def run() -> tuple:
+            try:
+                first = MultiSourceScraper(urls, store=store)
+                result = await first.sort_candidates()
+                again = MultiSourceScraper(urls, store=store)
+                stored = await again.sort_candidates()
+            finally:
+                await close_http_client()
+            return first, result, again, stored
+
+        first, result, again, stored = asyncio.run(run())
+
+    # Both boards serve the same people, so every one of them is kept once.
+    assert len(result) == 10
+    assert first.duplicates == 10
+    assert sorted(urlsplit(candidate.url).path for candidate in result) == sorted(
+        f"{SEARCH_PATH}{number}/" for number in range(10)
+    )
+    # The complete result is stored under the query of both sources.
+    assert again.total == 0
+    assert [candidate.url for candidate in stored] == [
+        candidate.url for candidate in result
+    ]
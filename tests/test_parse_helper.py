@@ -0,0 +1,66 @@
+import pytest
+from selenium.common import WebDriverException
+
+from parsers.parse import ParseHelper, uses_driver
+
+
+class FakeDriver:
+    current_url = "about:blank"
+
+    def get(self, url: str) -> None:
+        if "broken" in url:
+            raise WebDriverException("chrome not reachable")
+        self.current_url = url
+
+
+class FakePool:
+    """A driver pool recording checkouts and returns."""
+
+    def __init__(self) -> None:
+        self.acquired = 0
+        self.released = []
+
+    def acquire(self) -> FakeDriver:
+        self.acquired += 1
+        return FakeDriver()
+
+    def release(self, driver: FakeDriver, broken: bool = False) -> None:
+        self.released.append(broken)
+
+
+class Parser(ParseHelper):
+    BASE_URL = "https://www.work.ua/employer/"
+
+    @uses_driver
+    def open(self, url: str) -> None:
+        self.driver.get(url)
+        self.BASE_URL = self.driver.current_url
+
+    @uses_driver
+    def refresh(self) -> None:
+        self.open(self.BASE_URL)
+
+
+def test_driver_is_held_only_during_a_step():
+    pool = FakePool()
+    parser = Parser(pool)
+
+    parser.open("https://www.work.ua/resumes-python/")
+    assert parser.driver is None
+    # Nested steps share one checkout.
+    parser.refresh()
+    assert pool.acquired == 2
+    assert pool.released == [False, False]
+    assert parser.BASE_URL == "https://www.work.ua/resumes-python/"
+
+
+def test_driver_of_a_failed_step_is_recycled():
+    pool = FakePool()
+    parser = Parser(pool)
+
+    with pytest.raises(WebDriverException):
+        parser.open("https://www.work.ua/broken/")
+    parser.refresh()
+
+    assert pool.released == [True, False]
+    assert parser.driver is None
@@ -0,0 +1,55 @@
+import asyncio
+
+from benchmarks.server import ServerConfig, ServerProcess
+from scraper.http_client import HttpClient
+from scraper.scheduler import AdaptiveLimiter, FetchScheduler, get_host_limiter
+
+
+class RecordingLimiter(AdaptiveLimiter):
+    """A limiter remembering the latencies it was told about."""
+
+    def __init__(self) -> None:
+        super().__init__(initial=10, maximum=10, target_latency=10)
+        self.latencies = []
+
+    async def release(self, latency, overloaded=False) -> None:
+        self.latencies.append(latency)
+        await super().release(latency, overloaded)
+
+
+def test_jobs_share_the_limiter_of_a_host():
+    async def run():
+        first, second = FetchScheduler(), FetchScheduler()
+        assert first.get_limiter("https://www.work.ua/resumes/1/") is second.get_limiter(
+            "https://www.work.ua/resumes/?page=2"
+        )
+        assert first.get_limiter("https://www.work.ua/") is not second.get_limiter(
+            "https://robota.ua/"
+        )
+        return get_host_limiter("www.work.ua")
+
+    # Every event loop gets its own limiters.
+    assert asyncio.run(run()) is not asyncio.run(run())
+
+
+def test_waiting_for_a_pooled_connection_is_not_latency():
+    config = ServerConfig(pages=1, per_page=1, latency=0.3, jitter=0, padding=0)
+    limiter = RecordingLimiter()
+    scheduler = FetchScheduler(limiter)
+    # One connection, so the second request waits for the first to finish.
+    http = HttpClient(per_host=1)
+
+    with ServerProcess(config) as server:
+        async def run():
+            try:
+                session = http.get_session()
+                await asyncio.gather(
+                    scheduler.fetch(session, server.url), scheduler.fetch(session, server.url)
+                )
+            finally:
+                await http.close()
+
+        asyncio.run(run())
+
+    assert len(limiter.latencies) == 2
+    assert max(limiter.latencies) < 0.5
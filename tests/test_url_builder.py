@@ -0,0 +1,59 @@
+import pytest
+
+from parsers.url_builder import build_search_url, city_slug, query_slug
+
+
+@pytest.mark.parametrize(
+    "city, slug",
+    [
+        ("Київ", "kyiv"),
+        ("Львів", "lviv"),
+        ("Запоріжжя", "zaporizhzhia"),
+        ("Біла Церква", "bila_tserkva"),
+        ("Івано-Франківськ", "ivano-frankivsk"),
+        # Є, Ї, Й, Ю and Я are spelled differently at the start of a word.
+        ("Яготин", "yahotyn"),
+        ("Юрій Їжак", "yurii_yizhak"),
+        ("Знам'янка", "znamianka"),
+        ("Знам’янка", "znamianka"),
+        # Зг is written zgh, so it is not read as the letter Ж.
+        ("Згурівка", "zghurivka"),
+    ],
+)
+def test_city_slug_uses_the_official_transliteration(city, slug):
+    assert city_slug(city) == slug
+
+
+@pytest.mark.parametrize(
+    "query, slug",
+    [
+        ("Python developer", "python+developer"),
+        ("  data   engineer ", "data+engineer"),
+        ("C++", "c%2B%2B"),
+        ("C# .NET", "c%23+.net"),
+        ("Бухгалтер", "%D0%B1%D1%83%D1%85%D0%B3%D0%B0%D0%BB%D1%82%D0%B5%D1%80"),
+    ],
+)
+def test_query_slug_encodes_every_word(query, slug):
+    assert query_slug(query) == slug
+
+
+def test_build_search_url():
+    assert build_search_url() == "https://www.work.ua/resumes/"
+    assert (
+        build_search_url("Python developer", "Київ")
+        == "https://www.work.ua/resumes-kyiv-python+developer/"
+    )
+
+
+def test_skills_replace_the_position_and_search_the_whole_resume():
+    assert (
+        build_search_url("Python developer", "Київ", "Django, SQL")
+        == "https://www.work.ua/resumes-kyiv-django%2C+sql/?notitle=1"
+    )
+
+
+def test_filter_params_are_sorted_and_joined():
+    url = build_search_url(params={"salaryfrom": ["5"], "experience": ["164", "165"]})
+
+    assert url == "https://www.work.ua/resumes/?experience=164+165&salaryfrom=5"
@@ -0,0 +1,60 @@
+import asyncio
+
+from jobs.watch_scheduler import WatchScheduler
+from models import Candidate, CandidateBatch
+from scraper.limits import ScrapeLimits
+from storage.watch_store import WatchStore
+
+
+def candidate(number: int) -> Candidate:
+    return Candidate(
+        name=f"Candidate {number}",
+        position="Python developer",
+        ready_to_work="Повна зайнятість",
+        education=True,
+        additional_education=False,
+        skills=number,
+        english=False,
+        url=f"https://www.work.ua/resumes/{number}/",
+    )
+
+
+class Result:
+    def __init__(self, result: CandidateBatch) -> None:
+        self.result = result
+
+    async def wait(self) -> CandidateBatch:
+        return self.result
+
+
+class FakeJobs:
+    """A job queue whose every search returns the same candidates."""
+
+    def __init__(self, result: CandidateBatch) -> None:
+        self.result = result
+
+    async def submit(self, user_id, url, limits=None):
+        return Result(self.result)
+
+
+def test_candidates_are_marked_seen_only_once_sent():
+    store = WatchStore(":memory:")
+    watch = store.add_watch(1, "https://www.work.ua/resumes/", 60, ScrapeLimits(), [candidate(1)])
+    sent = []
+    failures = [ConnectionError("Telegram is down")]
+
+    async def notify(watch, candidates):
+        if failures:
+            raise failures.pop()
+        sent.append([item.url for item in candidates])
+
+    result = CandidateBatch.from_candidates([candidate(1), candidate(2), candidate(3)])
+    scheduler = WatchScheduler(store, FakeJobs(result), notify)
+
+    # A failed delivery is logged and the candidates are sent by the next run.
+    asyncio.run(scheduler.run(watch))
+    assert sent == []
+    asyncio.run(scheduler.run(watch))
+    assert sent == [[candidate(2).url, candidate(3).url]]
+    asyncio.run(scheduler.run(watch))
+    assert len(sent) == 1